@@ -16,9 +16,10 @@
 import re
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from typing import Dict, List, Optional, Tuple, TypeVar
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, TypeVar
 
 from .model import Compound, ReferableElement
+from .profiling import count
 
 
 class AmbiguousLookupError(Exception):
@@ -348,24 +349,143 @@ class ParameterTypeMatcher(ElementFilter):
         return name
 
 
+class ElementLoader(ABC):
+    """Loads elements into an API reference when they are first searched for."""
+    @abstractmethod
+    def load_name(self, short_name: str) -> None:
+        """Load all elements that can have the given short name.
+
+        Args:
+            short_name: Uniform short name of the elements, see `uniform_short_name`.
+        """
+
+    @abstractmethod
+    def load_id(self, target_id: str) -> None:
+        """Load the element with the given unique id."""
+
+
+class NameQuery(NamedTuple):
+    """Search for an element by name in a namespace, see `ApiReference.find_many`."""
+    name: str
+    namespace: Optional[str]
+    lang: Optional[str]
+
+
+class _ScopeTrie:
+    """Elements with the same name, stored by the namespace containing them.
+
+    Elements stored in a node are found from the namespace of the node and all namespaces nested in
+    it, like `NameFilter` does.
+    """
+    __slots__ = ("children", "elements")
+
+    children: Dict[str, "_ScopeTrie"]
+    elements: List[ReferableElement]
+
+    def __init__(self):
+        self.children = {}
+        self.elements = []
+
+    def add(self, namespace_parts: List[str], element: ReferableElement) -> None:
+        node = self
+        for part in namespace_parts:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _ScopeTrie()
+            node = child
+        node.elements.append(element)
+
+    def find(self, name: str, namespace_parts: List[str]) -> Optional[ReferableElement]:
+        """Find the element visible from a namespace, like `ApiReference.find`.
+
+        Returns:
+            The matching element, or None if there is no match or the match is ambiguous.
+        """
+        matches = list(self.elements)
+        node = self
+        for part in namespace_parts:
+            child = node.children.get(part)
+            if child is None:
+                exact_matches = []
+                break
+            node = child
+            matches.extend(node.elements)
+        else:
+            exact_matches = node.elements
+
+        if len(matches) == 1:
+            return matches[0]
+        elif len(matches) == 0:
+            return None
+
+        if len(exact_matches) == 1:
+            return exact_matches[0]
+
+        matches_without_namespace = [e for e in matches if uniform_long_name(e.full_name) == name]
+        if len(matches_without_namespace) == 1:
+            return matches_without_namespace[0]
+        return None
+
+
+class _IndexKeys(NamedTuple):
+    """Keys under which an element is stored in the indexes of the API reference."""
+    position: int
+    short_name: str
+    full_name: str
+    kind: Optional[str]
+    language: Optional[str]
+
+
 class ApiReference:
     """Collection of API reference information.
 
     Mainains the collection of available elements and allows searching for specific elements.
 
+    Besides the index on id, elements are indexed on their short name, their full name, and the
+    combination of short name with kind or language. When searching, the most selective index is
+    used to find candidates for the search filters.
+
+    Parsers and transcoders can still change new elements after adding them. Therefore the full
+    name, kind and language are only indexed at the next search. Use `reindex` after changing them
+    later.
+
     Attributes:
         elements: All contained API reference elements.
+        loader:   Optional loader to add elements that are not loaded yet, when searching for them.
     """
     elements: List[ReferableElement]
+    loader: Optional[ElementLoader]
     _id_index: Dict[str, ReferableElement]
     _name_index: Dict[str, List[ReferableElement]]
+    _full_name_index: Dict[str, List[ReferableElement]]
+    _name_kind_index: Dict[Tuple[str, Optional[str]], List[ReferableElement]]
+    _name_lang_index: Dict[Tuple[str, Optional[str]], List[ReferableElement]]
+    _index_keys: Dict[int, _IndexKeys]
+    _unindexed: List[Tuple[ReferableElement, int, str]]
 
     def __init__(self):
         self.elements = []
+        self.loader = None
         self._id_index = {}
         self._name_index = defaultdict(list)
+        self._full_name_index = defaultdict(list)
+        self._name_kind_index = defaultdict(list)
+        self._name_lang_index = defaultdict(list)
+        self._index_keys = {}
+        self._unindexed = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Ids of the elements change when they are copied
+        state["_index_keys"] = list(self._index_keys.values())
+        return state
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._index_keys = {id(self.elements[keys.position]): keys for keys in state["_index_keys"]}
 
     def append(self, element: ReferableElement) -> None:
+        position = len(self.elements)
         self.elements.append(element)
 
         assert element.id
@@ -373,7 +493,32 @@ class ApiReference:
         self._id_index[element.id] = element
 
         assert element.name
-        self._name_index[uniform_short_name(element.name)].append(element)
+        short_name = uniform_short_name(element.name)
+        self._name_index[short_name].append(element)
+
+        self._unindexed.append((element, position, short_name))
+
+    def reindex(self, element: ReferableElement) -> None:
+        """Update the indexes after changing the full name, kind or language of an element.
+
+        The element can still only be found using the short name it had when it was added. Elements
+        that are not part of the API reference, or that are not indexed yet, are ignored.
+        """
+        old_keys = self._index_keys.get(id(element))
+        if old_keys is None:
+            return
+        new_keys = self._secondary_keys(element, old_keys.position, old_keys.short_name)
+        if new_keys == old_keys:
+            return
+        self._index_keys[id(element)] = new_keys
+
+        short_name = old_keys.short_name
+        self._move(self._full_name_index, old_keys.full_name, new_keys.full_name, element,
+                   new_keys.position)
+        self._move(self._name_kind_index, (short_name, old_keys.kind), (short_name, new_keys.kind),
+                   element, new_keys.position)
+        self._move(self._name_lang_index, (short_name, old_keys.language),
+                   (short_name, new_keys.language), element, new_keys.position)
 
     def find(self,
              name: Optional[str] = None,
@@ -407,8 +552,13 @@ class ApiReference:
         Raises:
             AmbiguousLookupError: There are multiple matching elements. Make your query more narrow.
         """
+        count("reference_lookups")
         if target_id is not None:
-            return self._id_index.get(target_id, None)
+            element = self._id_index.get(target_id, None)
+            if element is None and self.loader is not None:
+                self.loader.load_id(target_id)
+                element = self._id_index.get(target_id, None)
+            return element
         elif name is None:
             return None
 
@@ -417,7 +567,10 @@ class ApiReference:
             name = paramtype_matcher.name
 
         short_name = uniform_short_name(name)
-        potential_matches = self._name_index[short_name]
+        if self.loader is not None:
+            self.loader.load_name(short_name)
+        self._update_indexes()
+        potential_matches = self._candidates(name, short_name, namespace, kind, lang)
         if len(potential_matches) == 0:
             return None
 
@@ -448,6 +601,130 @@ class ApiReference:
 
         raise AmbiguousLookupError(matches)
 
+    def find_many(self,
+                  queries: Iterable[NameQuery]) -> Dict[NameQuery, Optional[ReferableElement]]:
+        """Find multiple API elements by name.
+
+        Gives the same result as `find` for each query, except that ambiguous queries result in
+        None instead of raising `AmbiguousLookupError`. Queries for the same name and language share
+        the work: the candidates are selected and their namespaces are split only once, into a trie
+        that is searched for the namespace of each query.
+
+        Args:
+            queries: Name, namespace and language of the elements to find.
+
+        Returns:
+            The element found for each query, or None if not found or ambiguous.
+        """
+        results: Dict[NameQuery, Optional[ReferableElement]] = {}
+        groups: Dict[Tuple[str, Optional[str]], List[NameQuery]] = defaultdict(list)
+        for query in queries:
+            if query in results:
+                continue
+            results[query] = None
+
+            if query.namespace is None:
+                results[query] = self._find_or_none(query)
+            else:
+                groups[(uniform_long_name(query.name), query.lang)].append(query)
+
+        # Names that cannot be found in a trie
+        for name, lang in list(groups):
+            if not NameFilter._split_namespaces(name) or ParameterTypeMatcher(name).applies:
+                for query in groups.pop((name, lang)):
+                    results[query] = self._find_or_none(query)
+
+        count("reference_lookups", sum(len(group) for group in groups.values()))
+        if self.loader is not None:
+            for short_name in {uniform_short_name(name) for name, _ in groups}:
+                self.loader.load_name(short_name)
+        self._update_indexes()
+
+        namespace_parts: Dict[str, List[str]] = {}
+
+        def split_namespaces(name: str) -> List[str]:
+            parts = namespace_parts.get(name)
+            if parts is None:
+                parts = namespace_parts[name] = NameFilter._split_namespaces(name)
+            return parts
+
+        for (name, lang), group in groups.items():
+            name_parts = split_namespaces(name)
+            trie = _ScopeTrie()
+            for element in self._candidates(name, uniform_short_name(name), group[0].namespace,
+                                            None, lang):
+                if lang is not None and element.language != lang:
+                    continue
+                full_name = uniform_long_name(element.full_name)
+                if not full_name.endswith(name):
+                    continue
+                full_name_parts = split_namespaces(full_name)
+                if full_name_parts[-len(name_parts):] != name_parts:
+                    continue
+                trie.add(full_name_parts[:-len(name_parts)], element)
+
+            for query in group:
+                assert query.namespace is not None
+                results[query] = trie.find(name,
+                                           split_namespaces(uniform_long_name(query.namespace)))
+
+        return results
+
+    def _find_or_none(self, query: NameQuery) -> Optional[ReferableElement]:
+        try:
+            return self.find(query.name, target_id=None, lang=query.lang, namespace=query.namespace)
+        except AmbiguousLookupError:
+            return None
+
+    def _candidates(self, name: str, short_name: str, namespace: Optional[str], kind: Optional[str],
+                    lang: Optional[str]) -> List[ReferableElement]:
+        """Select the smallest list of candidates that contains all possible matches.
+
+        All candidate lists are ordered in the same way as the elements were added.
+        """
+        candidates = self._name_index.get(short_name, [])
+        if kind is not None:
+            candidates = min(candidates, self._name_kind_index.get((short_name, kind), []), key=len)
+        if lang is not None:
+            candidates = min(candidates, self._name_lang_index.get((short_name, lang), []), key=len)
+
+        if namespace is None:
+            # Without namespace the full name needs to match exactly
+            full_name_candidates = self._full_name_index.get(uniform_long_name(name), [])
+            if len(full_name_candidates) < len(candidates):
+                candidates = [
+                    e for e in full_name_candidates
+                    if self._index_keys[id(e)].short_name == short_name
+                ]
+        return candidates
+
+    def _update_indexes(self) -> None:
+        for element, position, short_name in self._unindexed:
+            keys = self._secondary_keys(element, position, short_name)
+            self._index_keys[id(element)] = keys
+            self._full_name_index[keys.full_name].append(element)
+            self._name_kind_index[(short_name, keys.kind)].append(element)
+            self._name_lang_index[(short_name, keys.language)].append(element)
+        self._unindexed.clear()
+
+    @staticmethod
+    def _secondary_keys(element: ReferableElement, position: int, short_name: str) -> _IndexKeys:
+        return _IndexKeys(position, short_name, uniform_long_name(element.full_name), element.kind,
+                          element.language)
+
+    def _move(self, index: Mapping[Any, List[ReferableElement]], old_key: Any, new_key: Any,
+              element: ReferableElement, position: int) -> None:
+        if old_key == new_key:
+            return
+        index[old_key].remove(element)
+
+        # Keep the elements in the order they were added
+        elements = index[new_key]
+        i = len(elements)
+        while i > 0 and self._index_keys[id(elements[i - 1])].position > position:
+            i -= 1
+        elements.insert(i, element)
+
 
 MaybeOptionalStr = TypeVar("MaybeOptionalStr", str, Optional[str])
 
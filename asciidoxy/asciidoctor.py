@@ -16,7 +16,7 @@
 import platform
 import subprocess
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Union
 
 from .config import Configuration
 from .document import Document
@@ -58,9 +58,32 @@ def extension(backend: str) -> str:
     return {"html5": ".html", "pdf": ".pdf", "adoc": ".adoc"}[backend]
 
 
+def output_file(doc: Document, config: Configuration) -> Path:
+    return config.destination_dir / doc.relative_path.with_suffix(extension(config.backend))
+
+
+def documents_to_convert(documents: List[Document], config: Configuration) -> List[Document]:
+    """Select the documents that need to be converted by AsciiDoctor.
+
+    Embedded documents are part of other documents in multipage mode, and in single page mode only
+    the root document is converted. Unchanged documents from an incremental build are skipped if
+    their output still exists.
+    """
+    selected = []
+    for doc in documents:
+        if config.multipage and doc.is_embedded:
+            continue
+        if not config.multipage and not doc.is_root:
+            continue
+        if doc.is_up_to_date and output_file(doc, config).is_file():
+            continue
+        selected.append(doc)
+    return selected
+
+
 def generate_convert_file_command(doc: Document, config: Configuration,
                                   pkg_mgr: PackageManager) -> str:
-    out_file = config.destination_dir / doc.relative_path.with_suffix(extension(config.backend))
+    out_file = output_file(doc, config)
     parts = [
         f"Asciidoctor.convert_file '{doc.work_file}'", f"to_file: '{out_file}'",
         f"safe: :{config.safe_mode.lower()}", f"backend: '{config.backend}'", "mkdirs: true",
@@ -84,28 +107,71 @@ exit 1 if (logger.respond_to? :max_severity) &&
   logger.max_severity >= (::Logger::Severity.const_get '{config.failure_level}')"""
 
 
-def write_asciidoctor_runner(documents: List[Document], config: Configuration,
-                             pkg_mgr: PackageManager) -> Path:
-    runner_path = config.build_dir / "asciidoctor_runner.rb"
+def write_asciidoctor_runner(documents: List[Document],
+                             config: Configuration,
+                             pkg_mgr: PackageManager,
+                             runner_path: Optional[Path] = None) -> Path:
+    if runner_path is None:
+        runner_path = config.build_dir / "asciidoctor_runner.rb"
     with runner_path.open("w") as runner_file:
         print(generate_requires(config), file=runner_file)
-        for doc in documents:
-            if config.multipage and doc.is_embedded:
-                continue
-            if not config.multipage and not doc.is_root:
-                continue
+        for doc in documents_to_convert(documents, config):
             print(generate_convert_file_command(doc, config, pkg_mgr), file=runner_file)
         print(generate_exit_code(config), file=runner_file)
     return runner_path
 
 
-def run_ruby(script: Path) -> None:
+def write_asciidoctor_runners(documents: List[Document], config: Configuration,
+                              pkg_mgr: PackageManager) -> List[Path]:
+    """Write runners to convert the documents in multiple AsciiDoctor processes.
+
+    The documents are divided over at most `config.jobs` runners. Each runner checks the failure
+    level for its own documents.
+
+    Returns:
+        Paths to the runners. Empty if there are no documents to convert.
+    """
+    documents = documents_to_convert(documents, config)
+    shard_count = min(max(1, config.jobs), len(documents))
+    if shard_count == 0:
+        return []
+    elif shard_count == 1:
+        return [write_asciidoctor_runner(documents, config, pkg_mgr)]
+    else:
+        return [
+            write_asciidoctor_runner(documents[shard::shard_count], config, pkg_mgr,
+                                     config.build_dir / f"asciidoctor_runner_{shard}.rb")
+            for shard in range(shard_count)
+        ]
+
+
+def _ruby_command(script: Path) -> Union[str, List[str]]:
     args = ["ruby", str(script)]
     if platform.system() == "Windows":
-        subprocess.run(args, shell=True, check=True)
+        return args
     else:
-        subprocess.run(" ".join(args), shell=True, check=True)
+        return " ".join(args)
+
+
+def run_ruby(*scripts: Path) -> None:
+    """Run one or more Ruby scripts concurrently.
+
+    Raises:
+        subprocess.CalledProcessError: At least one of the scripts failed.
+    """
+    if len(scripts) == 1:
+        subprocess.run(_ruby_command(scripts[0]), shell=True, check=True)
+        return
+
+    processes = [subprocess.Popen(_ruby_command(script), shell=True) for script in scripts]
+    for process in processes:
+        process.wait()
+    for process in processes:
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
 
 
 def convert_documents(documents: List[Document], config: Configuration, pkg_mgr: PackageManager):
-    run_ruby(write_asciidoctor_runner(documents, config, pkg_mgr))
+    runners = write_asciidoctor_runners(documents, config, pkg_mgr)
+    if runners:
+        run_ruby(*runners)
@@ -25,10 +25,11 @@ from ._version import __version__
 from .api_reference import ApiReference
 from .asciidoctor import convert_documents
 from .config import parse_args
-from .generator import process_adoc
+from .generator import BuildManifest, RenderProfiler, process_adoc
 from .model import json_repr
 from .packaging import CollectError, PackageManager, SpecificationError
 from .parser.doxygen import Driver as DoxygenDriver
+from .profiling import Profiler
 
 
 def error(*args, **kwargs) -> None:
@@ -52,12 +53,15 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
     logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
 
     logger = logging.getLogger(__name__)
+    profiler = Profiler()
 
     pkg_mgr = PackageManager(config.build_dir, config.warnings_are_errors)
     if config.spec_file is not None:
         try:
-            with tqdm(desc="Collecting packages     ", unit="pkg") as progress:
-                pkg_mgr.collect(config.spec_file, config.version_file, progress)
+            with tqdm(desc="Collecting packages     ", unit="pkg") as progress, \
+                    profiler.phase("collect"):
+                pkg_mgr.collect(config.spec_file, config.version_file, progress,
+                                config.connections_per_host, config.download_cache_dir)
         except SpecificationError:
             logger.exception("Failed to load package specifications.")
             sys.exit(1)
@@ -65,14 +69,22 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
             logger.exception("Failed to collect packages.")
             sys.exit(1)
 
-        xml_parser = DoxygenDriver(force_language=config.force_language)
-        with tqdm(desc="Loading API reference   ", unit="pkg") as progress:
-            pkg_mgr.load_reference(xml_parser, progress)
-
-        with tqdm(desc="Resolving references    ", unit="ref") as progress:
+        xml_parser = DoxygenDriver(force_language=config.force_language,
+                                   streaming=config.stream_xml)
+        with tqdm(desc="Loading API reference   ", unit="pkg") as progress, \
+                profiler.phase("load_reference"):
+            pkg_mgr.load_reference(xml_parser,
+                                   progress,
+                                   jobs=config.jobs,
+                                   cache_dir=config.cache_dir / "reference",
+                                   lazy=config.lazy_reference)
+
+        with tqdm(desc="Resolving references    ", unit="ref") as progress, \
+                profiler.phase("resolve_references"):
             xml_parser.resolve_references(progress)
 
-        with tqdm(desc="Checking references     ", unit="ref") as progress:
+        with tqdm(desc="Checking references     ", unit="ref") as progress, \
+                profiler.phase("check_references"):
             xml_parser.check_references(progress)
 
         if config.debug:
@@ -90,12 +102,30 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
     else:
         clear_work_dir = True
     pkg_mgr.set_input_files(config.input_file, config.base_dir, config.image_dir)
-    with tqdm(desc="Preparing work directory", unit="pkg") as progress:
+    with tqdm(desc="Preparing work directory", unit="pkg") as progress, \
+            profiler.phase("prepare_work_directory"):
         in_doc = pkg_mgr.prepare_work_directory(config.input_file, clear_work_dir, progress)
 
+    if config.incremental:
+        build_manifest: Optional[BuildManifest] = BuildManifest(config.build_dir / "incremental")
+    else:
+        build_manifest = None
+
+    if config.profile_report is not None:
+        render_profiler: Optional[RenderProfiler] = RenderProfiler()
+    else:
+        render_profiler = None
+
     try:
-        with tqdm(desc="Processing asciidoc     ", total=1, unit="file") as progress:
-            documents = process_adoc(in_doc, api_reference, pkg_mgr, config, progress=progress)
+        with tqdm(desc="Processing asciidoc     ", total=1, unit="file") as progress, \
+                profiler.phase("process_adoc"):
+            documents = process_adoc(in_doc,
+                                     api_reference,
+                                     pkg_mgr,
+                                     config,
+                                     progress=progress,
+                                     build_manifest=build_manifest,
+                                     render_profiler=render_profiler)
 
     except:  # noqa: E722
         logger.error(human_traceback(pkg_mgr))
@@ -103,14 +133,25 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
 
     if config.backend != "adoc":
         logger.info("Running AsciiDoctor...")
-        convert_documents(documents, config, pkg_mgr)
+        with profiler.phase("convert_documents"):
+            convert_documents(documents, config, pkg_mgr)
     else:
         logger.info("Skipping AsciiDoctor")
 
+    if build_manifest is not None:
+        build_manifest.save()
+
     if config.backend != "pdf":
-        with tqdm(desc="Copying images          ", unit="pkg") as progress:
+        with tqdm(desc="Copying images          ", unit="pkg") as progress, \
+                profiler.phase("make_image_directory"):
             pkg_mgr.make_image_directory(config.destination_dir, progress)
 
+    if config.profile_report is not None:
+        if render_profiler is not None:
+            profiler.sections["render"] = render_profiler.report()
+            render_profiler.write_stacks(config.profile_report.with_suffix(".folded"))
+        profiler.write_report(config.profile_report)
+
 
 def human_traceback(pkg_mgr: PackageManager) -> str:
     """Generate a human readable traceback the current exception. To be used inside an except
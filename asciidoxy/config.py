@@ -63,6 +63,8 @@ class Configuration(argparse.Namespace):
     image_dir: Optional[Path] = None
     spec_file: Optional[Path] = None
     version_file: Optional[Path] = None
+    connections_per_host: int = 4
+    download_cache_dir: Optional[Path] = None
     python_dir: Optional[Path] = None
 
     build_dir: Path
@@ -74,8 +76,14 @@ class Configuration(argparse.Namespace):
     warnings_are_errors: bool
     debug: bool
     log_level: str
+    profile_report: Optional[Path] = None
     force_language: Optional[str] = None
     multipage: bool
+    jobs: int = 1
+    stream_xml: bool = False
+    lazy_reference: bool = False
+    incremental: bool = False
+    single_pass: bool = False
 
     safe_mode: str
     attribute: List[str]
@@ -128,6 +136,22 @@ def parse_args(argv):
                                      default=None,
                                      type=PathArgument(existing_file=True),
                                      help="Version specification file.")
+    external_data_group.add_argument(
+        "--connections-per-host",
+        metavar="CONNECTIONS",
+        default=4,
+        type=int,
+        help="Maximum number of simultaneous connections to a single host when downloading"
+        " packages. Defaults to 4.")
+    external_data_group.add_argument(
+        "--download-cache-dir",
+        metavar="DOWNLOAD_CACHE_DIR",
+        default=None,
+        type=PathArgument(new_dir=True),
+        help="Directory for storing downloaded packages, shared between build directories."
+        " Packages downloaded before are linked into the build directory instead of being"
+        " downloaded again. Can be used by multiple builds at the same time, for example"
+        " `~/.cache/asciidoxy`.")
 
     output_group = parser.add_argument_group(title="Controlling output")
     output_group.add_argument("--build-dir",
@@ -163,14 +187,39 @@ def parse_args(argv):
         metavar="LANGUAGE",
         help="Force language used when parsing doxygen XML files. Ignores the"
         " language specified in the XML files.")
+    behavior_group.add_argument(
+        "-j",
+        "--jobs",
+        metavar="JOBS",
+        default=1,
+        type=int,
+        help="Number of processes to use for loading the API reference, for generating documents,"
+        " and for running AsciiDoctor in multipage mode. Defaults to 1.")
+    behavior_group.add_argument(
+        "--stream-xml",
+        action="store_true",
+        help="Process Doxygen XML files while reading them, instead of reading each file"
+        " completely first. Reduces memory usage for very large XML files.")
+    behavior_group.add_argument(
+        "--lazy-reference",
+        action="store_true",
+        help="Only parse the Doxygen XML files containing elements that the documents use, using"
+        " the index.xml generated by Doxygen. Speeds up building small documents for large API"
+        " references. Directories without an index.xml are parsed completely. The API reference"
+        " cache is only used for these directories.")
+    behavior_group.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only generate documents that changed since the previous build in the same build"
+        " directory. Changes in Python code imported from the documents are not detected.")
     behavior_group.add_argument(
         "--cache-dir",
         metavar="CACHE_DIR",
         default=None,
         type=PathArgument(new_dir=True),
         help="Directory for caching generated python code for templates and input"
-        " documents. Reduces runtime for consecutive runs by skipping code"
-        "generation for unchanged files.")
+        " documents, and the API reference loaded from packages. Reduces runtime for"
+        " consecutive runs by skipping code generation and parsing for unchanged files.")
 
     asciidoctor_group = parser.add_argument_group(
         title="AsciiDoctor options",
@@ -217,6 +266,15 @@ def parse_args(argv):
                              default="WARNING",
                              choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
                              help="Set the log level.")
+    debug_group.add_argument("--profile-report",
+                             metavar="PROFILE_REPORT",
+                             default=None,
+                             type=PathArgument(),
+                             help="Write the wall time, CPU time, increase of the peak memory usage"
+                             " and performance counters of each phase, and the slowest documents"
+                             " and inserted elements to a JSON file. Also writes the time spent"
+                             " rendering each stack of commands to a `.folded` file next to it, to"
+                             " use with flame graph tools.")
 
     experimental_group = parser.add_argument_group(title="Experimental features",
                                                    description="Use at your own risk!")
@@ -229,6 +287,12 @@ def parse_args(argv):
         " of the default templates shipped with AsciiDoxy. Templates found in this"
         " directory will be used in favor of the default templates. Only when a"
         " template is not found here, the default templates are used.")
+    experimental_group.add_argument(
+        "--single-pass",
+        action="store_true",
+        help="Render each document only once. Links and cross-document references are resolved"
+        " after all documents are rendered. Templates that modify the text of links may not work."
+        " Ignored when using `--incremental`.")
     if argv is None:
         argv = sys.argv[1:]
 
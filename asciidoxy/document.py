@@ -35,6 +35,7 @@ class Package:
 
     Attributes:
         name:              Name of the package.
+        version:           Version of the package, if known.
         reference_type:    Type of API reference information in the package.
         reference_dir:     Directory containing API reference information.
         adoc_src_dir:      Directory containing AsciiDoc files and other files to include in the
@@ -52,6 +53,7 @@ class Package:
     INPUT_PACKAGE_NAME: str = "INPUT"
 
     name: str
+    version: Optional[str] = None
     reference_type: Optional[str] = None
     reference_dir: Optional[Path] = None
     adoc_src_dir: Optional[Path] = None
@@ -103,6 +105,7 @@ class Document:
         children:      Other documents included in this document.
         included_in:   Document including this document, if present.
         stylesheet:    Name of the stylesheet to apply.
+        is_up_to_date: True if the output of a previous build is reused for this document.
     """
     relative_path: Path
     package: Package
@@ -113,6 +116,7 @@ class Document:
     embedded_in: List["Document"]
     is_root: bool
     stylesheet: Optional[str]
+    is_up_to_date: bool
 
     _title: Optional[str] = None
 
@@ -126,6 +130,7 @@ class Document:
         self.embedded_in = []
         self.is_root = False
         self.stylesheet = None
+        self.is_up_to_date = False
 
     @property
     def original_file(self) -> Path:
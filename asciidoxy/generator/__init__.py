@@ -16,5 +16,9 @@
 from .asciidoc import Context, process_adoc
 from .errors import AsciiDocError
 from .filters import InsertionFilter
+from .incremental import BuildManifest
+from .profiling import RenderProfiler
 
-__all__ = ["process_adoc", "AsciiDocError", "Context", "InsertionFilter"]
+__all__ = [
+    "process_adoc", "AsciiDocError", "BuildManifest", "Context", "InsertionFilter", "RenderProfiler"
+]
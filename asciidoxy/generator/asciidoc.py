@@ -18,16 +18,21 @@ import inspect
 import logging
 import warnings
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from functools import wraps
 from pathlib import Path
 from typing import (
     Any,
     Callable,
+    ContextManager,
+    Dict,
     List,
     MutableMapping,
     NamedTuple,
     Optional,
     Sequence,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -49,8 +54,9 @@ from ..model import ReferableElement
 from ..packaging import PackageManager, UnknownFileError, UnknownPackageError
 from ..parser.doxygen import safe_language_tag
 from ..path_utils import relative_path
+from ..profiling import count, counters
 from ..transcoder import TranscoderBase
-from .context import Context, stacktrace
+from .context import AnchorData, Context, InsertData, StackFrame, SubContextState, stacktrace
 from .errors import (
     AmbiguousReferenceError,
     ConsistencyError,
@@ -65,7 +71,10 @@ from .errors import (
     UnlinkableError,
 )
 from .filters import FilterSpec, InsertionFilter
+from .incremental import BuildManifest
 from .navigation import multipage_toc, navigation_bar
+from .profiling import RenderProfiler
+from .templates.preprocessing import preprocessor_for
 
 logger = logging.getLogger(__name__)
 
@@ -174,6 +183,12 @@ def _proxy_stackframe(*args, name: Optional[str] = None, **kwargs):
     return _stackframe(*args, name=name, _name=_name, _context=_context, _api=_api, **kwargs)
 
 
+def _frame_description(frame: StackFrame) -> str:
+    if frame.file is not None:
+        return f"{frame.file}: {frame.command}"
+    return frame.command
+
+
 class Api(ABC):
     """Methods to insert and link to API reference documentation from AsciiDoc files."""
     class TemplateKey(NamedTuple):
@@ -580,31 +595,33 @@ class Api(ABC):
              AmbiguousReferenceError: There are multiple elements matching the criteria.
              ReferenceNotFoundError: There are no elements matching the criteria.
         """
-        if lang is not None:
-            lang = safe_language_tag(lang)
-        else:
-            lang = self._context.language
+        with self._measure("find", name):
+            if lang is not None:
+                lang = safe_language_tag(lang)
+            else:
+                lang = self._context.language
 
-        try:
-            element = self._context.reference.find(name=name,
-                                                   namespace=self._context.namespace,
-                                                   kind=kind,
-                                                   lang=lang,
-                                                   allow_overloads=allow_overloads)
-        except AmbiguousLookupError as ex:
-            raise AmbiguousReferenceError(name, ex.candidates)
-
-        if element is None:
-            if (lang and lang == self._context.language and self._context.source_language):
-                source_element = self.find_element(name,
-                                                   kind=kind,
-                                                   lang=self._context.source_language,
-                                                   allow_overloads=allow_overloads)
-                if source_element is not None:
-                    return TranscoderBase.transcode(source_element, lang, self._context.reference)
-
-            raise ReferenceNotFoundError(name, lang=lang, kind=kind)
-        return element
+            try:
+                element = self._context.reference.find(name=name,
+                                                       namespace=self._context.namespace,
+                                                       kind=kind,
+                                                       lang=lang,
+                                                       allow_overloads=allow_overloads)
+            except AmbiguousLookupError as ex:
+                raise AmbiguousReferenceError(name, ex.candidates)
+
+            if element is None:
+                if (lang and lang == self._context.language and self._context.source_language):
+                    source_element = self.find_element(name,
+                                                       kind=kind,
+                                                       lang=self._context.source_language,
+                                                       allow_overloads=allow_overloads)
+                    if source_element is not None:
+                        return TranscoderBase.transcode(source_element, lang,
+                                                        self._context.reference)
+
+                raise ReferenceNotFoundError(name, lang=lang, kind=kind)
+            return element
 
     @abstractmethod
     def insert_fragment(self,
@@ -643,10 +660,11 @@ class Api(ABC):
             Rendered AsciiDoc.
         """
         template = self._context.document_cache.get_document(self._context.document)
-        return template.render(api=ApiProxy(self),
-                               env=self._context.env,
-                               config=self._context.config,
-                               **self._commands())
+        with self._measure("document", str(self._context.document.relative_path)):
+            return template.render(api=ApiProxy(self),
+                                   env=self._context.env,
+                                   config=self._context.config,
+                                   **self._commands())
 
     @abstractmethod
     def process_adoc(self) -> None:
@@ -714,13 +732,22 @@ class Api(ABC):
         else:
             kind = kind_override
 
+        self._context.document_dependencies().templates.add((element.language, kind))
         template = self._context.templates.template_for(element.language, kind)
-        return template.render(element=element,
-                               insert_filter=insert_filter,
-                               api_context=self._context,
-                               api=self,
-                               leveloffset=leveloffset,
-                               **self._commands())
+        with self._measure("insert", element.full_name, f"{element.language}/{kind}"):
+            return template.render(element=element,
+                                   insert_filter=insert_filter,
+                                   api_context=self._context,
+                                   api=self,
+                                   leveloffset=leveloffset,
+                                   **self._commands())
+
+    def _measure(self, kind: str, name: str, template: Optional[str] = None) -> ContextManager:
+        profiler = self._context.render_profiler
+        if profiler is None:
+            return nullcontext()
+        return profiler.measure(kind, name,
+                                [_frame_description(f) for f in self._context.call_stack], template)
 
     def _file_top_anchor(self, doc: Document) -> str:
         return "top-" + "-".join(doc.relative_path.with_suffix("").parts) + "-top"
@@ -749,7 +776,21 @@ class PreprocessingApi(Api):
                         insert_filter: InsertionFilter,
                         leveloffset: Union[str, int] = "+1",
                         kind_override: Optional[str] = None) -> str:
-        self._render(element, insert_filter, kind_override)
+        assert element.id
+        assert element.language
+
+        kind = element.kind if kind_override is None else kind_override
+        if self._context.config.template_dir is None:
+            preprocessor = preprocessor_for(element.language, kind)
+        else:
+            # Custom templates can replace any template, including templates that are included
+            preprocessor = None
+
+        if preprocessor is None:
+            self._render(element, insert_filter, kind_override)
+        else:
+            self._context.document_dependencies().templates.add((element.language, kind))
+            preprocessor(self, element, insert_filter)
         return ""
 
     def inserted(self, element: ReferableElement) -> str:
@@ -769,6 +810,7 @@ class PreprocessingApi(Api):
             self._context.progress.update(0)
 
         self.render_adoc()
+        count("documents_preprocessed")
 
         if self._context.progress is not None:
             self._context.progress.update()
@@ -878,19 +920,26 @@ class GeneratingApi(Api):
 
     @_api_stackframe(name="link", show_args=("link_text", ), internal=True)
     def link_to_element(self, element_id: str, link_text: str) -> str:
-        containing_doc = self._context.file_with_element(element_id)
-        if containing_doc is not None:
-            file_part = f"{self._context.document.relative_path_to(containing_doc)}#"
-        else:
-            file_part = ""
-
-        return f"xref:{file_part}{element_id}[++{link_text}++]"
+        return f"xref:{self._link_file_part(element_id)}{element_id}[++{link_text}++]"
 
     def process_adoc(self):
+        build_manifest = self._context.build_manifest
+        if build_manifest is not None and build_manifest.is_up_to_date(self._context.document):
+            self._restore_adoc(build_manifest)
+            return
+
+        self.generate_adoc()
+
+    def generate_adoc(self):
+        """Render the document and write it to its work file."""
         logger.info(f"Processing {self._context.document}")
         self._context.linked = []
 
-        rendered_doc = self.render_adoc()
+        self.write_adoc(self.render_adoc())
+
+    def write_adoc(self, rendered_doc: str) -> None:
+        """Write the rendered AsciiDoc to the work file of the document."""
+        build_manifest = self._context.build_manifest
 
         with self._context.document.work_file.open("w", encoding="utf-8") as f:
             print(rendered_doc, file=f)
@@ -899,8 +948,36 @@ class GeneratingApi(Api):
                 if nav_bar:
                     print(nav_bar, file=f)
 
+        count("documents_rendered")
+        count("bytes_written", self._context.document.work_file.stat().st_size)
+
+        self._copy_stylesheet()
+        if build_manifest is not None:
+            build_manifest.store_output(self._context.document)
+
+        if self._context.progress is not None:
+            self._context.progress.update()
+
+    def _link_file_part(self, element_id: str) -> str:
+        containing_doc = self._context.file_with_element(element_id)
+        if containing_doc is not None:
+            return f"{self._context.document.relative_path_to(containing_doc)}#"
+        else:
+            return ""
+
+    def _restore_adoc(self, build_manifest: BuildManifest):
+        document = self._context.document
+        logger.info(f"Skipping unchanged {document}")
+
+        build_manifest.restore_output(document)
+        document.is_up_to_date = True
+        count("documents_restored")
         self._copy_stylesheet()
 
+        for child in document.children:
+            if child.included_in is document:
+                self.__class__(self._context.restored_sub_context(child)).process_adoc()
+
         if self._context.progress is not None:
             self._context.progress.update()
 
@@ -914,6 +991,79 @@ class GeneratingApi(Api):
             css_source_file.read_text(encoding="utf-8"), encoding="utf-8")
 
 
+class SinglePassApi(GeneratingApi):
+    """Generate documents while registering includes, inserts, links and anchors.
+
+    Output that depends on documents that are not processed yet, like links to elements in other
+    documents and cross-document references, is replaced by a placeholder. The documents are only
+    written after all documents are processed and the placeholders are resolved.
+    """
+    # Register includes and inserted elements like the preprocessing pass
+    _sub_api = PreprocessingApi._sub_api
+    inserted = PreprocessingApi.inserted
+
+    def multipage_toc(self, side: str = "left") -> str:
+        if not self._context.config.multipage:
+            return ""
+        return self._context.defer(functools.partial(super().multipage_toc, side))
+
+    def cross_document_ref(self,
+                           file_name: Optional[str] = None,
+                           *,
+                           package_name: Optional[str] = None,
+                           anchor: Optional[str] = None,
+                           link_text: Optional[str] = None) -> str:
+        if not file_name and not package_name and not anchor:
+            raise InvalidApiCallError("At least `file_name`, `package_name`, or `anchor` is "
+                                      "required.")
+        if file_name and Path(file_name).is_absolute():
+            raise InvalidApiCallError("`file_name` must be a relative path.")
+
+        return self._context.defer(
+            functools.partial(super().cross_document_ref,
+                              file_name,
+                              package_name=package_name,
+                              anchor=anchor,
+                              link_text=link_text))
+
+    def anchor(self, name: str, *, link_text: Optional[str] = None) -> str:
+        if not name:
+            raise InvalidApiCallError("`name` cannot be empty.")
+        self._context.register_anchor(name, link_text)
+        return super().anchor(name, link_text=link_text)
+
+    @_api_stackframe(name="link", show_args=("link_text", ), internal=True)
+    def link_to_element(self, element_id: str, link_text: str) -> str:
+        self._context.link_to_element(element_id)
+        return f"xref:{self._link_file_part(element_id)}{element_id}[++{link_text}++]"
+
+    def process_adoc(self):
+        logger.info(f"Processing {self._context.document}")
+
+        if self._context.progress is not None:
+            self._context.progress.total = 2 * len(self._context.documents)
+            self._context.progress.update(0)
+
+        self._context.rendered.append((self._context, self.render_adoc()))
+
+        if self._context.progress is not None:
+            self._context.progress.update()
+
+    def _link_file_part(self, element_id: str) -> str:
+        if not self._context.config.multipage:
+            return ""
+        return self._context.defer(functools.partial(super()._link_file_part, element_id))
+
+
+class _GeneratingWorkerApi(GeneratingApi):
+    """Generate a single document in a worker process.
+
+    Each included document is generated separately, so it is not processed when it is included.
+    """
+    def process_adoc(self):
+        pass
+
+
 class ApiProxy:
     """Proxy for exposing legacy `api.` commands."""
     _api: Api
@@ -974,7 +1124,9 @@ def process_adoc(doc: Document,
                  api_reference: ApiReference,
                  package_manager: PackageManager,
                  config: Configuration,
-                 progress: Optional[tqdm] = None) -> List[Document]:
+                 progress: Optional[tqdm] = None,
+                 build_manifest: Optional[BuildManifest] = None,
+                 render_profiler: Optional[RenderProfiler] = None) -> List[Document]:
     """Process an AsciiDoc file and execute all embedded python code.
 
     Args:
@@ -983,6 +1135,10 @@ def process_adoc(doc: Document,
         package_manager:     Reference to the package manager to get additional files from.
         config:              Configuration from the command line arguments.
         progress:            Optional progress reporting widget.
+        build_manifest:      Manifest of the previous build. If given, only documents that changed
+                                 since the previous build are generated.
+        render_profiler:     Optional profiler to measure the time spent generating each document
+                                 and inserting each element.
 
     Returns:
         Dictionary that maps input AsciiDoc files to output AsciiDoc files with inserted API
@@ -996,11 +1152,152 @@ def process_adoc(doc: Document,
                       config=config)
 
     context.progress = progress
+    context.build_manifest = build_manifest
+
+    if config.single_pass and build_manifest is None:
+        context.render_profiler = render_profiler
+        SinglePassApi(context).process_adoc()
+        _check_links(context)
+        for sub_context, rendered_doc in context.rendered:
+            GeneratingApi(sub_context).write_adoc(context.resolve_deferred(rendered_doc))
+
+    else:
+        PreprocessingApi(context).process_adoc()
+        _check_links(context)
+        if build_manifest is not None:
+            build_manifest.update(context.documents.values(), context.anchors, context.inserted,
+                                  context.dependencies, api_reference, config)
+        context.render_profiler = render_profiler
+        documents_to_generate = [
+            d for d in context.documents.values() if d.is_root or d.is_included
+        ]
+        if build_manifest is None and config.jobs > 1 and len(documents_to_generate) > 1:
+            _generate_parallel(context, documents_to_generate)
+        else:
+            GeneratingApi(context).process_adoc()
 
-    PreprocessingApi(context).process_adoc()
-    _check_links(context)
-    GeneratingApi(context).process_adoc()
-    return list(context.documents.values())
+    context.document_cache.prune()
+
+    documents = list(context.documents.values())
+    if not config.multipage:
+        # In single page mode all documents are included in the root document
+        doc.is_up_to_date = all(d.is_up_to_date for d in documents
+                                if d.is_used and not d.is_embedded)
+    return documents
+
+
+class _GeneratingState(NamedTuple):
+    """State from the preprocessing pass needed to generate documents in a worker process."""
+    reference: ApiReference
+    package_manager: PackageManager
+    config: Configuration
+    document: Document
+    documents: Dict[Path, Document]
+    inserted: MutableMapping[str, InsertData]
+    anchors: Dict[str, AnchorData]
+    sub_context_states: Dict[Path, SubContextState]
+    profile: bool
+
+
+_worker_context: Optional[Context] = None
+
+
+def _generate_parallel(context: Context, documents: List[Document]) -> None:
+    """Generate documents using a pool of worker processes.
+
+    Each worker process generates complete documents, including the documents embedded in them.
+    Workers get a snapshot of the state collected in the preprocessing pass, which is read-only
+    while generating.
+    """
+    state = _GeneratingState(context.reference, context.package_manager, context.config,
+                             context.document, context.documents, context.inserted, context.anchors,
+                             context.sub_context_states, context.render_profiler is not None)
+
+    failed_document: Optional[Document] = None
+    try:
+        with ProcessPoolExecutor(max_workers=min(context.config.jobs, len(documents)),
+                                 initializer=_init_generating_worker,
+                                 initargs=(state, )) as executor:
+            results = executor.map(_generate_in_worker, [d.relative_path for d in documents])
+            for document in documents:
+                failed_document = document
+                stylesheet, worker_counters, render_profiler = next(results)
+                failed_document = None
+
+                document.stylesheet = stylesheet
+                for name, amount in worker_counters.items():
+                    count(name, amount)
+                if context.render_profiler is not None and render_profiler is not None:
+                    context.render_profiler.merge(render_profiler)
+
+                if context.progress is not None:
+                    context.progress.update()
+
+    except Exception:
+        if failed_document is None:
+            raise
+        # Errors from a worker lose their traceback into the AsciiDoc files. Generate the document
+        # again in this process to raise the error with the complete traceback.
+        logger.debug(f"Generating {failed_document.relative_path} failed in a worker process.")
+        _generate_document(_generating_context(state), failed_document.relative_path)
+        raise
+
+
+def _generating_context(state: _GeneratingState) -> Context:
+    context = Context(reference=state.reference,
+                      package_manager=state.package_manager,
+                      document=state.document,
+                      config=state.config)
+    context.documents = state.documents
+    context.inserted = state.inserted
+    context.anchors = state.anchors
+    context.sub_context_states = state.sub_context_states
+    if state.profile:
+        context.render_profiler = RenderProfiler()
+    return context
+
+
+def _init_generating_worker(state: _GeneratingState) -> None:
+    global _worker_context
+    _worker_context = _generating_context(state)
+
+
+def _generate_in_worker(
+        relative_path: Path) -> Tuple[Optional[str], Dict[str, int], Optional[RenderProfiler]]:
+    assert _worker_context is not None
+    if _worker_context.render_profiler is not None:
+        _worker_context.render_profiler = RenderProfiler()
+    start_counters = counters()
+
+    stylesheet = _generate_document(_worker_context, relative_path)
+
+    worker_counters = {
+        name: value - start_counters.get(name, 0)
+        for name, value in counters().items() if value != start_counters.get(name, 0)
+    }
+    return stylesheet, worker_counters, _worker_context.render_profiler
+
+
+def _generate_document(root_context: Context, relative_path: Path) -> Optional[str]:
+    """Generate a single document using the state from the preprocessing pass.
+
+    Returns:
+        The stylesheet selected by the document.
+    """
+    document = root_context.documents[relative_path]
+
+    # Restore the state passed to each document on the path from the root document
+    parents = []
+    parent: Optional[Document] = document
+    while parent is not None and parent is not root_context.document:
+        parents.append(parent)
+        parent = parent.parent()
+    context = root_context
+    for doc in reversed(parents):
+        context = context.restored_sub_context(doc)
+
+    _GeneratingWorkerApi(context).generate_adoc()
+    return document.stylesheet
 
 
 def _check_links(context: Context):
@@ -13,18 +13,35 @@
 # limitations under the License.
 """Cache implementation for Mako templates supporting package resources."""
 
+import hashlib
+import importlib.util
+import logging
+import os
+import time
 from pathlib import Path
 from typing import List, Optional
 
+import mako
 from mako.exceptions import TopLevelLookupException
 from mako.lookup import TemplateLookup
-from mako.template import Template
+from mako.template import ModuleTemplate, Template
 
 import asciidoxy.generator.templates
 
+from .._version import __version__
 from ..compat import importlib_resources
 from ..document import Document
+from ..profiling import count
 from .errors import TemplateMissingError
+from .templates.bundle import load_bundled_template
+
+logger = logging.getLogger(__name__)
+
+
+def _count_compilation(source: str) -> str:
+    # Mako only runs preprocessors when compiling a template, not when loading it from the cache
+    count("templates_compiled")
+    return source
 
 
 class BaseCache(TemplateLookup):
@@ -37,6 +54,8 @@ class BaseCache(TemplateLookup):
             kwargs["filesystem_checks"] = False
         if "input_encoding" not in kwargs:
             kwargs["input_encoding"] = "utf-8"
+        if "preprocessor" not in kwargs:
+            kwargs["preprocessor"] = _count_compilation
 
         super().__init__(*args, **kwargs)
 
@@ -52,17 +71,32 @@ def _generate_python_path_code(python_paths: Optional[List[Path]]) -> List[str]:
 
 
 class DocumentCache(BaseCache):
-    """Cache for input documents."""
+    """Cache for input documents.
+
+    If a cache directory is given, the Python code generated for each document is stored in it.
+    The code is stored under a hash of the document contents, its path, the Python paths, and the
+    versions of AsciiDoxy and Mako. Changing any of these results in a different file, so a stale
+    file is never used. Use `prune` to remove files that are no longer used.
+
+    Attributes:
+        cache_dir: Directory to store the generated code in, if any.
+    """
+    cache_dir: Optional[Path]
+
+    DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+    DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
     def __init__(self,
                  cache_dir: Optional[Path] = None,
                  python_paths: Optional[List[Path]] = None,
                  *args,
                  **kwargs):
         super().__init__("documents",
-                         cache_dir,
+                         None,
                          imports=_generate_python_path_code(python_paths),
                          *args,
                          **kwargs)
+        self.cache_dir = cache_dir / "documents" if cache_dir is not None else None
 
     def get_document(self, document: Document) -> Template:
         return self.get_template(str(document.original_file))
@@ -72,10 +106,99 @@ class DocumentCache(BaseCache):
             return super().get_template(uri)
 
         except TopLevelLookupException:
-            template = Template(uri=uri, filename=uri, lookup=self, **self.template_args)
+            if self.cache_dir is None:
+                template = Template(uri=uri, filename=uri, lookup=self, **self.template_args)
+            else:
+                template = self._load_or_compile(uri)
             self.put_template(uri, template)
             return template
 
+    def prune(self, max_size: int = DEFAULT_MAX_SIZE, max_age: float = DEFAULT_MAX_AGE) -> None:
+        """Remove generated code from the cache directory.
+
+        Code that has not been used for `max_age` seconds is removed. If the remaining code is
+        larger than `max_size` bytes, the least recently used code is removed as well.
+        """
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return
+
+        entries = []
+        for module_file in self.cache_dir.rglob("*.py"):
+            stats = [f.stat() for f in _module_files(module_file) if f.is_file()]
+            if stats:
+                entries.append(
+                    (max(s.st_mtime for s in stats), sum(s.st_size for s in stats), module_file))
+
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        oldest_allowed = time.time() - max_age
+        total_size = 0
+        for last_used, size, module_file in entries:
+            total_size += size
+            if last_used < oldest_allowed or total_size > max_size:
+                for f in _module_files(module_file):
+                    if f.is_file():
+                        f.unlink()
+                count("documents_pruned")
+
+    def _load_or_compile(self, uri: str) -> Template:
+        assert self.cache_dir is not None
+        source = Path(uri).read_bytes()
+        module_file = self.cache_dir / f"{self._key(uri, source)}.py"
+
+        if module_file.is_file():
+            try:
+                spec = importlib.util.spec_from_file_location(f"_document_{module_file.stem}",
+                                                              module_file)
+                assert spec is not None and spec.loader is not None
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                _mark_used(module_file)
+                return ModuleTemplate(module,
+                                      module_filename=str(module_file),
+                                      module_source=module_file.read_text(encoding="utf-8"),
+                                      template_filename=uri,
+                                      template_source=source,
+                                      lookup=self)
+            except Exception:
+                logger.debug(f"Cannot load cached code for {uri}.", exc_info=True)
+
+        template = Template(text=source, uri=uri, filename=uri, lookup=self, **self.template_args)
+        self._store(module_file, template.code)
+        return template
+
+    def _store(self, module_file: Path, code: str) -> None:
+        tmp_file = module_file.with_name(f"{module_file.name}.{os.getpid()}.tmp")
+        try:
+            module_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_text(code, encoding="utf-8")
+            os.replace(tmp_file, module_file)
+        except OSError:
+            logger.warning(f"Failed to store generated code in {module_file}.", exc_info=True)
+            if tmp_file.exists():
+                tmp_file.unlink()
+
+    def _key(self, uri: str, source: bytes) -> str:
+        key = hashlib.sha256()
+        for part in (__version__, mako.__version__, uri, *self.template_args["imports"]):
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+        key.update(source)
+        return key.hexdigest()
+
+
+def _module_files(module_file: Path) -> List[Path]:
+    # The module and the bytecode Python caches for it
+    return [module_file, Path(importlib.util.cache_from_source(str(module_file)))]
+
+
+def _mark_used(module_file: Path) -> None:
+    # Python checks the modification time of the module to validate the bytecode, so mark the
+    # bytecode if it exists
+    for f in reversed(_module_files(module_file)):
+        if f.is_file():
+            os.utime(f)
+            return
+
 
 class TemplateCache(BaseCache):
     """Cache for Mako templates used by AsciiDoxy.
@@ -84,6 +207,8 @@ class TemplateCache(BaseCache):
     constructor. If templates are not found in the custom location, the internal package resources
     of AsciiDoxy are searched.
 
+    Built-in templates are loaded from the bundle of precompiled templates, if it is installed.
+
     By default file system checks for changes to source files are disabled.
     """
     def __init__(self,
@@ -112,10 +237,12 @@ class TemplateCache(BaseCache):
             source = importlib_resources.files(asciidoxy.generator.templates).joinpath(uri)
             if source.is_file():
                 with importlib_resources.as_file(source) as source_file:
-                    template = Template(uri=uri,
-                                        filename=str(source_file),
-                                        lookup=self,
-                                        **self.template_args)
+                    template = load_bundled_template(uri, source_file, self)
+                    if template is None:
+                        template = Template(uri=uri,
+                                            filename=str(source_file),
+                                            lookup=self,
+                                            **self.template_args)
                 self.put_template(uri, template)
                 return template
             else:
@@ -15,9 +15,10 @@
 
 import copy
 import logging
+import re
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, MutableMapping, NamedTuple, Optional, Tuple
+from typing import Callable, Dict, List, MutableMapping, NamedTuple, Optional, Tuple
 
 from tqdm import tqdm
 
@@ -29,9 +30,13 @@ from ..packaging import PackageManager, UnknownFileError
 from .cache import DocumentCache, TemplateCache
 from .errors import ConsistencyError, DuplicateAnchorError, UnknownAnchorError
 from .filters import InsertionFilter
+from .incremental import BuildManifest, DocumentDependencies
+from .profiling import RenderProfiler
 
 logger = logging.getLogger(__name__)
 
+_DEFERRED_PLACEHOLDER = re.compile("\ue000([0-9]+)\ue001")
+
 
 class Environment(object):
     """Namespace for holding environment variables to be shared between different AsciiDoc files.
@@ -119,6 +124,15 @@ class InsertData(NamedTuple):
     stacktrace: List[StackFrame]
 
 
+class SubContextState(NamedTuple):
+    """State passed from a document to an included document when it is processed."""
+    namespace: Optional[str]
+    language: Optional[str]
+    source_language: Optional[str]
+    env: Environment
+    insert_filter: InsertionFilter
+
+
 class Context(object):
     """Contextual information about the document being generated.
 
@@ -138,6 +152,13 @@ class Context(object):
         documents:             All known documents.
         document_stack:        Stack of documents containing/including the current document.
         config:                The configuration deduced from the command line arguments.
+        build_manifest:        Manifest of the previous build, if building incrementally.
+        dependencies:          Inputs used by each document.
+        sub_context_states:    State passed to each included document, if building incrementally
+                                   or generating documents in parallel.
+        render_profiler:       Measures the time spent rendering, if enabled.
+        deferred:              Text that can only be generated after all documents are processed.
+        rendered:              Documents rendered with placeholders for the deferred text.
     """
     namespace: Optional[str] = None
     language: Optional[str] = None
@@ -163,6 +184,15 @@ class Context(object):
 
     config: Configuration
 
+    build_manifest: Optional[BuildManifest] = None
+    dependencies: Dict[Path, DocumentDependencies]
+    sub_context_states: Dict[Path, SubContextState]
+
+    render_profiler: Optional[RenderProfiler] = None
+
+    deferred: List[Callable[[], str]]
+    rendered: List[Tuple["Context", str]]
+
     def __init__(self, reference: ApiReference, package_manager: PackageManager, document: Document,
                  config: Configuration):
         self.insert_filter = InsertionFilter(members={"prot": ["+public", "+protected"]})
@@ -185,6 +215,12 @@ class Context(object):
 
         self.config = config
 
+        self.dependencies = {}
+        self.sub_context_states = {}
+
+        self.deferred = []
+        self.rendered = []
+
     def insert(self, element: ReferableElement) -> None:
         """Register insertion of an element."""
         assert element.id
@@ -198,35 +234,50 @@ class Context(object):
             else:
                 logger.warning(msg)
         self.inserted[element.id] = InsertData(self.document, self.call_stack[:])
+        self.document_dependencies().inserted.add(element.id)
 
     def sub_context(self, document: Document) -> "Context":
-        """Create a new sub context to process `document`."""
-        sub = Context(reference=self.reference,
-                      package_manager=self.package_manager,
-                      document=document,
-                      config=self.config)
-
-        # Copies
-        sub.namespace = self.namespace
-        sub.language = self.language
-        sub.source_language = self.source_language
+        """Create a new sub context to process `document`.
+
+        The sub context shares all state with this context, including the caches, except for the
+        state below. The insertion filter is immutable, so it is shared as well.
+        """
+        sub = copy.copy(self)
+        sub.document = document
         sub.env = copy.copy(self.env)
-        sub.insert_filter = copy.deepcopy(self.insert_filter)
-        sub.document_stack = self.document_stack[:]
-        sub.document_stack.append(document)
-
-        # References
-        sub.linked = self.linked
-        sub.inserted = self.inserted
-        sub.anchors = self.anchors
-        sub.progress = self.progress
-        sub.call_stack = self.call_stack
-        sub.documents = self.documents
-        sub.templates = self.templates
-        sub.document_cache = self.document_cache
+        sub.document_stack = self.document_stack + [document]
+
+        if ((self.build_manifest is not None or self.config.jobs > 1)
+                and document.relative_path not in self.sub_context_states):
+            self.sub_context_states[document.relative_path] = SubContextState(
+                self.namespace, self.language, self.source_language, copy.copy(self.env),
+                self.insert_filter)
+
+        return sub
+
+    def restored_sub_context(self, document: Document) -> "Context":
+        """Create a new sub context to process `document` without processing the current document.
 
+        The state passed to the sub context is restored from the first time a sub context was
+        created for `document`.
+        """
+        sub = self.sub_context(document)
+        state = self.sub_context_states.get(document.relative_path)
+        if state is not None:
+            sub.namespace = state.namespace
+            sub.language = state.language
+            sub.source_language = state.source_language
+            sub.env = copy.copy(state.env)
+            sub.insert_filter = state.insert_filter
         return sub
 
+    def document_dependencies(self) -> DocumentDependencies:
+        """Inputs used by the current document."""
+        dependencies = self.dependencies.get(self.document.relative_path)
+        if dependencies is None:
+            dependencies = self.dependencies[self.document.relative_path] = DocumentDependencies()
+        return dependencies
+
     def file_with_element(self, element_id: str) -> Optional[Document]:
         """Find the file containing given element.
 
@@ -246,6 +297,7 @@ class Context(object):
     def link_to_element(self, element_id: str) -> None:
         """Register a link to an element."""
         self.linked[element_id].append(self.call_stack[:])
+        self.document_dependencies().linked.add(element_id)
 
     def find_document(self, package_name: Optional[str], rel_path: Optional[Path]) -> Document:
         """Find a document if it exists.
@@ -331,6 +383,33 @@ class Context(object):
             raise UnknownAnchorError(name)
         return self.link_to_document(anchor.document), anchor.link_text
 
+    def defer(self, generate: Callable[[], str]) -> str:
+        """Defer generating text until all documents are processed.
+
+        The stack of commands is restored while generating the text, for error reporting.
+
+        Args:
+            generate: Function generating the text.
+
+        Returns:
+            Placeholder to be replaced by the generated text using `resolve_deferred`.
+        """
+        call_stack = self.call_stack[:]
+
+        def _generate() -> str:
+            self.call_stack[:] = call_stack
+            try:
+                return generate()
+            finally:
+                del self.call_stack[:]
+
+        self.deferred.append(_generate)
+        return f"\ue000{len(self.deferred) - 1}\ue001"
+
+    def resolve_deferred(self, text: str) -> str:
+        """Replace the placeholders for deferred text with the generated text."""
+        return _DEFERRED_PLACEHOLDER.sub(lambda match: self.deferred[int(match.group(1))](), text)
+
     def push_stack(self,
                    command: str,
                    document: Optional[Document] = None,
@@ -36,6 +36,7 @@ class TemplateMissingError(AsciiDocError):
     kind: str
 
     def __init__(self, lang: str, kind: str):
+        super().__init__(lang, kind)
         self.lang = lang
         self.kind = kind
 
@@ -56,6 +57,7 @@ class ReferenceNotFoundError(AsciiDocError):
     kind: str
 
     def __init__(self, name: str, lang: Optional[str], kind: Optional[str]):
+        super().__init__(name, lang, kind)
         self.lang = lang or "any"
         self.kind = kind or "any"
         self.name = name
@@ -77,6 +79,7 @@ class UnlinkableError(AsciiDocError):
     kind: str
 
     def __init__(self, name: str, lang: Optional[str], kind: Optional[str]):
+        super().__init__(name, lang, kind)
         self.lang = lang or "any"
         self.kind = kind or "any"
         self.name = name
@@ -98,6 +101,7 @@ class AmbiguousReferenceError(AsciiDocError):
     candidates: List[ReferableElement]
 
     def __init__(self, name: str, candidates: List[ReferableElement]):
+        super().__init__(name, candidates)
         self.name = name
         self.candidates = candidates
 
@@ -122,6 +126,7 @@ class IncludeFileNotFoundError(AsciiDocError):
     file_name: str
 
     def __init__(self, file_name: str):
+        super().__init__(file_name)
         self.file_name = file_name
 
     def __str__(self) -> str:
@@ -139,6 +144,7 @@ class ConsistencyError(AsciiDocError):
     msg: str
 
     def __init__(self, msg: str):
+        super().__init__(msg)
         self.msg = msg
 
     def __str__(self) -> str:
@@ -152,6 +158,7 @@ class IncompatibleVersionError(AsciiDocError):
     required_version: str
 
     def __init__(self, required_version: str):
+        super().__init__(required_version)
         self.required_version = required_version
 
     def __str__(self) -> str:
@@ -168,6 +175,7 @@ class InvalidApiCallError(AsciiDocError):
     msg: str
 
     def __init__(self, msg: str):
+        super().__init__(msg)
         self.msg = msg
 
     def __str__(self) -> str:
@@ -183,6 +191,7 @@ class MissingPackageError(AsciiDocError):
     package_name: str
 
     def __init__(self, package_name: str):
+        super().__init__(package_name)
         self.package_name = package_name
 
     def __str__(self) -> str:
@@ -200,6 +209,7 @@ class MissingPackageFileError(AsciiDocError):
     file_name: Optional[str]
 
     def __init__(self, package_name: str, file_name: Optional[str]):
+        super().__init__(package_name, file_name)
         self.package_name = package_name
         self.file_name = file_name
 
@@ -219,6 +229,7 @@ class DuplicateAnchorError(AsciiDocError):
     anchor_name: str
 
     def __init__(self, anchor_name: str):
+        super().__init__(anchor_name)
         self.anchor_name = anchor_name
 
     def __str__(self) -> str:
@@ -234,6 +245,7 @@ class UnknownAnchorError(AsciiDocError):
     anchor_name: str
 
     def __init__(self, anchor_name: str):
+        super().__init__(anchor_name)
         self.anchor_name = anchor_name
 
     def __str__(self) -> str:
@@ -251,6 +263,7 @@ class DuplicateIncludeError(AsciiDocError):
     embedded: bool
 
     def __init__(self, document: Document, embedded: bool):
+        super().__init__(document, embedded)
         self.document = document
         self.embedded = embedded
 
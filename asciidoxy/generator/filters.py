@@ -15,7 +15,6 @@
 
 import collections
 import re
-import sys
 from abc import ABC, abstractmethod
 from enum import Enum
 from typing import Generator, List, Mapping, Optional, Pattern, Sequence, Type, TypeVar, Union
@@ -67,11 +66,6 @@ class IncludeStringFilter(StringFilter):
         else:
             return FilterAction.NEUTRAL
 
-    if sys.version_info < (3, 7):
-
-        def __deepcopy__(self, memo):
-            return IncludeStringFilter(self.include_pattern.pattern)
-
 
 class ExcludeStringFilter(StringFilter):
     """Exclude all values that match a regular expression."""
@@ -86,11 +80,6 @@ class ExcludeStringFilter(StringFilter):
         else:
             return FilterAction.NEUTRAL
 
-    if sys.version_info < (3, 7):
-
-        def __deepcopy__(self, memo):
-            return ExcludeStringFilter(self.exclude_pattern.pattern)
-
 
 class ChainedStringFilter(StringFilter):
     """Ordered chain of string filters.
@@ -288,7 +277,11 @@ def combine_specs(first: Optional[FilterSpec],
 
 
 class InsertionFilter:
-    """Filter members of an element to be inserted."""
+    """Filter members of an element to be inserted.
+
+    Insertion filters are immutable. Use `extend` to create a new filter. As they are never
+    changed, they are shared instead of copied.
+    """
     _member_filter: Optional[MemberFilter]
     _exception_filter: Optional[ExceptionFilter]
 
@@ -321,3 +314,9 @@ class InsertionFilter:
                exceptions: Optional[FilterSpec] = None) -> "InsertionFilter":
         return InsertionFilter(combine_specs(self._member_spec, members),
                                combine_specs(self._exception_spec, exceptions))
+
+    def __copy__(self) -> "InsertionFilter":
+        return self
+
+    def __deepcopy__(self, memo) -> "InsertionFilter":
+        return self
@@ -0,0 +1,278 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Support for incremental builds that only regenerate changed documents."""
+
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, MutableMapping, Optional, Set, Tuple
+
+from .._version import __version__
+from ..api_reference import ApiReference
+from ..config import Configuration
+from ..document import Document
+from ..model import json_repr
+
+logger = logging.getLogger(__name__)
+
+# Configuration options that influence the generated documents or the AsciiDoctor output. Other
+# options only change how the output is produced, like logging, caching and parallelism.
+_OUTPUT_CONFIG_OPTIONS = (
+    "input_file",
+    "base_dir",
+    "image_dir",
+    "spec_file",
+    "version_file",
+    "python_dir",
+    "build_dir",
+    "destination_dir",
+    "template_dir",
+    "warnings_are_errors",
+    "force_language",
+    "multipage",
+    "backend",
+    "safe_mode",
+    "attribute",
+    "doctype",
+    "require",
+    "failure_level",
+)
+
+
+class DocumentDependencies:
+    """Inputs used while generating a single document.
+
+    Attributes:
+        inserted:  Ids of all elements inserted in the document.
+        linked:    Ids of all elements linked to from the document.
+        templates: Language and kind of all templates rendered for the document.
+    """
+    inserted: Set[str]
+    linked: Set[str]
+    templates: Set[Tuple[str, str]]
+
+    def __init__(self):
+        self.inserted = set()
+        self.linked = set()
+        self.templates = set()
+
+
+class BuildManifest:
+    """Manifest of the inputs used to generate each document in a previous build.
+
+    The manifest stores a fingerprint of all inputs of each document, together with a copy of the
+    generated output. If the fingerprint of a document did not change, the previous output can be
+    restored instead of generating the document again.
+
+    Changes in the structure of the documentation, like the documents that exist, their titles,
+    anchors and the location of inserted elements, cause all documents to be regenerated. Changes
+    in a document also cause all documents included from it to be regenerated, because they may
+    depend on the state set up by their parent. Changes in Python code imported from documents are
+    not detected.
+
+    Attributes:
+        manifest_dir: Directory to store the manifest and the copies of the output.
+    """
+    manifest_dir: Path
+
+    _previous: Mapping[str, Mapping[str, Any]]
+    _current: MutableMapping[str, Dict[str, Any]]
+    _source_hashes: Dict[Path, str]
+
+    def __init__(self, manifest_dir: Path):
+        self.manifest_dir = manifest_dir
+        self._current = {}
+        self._source_hashes = {}
+
+        try:
+            with self.manifest_file.open("r", encoding="utf-8") as f:
+                self._previous = json.load(f).get("documents", {})
+        except (OSError, ValueError):
+            logger.debug(f"No valid build manifest in {manifest_dir}, generating all documents.")
+            self._previous = {}
+
+    @property
+    def manifest_file(self) -> Path:
+        return self.manifest_dir / "manifest.json"
+
+    def update(self, documents: Iterable[Document], anchors: Mapping[str, Any],
+               inserted: Mapping[str, Any], dependencies: Mapping[Path, DocumentDependencies],
+               reference: ApiReference, config: Configuration) -> None:
+        """Determine the inputs of all documents after preprocessing.
+
+        Args:
+            documents:    All documents in the documentation.
+            anchors:      All flexible anchors and the documents containing them.
+            inserted:     All inserted elements and the documents containing them.
+            dependencies: Inputs used by each document.
+            reference:    API reference the elements are taken from.
+            config:       The configuration deduced from the command line arguments.
+        """
+        documents = sorted(documents, key=lambda d: d.relative_path)
+        global_fingerprint = self._global_fingerprint(documents, anchors, inserted, config)
+
+        for doc in documents:
+            if not doc.is_used or doc.is_embedded:
+                continue
+
+            fingerprint = hashlib.sha256(global_fingerprint.encode("utf-8"))
+            doc_dependencies = DocumentDependencies()
+
+            for ancestor in _ancestors(doc):
+                fingerprint.update(self._source_hash(ancestor).encode("utf-8"))
+            for embedded_doc in _embedded_documents(doc):
+                fingerprint.update(self._source_hash(embedded_doc).encode("utf-8"))
+                deps = dependencies.get(embedded_doc.relative_path)
+                if deps is not None:
+                    doc_dependencies.inserted.update(deps.inserted)
+                    doc_dependencies.linked.update(deps.linked)
+                    doc_dependencies.templates.update(deps.templates)
+
+            for element_id in sorted(doc_dependencies.inserted):
+                element = reference.find(target_id=element_id)
+                fingerprint.update(
+                    json.dumps(element, default=json_repr, sort_keys=True).encode("utf-8"))
+            for element_id in sorted(doc_dependencies.linked):
+                element = reference.find(target_id=element_id)
+                name = element.name if element is not None else ""
+                fingerprint.update(f"{element_id}\0{name}\0".encode("utf-8"))
+            for lang, kind in sorted(doc_dependencies.templates):
+                fingerprint.update(f"{lang}/{kind}\0".encode("utf-8"))
+
+            self._current[str(doc.relative_path)] = {
+                "fingerprint": fingerprint.hexdigest(),
+                "source": str(doc.original_file),
+                "includes": [str(d.relative_path) for d in doc.children],
+                "inserted": sorted(doc_dependencies.inserted),
+                "linked": sorted(doc_dependencies.linked),
+                "templates":
+                [f"{lang}/{kind}" for lang, kind in sorted(doc_dependencies.templates)],
+            }
+
+    def is_up_to_date(self, doc: Document) -> bool:
+        """Check whether the output of the previous build can be used for a document.
+
+        Only valid after `update`.
+        """
+        current = self._current.get(str(doc.relative_path))
+        previous = self._previous.get(str(doc.relative_path))
+        if current is None or previous is None:
+            return False
+        if current["fingerprint"] != previous.get("fingerprint"):
+            return False
+        return self._output_file(doc).is_file()
+
+    def restore_output(self, doc: Document) -> None:
+        """Restore the output of a document from the previous build."""
+        shutil.copyfile(self._output_file(doc), doc.work_file)
+        docinfo_footer_file = self._docinfo_footer_file(doc)
+        if docinfo_footer_file.is_file():
+            shutil.copyfile(docinfo_footer_file, doc.docinfo_footer_file)
+
+        previous = self._previous[str(doc.relative_path)]
+        doc.stylesheet = previous.get("stylesheet")
+        self._current[str(doc.relative_path)]["stylesheet"] = doc.stylesheet
+
+    def store_output(self, doc: Document) -> None:
+        """Store a copy of the generated output of a document for the next build."""
+        current = self._current.get(str(doc.relative_path))
+        if current is None:
+            return
+
+        output_file = self._output_file(doc)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(doc.work_file, output_file)
+
+        docinfo_footer_file = self._docinfo_footer_file(doc)
+        if doc.docinfo_footer_file.is_file():
+            shutil.copyfile(doc.docinfo_footer_file, docinfo_footer_file)
+        elif docinfo_footer_file.exists():
+            docinfo_footer_file.unlink()
+
+        current["stylesheet"] = doc.stylesheet
+
+    def save(self) -> None:
+        """Save the manifest for the next build.
+
+        Only save after all output is generated successfully.
+        """
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        with self.manifest_file.open("w", encoding="utf-8") as f:
+            json.dump({"version": __version__, "documents": self._current}, f, indent=2)
+
+    def _output_file(self, doc: Document) -> Path:
+        return self.manifest_dir / "output" / doc.relative_path
+
+    def _docinfo_footer_file(self, doc: Document) -> Path:
+        return self._output_file(doc).with_name(doc.docinfo_footer_file.name)
+
+    def _source_hash(self, doc: Document) -> str:
+        source_hash = self._source_hashes.get(doc.original_file)
+        if source_hash is None:
+            source_hash = hashlib.sha256(doc.original_file.read_bytes()).hexdigest()
+            self._source_hashes[doc.original_file] = source_hash
+        return source_hash
+
+    @staticmethod
+    def _global_fingerprint(documents: Iterable[Document], anchors: Mapping[str, Any],
+                            inserted: Mapping[str, Any], config: Configuration) -> str:
+        fingerprint = hashlib.sha256(__version__.encode("utf-8"))
+        fingerprint.update(
+            json.dumps({name: getattr(config, name, None)
+                        for name in _OUTPUT_CONFIG_OPTIONS},
+                       default=str,
+                       sort_keys=True).encode("utf-8"))
+
+        if config.template_dir is not None:
+            for template_file in sorted(config.template_dir.glob("**/*")):
+                if template_file.is_file():
+                    stat = template_file.stat()
+                    fingerprint.update(
+                        f"{template_file}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode("utf-8"))
+
+        for doc in documents:
+            fingerprint.update(
+                json.dumps([
+                    str(doc.relative_path), doc.package.name, doc.is_root,
+                    str(doc.included_in.relative_path) if doc.included_in else None,
+                    [str(d.relative_path) for d in doc.embedded_in],
+                    [str(d.relative_path) for d in doc.children], doc.title if doc.is_used else None
+                ]).encode("utf-8"))
+
+        for name in sorted(anchors):
+            anchor = anchors[name]
+            fingerprint.update(
+                f"{name}\0{anchor.document.relative_path}\0{anchor.link_text}\0".encode("utf-8"))
+
+        for element_id in sorted(inserted):
+            fingerprint.update(
+                f"{element_id}\0{inserted[element_id].document.relative_path}\0".encode("utf-8"))
+
+        return fingerprint.hexdigest()
+
+
+def _ancestors(doc: Document) -> Iterator[Document]:
+    parent: Optional[Document] = doc.parent()
+    while parent is not None:
+        yield parent
+        parent = parent.parent()
+
+
+def _embedded_documents(doc: Document) -> Iterator[Document]:
+    yield doc
+    for child in doc.children:
+        if doc in child.embedded_in:
+            yield from _embedded_documents(child)
@@ -0,0 +1,188 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measuring the time spent rendering documents and inserting API reference elements."""
+
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class RenderTiming:
+    """Time spent rendering a single document or inserting a single element.
+
+    Attributes:
+        kind:       Kind of measurement: `document`, `insert` or `find`.
+        name:       Name of the document or element.
+        template:   Template used to insert the element, as `lang/kind`.
+        count:      Number of times the document or element is rendered.
+        total_time: Total time spent, including nested measurements.
+        self_time:  Time spent, excluding nested measurements.
+    """
+    kind: str
+    name: str
+    template: Optional[str]
+    count: int
+    total_time: float
+    self_time: float
+
+    def __init__(self, kind: str, name: str, template: Optional[str] = None):
+        self.kind = kind
+        self.name = name
+        self.template = template
+        self.count = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "template": self.template,
+            "count": self.count,
+            "total_time": self.total_time,
+            "self_time": self.self_time,
+        }
+
+
+class _ActiveMeasurement:
+    stack: Tuple[str, ...]
+    call_stack_depth: int
+    child_time: float
+
+    def __init__(self, stack: Tuple[str, ...], call_stack_depth: int):
+        self.stack = stack
+        self.call_stack_depth = call_stack_depth
+        self.child_time = 0.0
+
+
+class RenderProfiler:
+    """Measure the time spent rendering documents, inserting elements and looking up elements.
+
+    Measurements can be nested. The stack of nested measurements, together with the stack of
+    AsciiDoxy commands leading to each measurement, is recorded to create flame graphs.
+
+    Attributes:
+        timings: Time spent for each measured document, element and lookup.
+        stacks:  Self time spent in each unique stack of commands and measurements.
+    """
+    timings: Dict[Tuple[str, str, Optional[str]], RenderTiming]
+    stacks: Dict[Tuple[str, ...], float]
+
+    _active: List[_ActiveMeasurement]
+
+    def __init__(self):
+        self.timings = {}
+        self.stacks = {}
+        self._active = []
+
+    @contextmanager
+    def measure(self,
+                kind: str,
+                name: str,
+                call_stack: Sequence[str],
+                template: Optional[str] = None) -> Iterator[None]:
+        """Measure rendering a document, inserting an element, or looking up an element.
+
+        Args:
+            kind:       Kind of measurement: `document`, `insert` or `find`.
+            name:       Name of the document or element.
+            call_stack: Descriptions of the AsciiDoxy commands on the stack.
+            template:   Template used to insert the element, as `lang/kind`.
+        """
+        if self._active:
+            parent = self._active[-1]
+            stack = parent.stack + tuple(call_stack[parent.call_stack_depth:])
+        else:
+            stack = tuple(call_stack)
+        label = f"{kind} {name}" if template is None else f"{kind} {name} [{template}]"
+        measurement = _ActiveMeasurement(stack + (label, ), len(call_stack))
+        self._active.append(measurement)
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            total_time = time.perf_counter() - start_time
+            self._active.pop()
+            if self._active:
+                self._active[-1].child_time += total_time
+            self_time = total_time - measurement.child_time
+
+            key = (kind, name, template)
+            timing = self.timings.get(key)
+            if timing is None:
+                timing = self.timings[key] = RenderTiming(kind, name, template)
+            timing.count += 1
+            timing.total_time += total_time
+            timing.self_time += self_time
+
+            self.stacks[measurement.stack] = self.stacks.get(measurement.stack, 0.0) + self_time
+
+    def merge(self, other: "RenderProfiler") -> None:
+        """Add the measurements of another profiler, for example from a worker process."""
+        for key, other_timing in other.timings.items():
+            timing = self.timings.get(key)
+            if timing is None:
+                timing = self.timings[key] = RenderTiming(*key)
+            timing.count += other_timing.count
+            timing.total_time += other_timing.total_time
+            timing.self_time += other_timing.self_time
+
+        for stack, self_time in other.stacks.items():
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + self_time
+
+    def slowest(self, kind: str, count: int = 20) -> List[RenderTiming]:
+        """Get the slowest documents, elements or lookups.
+
+        Args:
+            kind:  Kind of measurement: `document`, `insert` or `find`.
+            count: Maximum number of results.
+
+        Returns:
+            The measurements with the highest total time, slowest first.
+        """
+        timings = [t for t in self.timings.values() if t.kind == kind]
+        timings.sort(key=lambda t: t.total_time, reverse=True)
+        return timings[:count]
+
+    def report(self, count: int = 20) -> Dict[str, Any]:
+        """Create a report of the slowest documents, inserted elements and lookups.
+
+        Args:
+            count: Maximum number of results for each kind of measurement.
+
+        Returns:
+            The report as a JSON serializable dictionary.
+        """
+        return {
+            "slowest_documents": [t.as_dict() for t in self.slowest("document", count)],
+            "slowest_inserts": [t.as_dict() for t in self.slowest("insert", count)],
+            "slowest_lookups": [t.as_dict() for t in self.slowest("find", count)],
+        }
+
+    def write_stacks(self, stack_file: Path) -> None:
+        """Write the stacks in the folded format used by flame graph tools.
+
+        Each line contains the frames of a stack separated by semicolons, followed by the self time
+        in microseconds.
+        """
+        with stack_file.open("w", encoding="utf-8") as f:
+            for stack, self_time in sorted(self.stacks.items()):
+                microseconds = round(self_time * 1_000_000)
+                if microseconds > 0:
+                    print(f"{';'.join(_frame(s) for s in stack)} {microseconds}", file=f)
+
+
+def _frame(description: str) -> str:
+    return description.replace(";", ",").replace("\n", " ")
@@ -0,0 +1,100 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Bundle of built-in templates precompiled into Python modules when the package is built.
+
+Each template `<lang>/<name>.mako` is compiled to the module `<lang>/<name>_mako.py`. The modules
+store a hash of the template source. A precompiled module is only used if it matches the template
+source and the installed version of Mako, otherwise the template is compiled when it is used.
+
+This module only depends on Mako, so the build can load it without the other dependencies of
+AsciiDoxy.
+"""
+
+import hashlib
+import importlib
+from pathlib import Path
+from typing import List, Optional
+
+from mako import codegen
+from mako.lookup import TemplateLookup
+from mako.template import ModuleTemplate, Template
+
+SOURCE_HASH_ATTRIBUTE = "_asciidoxy_source_hash"
+INPUT_ENCODING = "utf-8"
+
+
+def bundled_module_name(uri: str) -> str:
+    """Name of the module containing the precompiled template for `uri`."""
+    return f"{__package__}.{uri[:-len('.mako')].replace('/', '.')}_mako"
+
+
+def source_hash(source: bytes) -> str:
+    """Hash identifying the source of a template."""
+    return hashlib.sha256(source).hexdigest()
+
+
+def compile_bundle(templates_dir: Path, output_dir: Optional[Path] = None) -> List[Path]:
+    """Precompile all templates into Python modules.
+
+    Args:
+        templates_dir: Directory containing a subdirectory with templates for each language.
+        output_dir:    Directory to write the modules to. Defaults to `templates_dir`.
+
+    Returns:
+        Paths of the written modules.
+    """
+    if output_dir is None:
+        output_dir = templates_dir
+
+    modules = []
+    for template_file in sorted(templates_dir.glob("*/*.mako")):
+        uri = template_file.relative_to(templates_dir).as_posix()
+        source = template_file.read_bytes()
+        code = Template(text=source, uri=uri, input_encoding=INPUT_ENCODING).code
+
+        module_file = (output_dir / uri).with_name(f"{template_file.stem}_mako.py")
+        module_file.parent.mkdir(parents=True, exist_ok=True)
+        module_file.write_text(f"{code}\n{SOURCE_HASH_ATTRIBUTE} = {source_hash(source)!r}\n",
+                               encoding="utf-8")
+        modules.append(module_file)
+    return modules
+
+
+def load_bundled_template(uri: str, template_file: Path,
+                          lookup: TemplateLookup) -> Optional[Template]:
+    """Load a precompiled template from the bundle.
+
+    Args:
+        uri:           URI of the template, relative to the templates directory.
+        template_file: Source file of the template.
+        lookup:        Lookup to find templates included by the template.
+
+    Returns:
+        The template, or None if there is no matching precompiled module for the template.
+    """
+    try:
+        module = importlib.import_module(bundled_module_name(uri))
+    except ImportError:
+        return None
+
+    if (module.__file__ is None
+            or getattr(module, "_magic_number", None) != codegen.MAGIC_NUMBER or getattr(
+                module, SOURCE_HASH_ATTRIBUTE, None) != source_hash(template_file.read_bytes())):
+        return None
+
+    return ModuleTemplate(module,
+                          module_filename=module.__file__,
+                          module_source=Path(module.__file__).read_text(encoding="utf-8"),
+                          template_filename=str(template_file),
+                          lookup=lookup)
@@ -13,15 +13,18 @@
 # limitations under the License.
 """Helper functions for API reference templates."""
 
-from typing import Iterator, Optional, Sequence
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence
 
-from asciidoxy.generator.asciidoc import Api
 from asciidoxy.generator.filters import InsertionFilter
 from asciidoxy.model import Compound, Parameter, TypeRef
 
+if TYPE_CHECKING:
+    # Not imported at runtime: the generator imports the helpers for preprocessing templates
+    from asciidoxy.generator.asciidoc import Api
+
 
 class TemplateHelper:
-    api: Api
+    api: "Api"
     element: Optional[Compound]
     insert_filter: Optional[InsertionFilter]
 
@@ -46,7 +49,7 @@ class TemplateHelper:
     )
 
     def __init__(self,
-                 api: Api,
+                 api: "Api",
                  element: Optional[Compound] = None,
                  insert_filter: Optional[InsertionFilter] = None):
         self.api = api
@@ -117,7 +120,7 @@ class TemplateHelper:
             type_and_name = param.name
         else:
             if not param.name:
-                type_and_name = self.print_ref(param.type, link=link)
+                type_and_name = param_type
             elif self.PARAM_NAME_FIRST:
                 type_and_name = f"{param.name}{self.PARAM_NAME_SEP}{param_type}"
             else:
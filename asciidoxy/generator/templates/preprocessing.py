@@ -0,0 +1,272 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Register inserted and linked elements without rendering the default templates.
+
+The preprocessing pass only needs to know which elements a template inserts and links to. For
+each default template, a preprocessor visits the same members, parameters, return types and
+exceptions as the template, using the same template helpers. Keep the preprocessors in sync with
+the templates.
+"""
+
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Tuple
+
+from asciidoxy.generator.filters import InsertionFilter
+from asciidoxy.generator.templates.cpp.helpers import CppTemplateHelper
+from asciidoxy.generator.templates.helpers import TemplateHelper, param_filter
+from asciidoxy.generator.templates.java.helpers import JavaTemplateHelper
+from asciidoxy.generator.templates.kotlin.helpers import KotlinTemplateHelper
+from asciidoxy.generator.templates.objc.helpers import ObjcTemplateHelper
+from asciidoxy.generator.templates.python.helpers import PythonTemplateHelper, params
+from asciidoxy.generator.templates.swift.helpers import SwiftTemplateHelper
+from asciidoxy.model import Compound, Parameter, ThrowsClause, TypeRef
+
+if TYPE_CHECKING:
+    from asciidoxy.generator.asciidoc import Api
+
+Preprocessor = Callable[["Api", Compound, InsertionFilter], None]
+
+
+def preprocessor_for(lang: str, kind: str) -> Optional[Preprocessor]:
+    """Find the preprocessor for the default template for `kind` in `lang`.
+
+    Returns:
+        The preprocessor, or None if there is no default template, or it cannot be preprocessed.
+    """
+    return _PREPROCESSORS.get((lang, kind))
+
+
+def _link_type(api: "Api", ref: Optional[TypeRef]) -> None:
+    # Links the same types as `TemplateHelper.print_ref`
+    if ref is None:
+        return
+
+    inner_ref = ref.returns if ref.returns is not None else ref
+    for nested in inner_ref.nested or []:
+        _link_type(api, nested)
+    for arg in ref.args or []:
+        _link_type(api, arg.type)
+    if inner_ref.id:
+        api.link_to_element(inner_ref.id, inner_ref.name)
+
+
+def _insert(api: "Api",
+            members: Iterable[Compound],
+            insert_filter: InsertionFilter,
+            kind_override: Optional[str] = None) -> None:
+    for member in members:
+        api.insert_fragment(member, insert_filter, kind_override=kind_override)
+
+
+def _function(api: "Api",
+              element: Compound,
+              exceptions: Iterable[ThrowsClause],
+              params: Optional[Iterable[Parameter]] = None,
+              no_return: str = "void") -> None:
+    # Like the templates, link the types once for the signature and once for the table
+    params = list(element.params if params is None else params)
+    return_type = element.returns.type if element.returns is not None else None
+    api.inserted(element)
+    _link_type(api, return_type)
+    for param in params:
+        _link_type(api, param.type)
+
+    for param in params:
+        _link_type(api, param.type)
+    if return_type is not None and return_type.name != no_return:
+        _link_type(api, return_type)
+    for exception in exceptions:
+        _link_type(api, exception.type)
+
+
+def _filtered_exceptions_function(api: "Api", element: Compound,
+                                  insert_filter: InsertionFilter) -> None:
+    _function(api, element, insert_filter.exceptions(element))
+
+
+def _all_exceptions_function(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    _function(api, element, element.exceptions)
+
+
+def _alias(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    api.inserted(element)
+    if element.returns is not None:
+        _link_type(api, element.returns.type)
+
+
+def _typedef(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    _alias(api, element, insert_filter)
+    for param in element.params:
+        _link_type(api, param.type)
+
+
+def _enum(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    api.inserted(element)
+    for value in TemplateHelper(api, element, insert_filter).enum_values(prot="public"):
+        api.inserted(value)
+
+
+def _java_enum(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    api.inserted(element)
+    for value in JavaTemplateHelper(api, element, insert_filter).variables(prot="public"):
+        api.inserted(value)
+
+
+def _cpp_class(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    helper = CppTemplateHelper(api, element, insert_filter)
+    prots = ("public", "protected", "private")
+
+    api.inserted(element)
+    for param in param_filter(element.params, kind="tparam"):
+        _link_type(api, param.type)
+
+    for prot in prots:
+        _insert(api, helper.simple_enclosed_types(prot=prot), insert_filter)
+    for prot in prots:
+        _insert(api, helper.constructors(prot=prot), insert_filter, "method")
+        _insert(api, helper.destructors(prot=prot), insert_filter, "method")
+        _insert(api, helper.operators(prot=prot), insert_filter, "method")
+        for variable in helper.variables(prot=prot):
+            api.inserted(variable)
+            if variable.returns is not None:
+                _link_type(api, variable.returns.type)
+        _insert(api, helper.static_methods(prot=prot), insert_filter, "method")
+        _insert(api, helper.methods(prot=prot), insert_filter, "method")
+    for prot in prots:
+        _insert(api, helper.complex_enclosed_types(prot=prot), insert_filter)
+
+
+def _java_class(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    helper = JavaTemplateHelper(api, element, insert_filter)
+    prots = ("public", "protected", "private")
+
+    api.inserted(element)
+    for prot in prots:
+        _insert(api, helper.simple_enclosed_types(prot=prot), insert_filter)
+    for prot in prots:
+        for constant in helper.constants(prot=prot):
+            api.inserted(constant)
+        _insert(api, helper.constructors(prot=prot), insert_filter, "method")
+        _insert(api, helper.static_methods(prot=prot), insert_filter, "method")
+        _insert(api, helper.methods(prot=prot), insert_filter, "method")
+    for prot in prots:
+        _insert(api, helper.complex_enclosed_types(prot=prot), insert_filter)
+
+
+def _kotlin_class(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    helper = KotlinTemplateHelper(api, element, insert_filter)
+    java_helper = JavaTemplateHelper(api, element, insert_filter)
+    prots = ("public", "protected", "internal", "private")
+
+    api.inserted(element)
+    for prot in prots:
+        _insert(api, helper.simple_enclosed_types(prot=prot), insert_filter)
+    for prot in prots:
+        for constant in helper.constants(prot=prot):
+            api.inserted(constant)
+        _insert(api, helper.constructors(prot=prot), insert_filter, "method")
+        for prop in helper.properties(prot=prot):
+            api.inserted(prop)
+        _insert(api, java_helper.static_methods(prot=prot), insert_filter, "method")
+        _insert(api, helper.methods(prot=prot), insert_filter, "method")
+    for prot in prots:
+        _insert(api, helper.complex_enclosed_types(prot=prot), insert_filter)
+
+
+def _objc_class(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    helper = ObjcTemplateHelper(api, element, insert_filter)
+    prots = ("public", "protected", "private")
+
+    api.inserted(element)
+    for prot in prots:
+        _insert(api, helper.simple_enclosed_types(prot=prot), insert_filter)
+    for prot in prots:
+        for prop in helper.properties(prot=prot):
+            api.inserted(prop)
+            if prop.returns is not None:
+                _link_type(api, prop.returns.type)
+        _insert(api, helper.class_methods(prot=prot), insert_filter, "method")
+        _insert(api, helper.methods(prot=prot), insert_filter, "method")
+    for prot in prots:
+        _insert(api, helper.complex_enclosed_types(prot=prot), insert_filter)
+
+
+def _python_class(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    helper = PythonTemplateHelper(api, element, insert_filter)
+
+    api.inserted(element)
+    _insert(api, helper.constructors(prot="public"), insert_filter)
+    for variable in helper.variables(prot="public"):
+        api.inserted(variable)
+        if variable.returns is not None:
+            _link_type(api, variable.returns.type)
+    _insert(api, helper.static_methods(prot="public"), insert_filter)
+    _insert(api, helper.methods(prot="public"), insert_filter)
+    _insert(api, helper.complex_enclosed_types(prot="public"), insert_filter)
+
+
+def _python_function(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    # Parameters `self` and `cls` are never linked
+    _function(api, element, insert_filter.exceptions(element), params(element), "None")
+
+
+def _swift_class(api: "Api", element: Compound, insert_filter: InsertionFilter) -> None:
+    helper = SwiftTemplateHelper(api, element, insert_filter)
+    prots = ("open", "public", "internal", "file-private", "private")
+
+    api.inserted(element)
+    for prot in prots:
+        _insert(api, helper.simple_enclosed_types(prot=prot), insert_filter)
+    for prot in prots:
+        _insert(api, helper.constructors(prot=prot), insert_filter, "method")
+        for prop in helper.properties(prot=prot):
+            api.inserted(prop)
+            if prop.returns is not None:
+                _link_type(api, prop.returns.type)
+        _insert(api, helper.type_methods(prot=prot), insert_filter, "method")
+        _insert(api, helper.methods(prot=prot), insert_filter, "method")
+        _insert(api, helper.complex_enclosed_types(prot=prot), insert_filter)
+
+
+_PREPROCESSORS: Dict[Tuple[str, str], Preprocessor] = {
+    ("cpp", "alias"): _alias,
+    ("cpp", "class"): _cpp_class,
+    ("cpp", "enum"): _enum,
+    ("cpp", "function"): _filtered_exceptions_function,
+    ("cpp", "interface"): _cpp_class,
+    ("cpp", "method"): _filtered_exceptions_function,
+    ("cpp", "struct"): _cpp_class,
+    ("cpp", "typedef"): _typedef,
+    ("java", "class"): _java_class,
+    ("java", "enum"): _java_enum,
+    ("java", "interface"): _java_class,
+    ("java", "method"): _all_exceptions_function,
+    ("kotlin", "class"): _kotlin_class,
+    ("kotlin", "enum"): _java_enum,
+    ("kotlin", "interface"): _kotlin_class,
+    ("kotlin", "method"): _all_exceptions_function,
+    ("objc", "block"): _alias,
+    ("objc", "class"): _objc_class,
+    ("objc", "enum"): _enum,
+    ("objc", "method"): _all_exceptions_function,
+    ("objc", "protocol"): _objc_class,
+    ("objc", "typedef"): _alias,
+    ("python", "class"): _python_class,
+    ("python", "function"): _python_function,
+    ("swift", "class"): _swift_class,
+    ("swift", "closure"): _alias,
+    ("swift", "enum"): _enum,
+    ("swift", "method"): _all_exceptions_function,
+    ("swift", "protocol"): _swift_class,
+    ("swift", "typedef"): _alias,
+}
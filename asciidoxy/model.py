@@ -13,23 +13,84 @@
 # limitations under the License.
 """Models of API reference elements."""
 
-from abc import ABC
-from typing import Dict, List, Optional
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union, overload
+
+ValueT = TypeVar("ValueT")
 
 
 def json_repr(obj):
     data = {"__CLASS__": obj.__class__.__name__}
-    data.update(vars(obj))
+    if isinstance(obj, ModelBase):
+        for name in obj.fields():
+            data[name] = getattr(obj, name)
+    else:
+        data.update(vars(obj))
     return data
 
 
+class Lazy(ABC, Generic[ValueT]):
+    """Value of a `LazyAttribute` that is only determined when the attribute is first read."""
+    __slots__ = ()
+
+    @abstractmethod
+    def resolve(self) -> ValueT:
+        """Determine the actual value."""
+
+
+class LazyAttribute(Generic[ValueT]):
+    """Model attribute that can be assigned a `Lazy` value.
+
+    The lazy value is resolved when the attribute is first read, and the result replaces the lazy
+    value. The value is stored in a slot with the same name prefixed by an underscore. Pickling or
+    copying the model keeps unresolved values lazy.
+    """
+    def __set_name__(self, owner: Type["ModelBase"], name: str) -> None:
+        self._slot = getattr(owner, f"_{name}")
+
+    @overload
+    def __get__(self, obj: None, objtype: Any = None) -> "LazyAttribute[ValueT]":
+        ...
+
+    @overload
+    def __get__(self, obj: "ModelBase", objtype: Any = None) -> ValueT:
+        ...
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = self._slot.__get__(obj, objtype)
+        if isinstance(value, Lazy):
+            value = value.resolve()
+            self._slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj: "ModelBase", value: Union[ValueT, Lazy[ValueT]]) -> None:
+        self._slot.__set__(obj, value)
+
+
 class ModelBase(ABC):
+    """Base class for all models.
+
+    Models use slots to reduce the memory needed for large API references. All attributes need to
+    be listed in `__slots__` and get their default value in the constructor, before calling the
+    constructor of the base class. Slots for a `LazyAttribute` are prefixed with an underscore.
+    """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         for name, value in kwargs.items():
             if not hasattr(self, name):
                 raise TypeError(f"{self.__class__} has no attribute {name}.")
             setattr(self, name, value)
 
+    @classmethod
+    def fields(cls) -> List[str]:
+        """Names of all attributes of the model."""
+        return [
+            name.lstrip("_") for c in reversed(cls.__mro__) for name in getattr(c, "__slots__", ())
+        ]
+
 
 class ReferableElement(ModelBase):
     """Base class for all objects that can be referenced/linked to.
@@ -41,13 +102,19 @@ class ReferableElement(ModelBase):
         language:  Language the element is written in.
         kind:      Kind of language element.
     """
-    id: Optional[str] = None
-    name: str = ""
-    full_name: str = ""
+    __slots__ = ("id", "name", "full_name", "language", "kind")
+
+    id: Optional[str]
+    name: str
+    full_name: str
     language: str
-    kind: str = ""
+    kind: str
 
     def __init__(self, language: str = "", **kwargs):
+        self.id = None
+        self.name = ""
+        self.full_name = ""
+        self.kind = ""
         super().__init__(**kwargs)
         self.language = language
 
@@ -83,21 +150,32 @@ class TypeRef(ModelBase):
         returns:   Return type in case of closure types.
         prot:      Protection level of the referenced type.
     """
+    __slots__ = ("id", "name", "language", "namespace", "kind", "prefix", "suffix", "nested",
+                 "args", "returns", "prot")
 
-    id: Optional[str] = None
+    id: Optional[str]
     name: str
     language: str
-    namespace: Optional[str] = None
-    kind: Optional[str] = None
+    namespace: Optional[str]
+    kind: Optional[str]
 
-    prefix: Optional[str] = None
-    suffix: Optional[str] = None
-    nested: Optional[List["TypeRef"]] = None
-    args: Optional[List["Parameter"]] = None
-    returns: Optional["TypeRef"] = None
-    prot: Optional[str] = None
+    prefix: Optional[str]
+    suffix: Optional[str]
+    nested: Optional[List["TypeRef"]]
+    args: Optional[List["Parameter"]]
+    returns: Optional["TypeRef"]
+    prot: Optional[str]
 
     def __init__(self, language: str = "", name: str = "", **kwargs):
+        self.id = None
+        self.namespace = None
+        self.kind = None
+        self.prefix = None
+        self.suffix = None
+        self.nested = None
+        self.args = None
+        self.returns = None
+        self.prot = None
         super().__init__(**kwargs)
         self.language = language
         self.name = name
@@ -138,13 +216,23 @@ class Parameter(ModelBase):
         prefix:        Prefix for the parameter declaration.
         kind:          The kind of parameter.
     """
+    __slots__ = ("type", "name", "_description", "default_value", "prefix", "kind")
 
-    type: Optional[TypeRef] = None
-    name: str = ""
-    description: str = ""
-    default_value: Optional[str] = None
-    prefix: Optional[str] = None
-    kind: str = "param"
+    type: Optional[TypeRef]
+    name: str
+    description = LazyAttribute[str]()
+    default_value: Optional[str]
+    prefix: Optional[str]
+    kind: str
+
+    def __init__(self, **kwargs):
+        self.type = None
+        self.name = ""
+        self.description = ""
+        self.default_value = None
+        self.prefix = None
+        self.kind = "param"
+        super().__init__(**kwargs)
 
     def __eq__(self, other) -> bool:
         if other is None:
@@ -161,9 +249,15 @@ class ReturnValue(ModelBase):
         type:        Reference to the type of return value.
         description: Explanation of the return value.
     """
+    __slots__ = ("type", "_description")
+
+    type: Optional[TypeRef]
+    description = LazyAttribute[str]()
 
-    type: Optional[TypeRef] = None
-    description: str = ""
+    def __init__(self, **kwargs):
+        self.type = None
+        self.description = ""
+        super().__init__(**kwargs)
 
     def __eq__(self, other) -> bool:
         if other is None:
@@ -177,15 +271,16 @@ class ThrowsClause(ModelBase):
     Attributes:
         type:        Reference to the type of the exception.
         description: Explanation of when the exception is thrown.
-
     """
+    __slots__ = ("type", "_description")
 
     type: TypeRef
-    description: str = ""
+    description = LazyAttribute[str]()
 
     def __init__(self, language: str = "", type: Optional[TypeRef] = None, **kwargs):
-        super().__init__(**kwargs)
         self.type = type or TypeRef(language)
+        self.description = ""
+        super().__init__(**kwargs)
 
     def __eq__(self, other) -> bool:
         if other is None:
@@ -218,29 +313,32 @@ class Compound(ReferableElement):
         default:       True if this is marked as default.
         constexpr:     True if this is marked as constexpr.
     """
+    __slots__ = ("members", "params", "exceptions", "returns", "include", "namespace", "prot",
+                 "definition", "args", "initializer", "_brief", "_description", "_sections",
+                 "static", "const", "deleted", "default", "constexpr")
 
     members: List["Compound"]
     params: List[Parameter]
     exceptions: List[ThrowsClause]
-    returns: Optional[ReturnValue] = None
+    returns: Optional[ReturnValue]
 
-    include: Optional[str] = None
-    namespace: Optional[str] = None
+    include: Optional[str]
+    namespace: Optional[str]
 
-    prot: str = ""
-    definition: str = ""
-    args: str = ""
-    initializer: str = ""
+    prot: str
+    definition: str
+    args: str
+    initializer: str
 
-    brief: str = ""
-    description: str = ""
-    sections: Dict[str, str]
+    brief = LazyAttribute[str]()
+    description = LazyAttribute[str]()
+    sections = LazyAttribute[Dict[str, str]]()
 
-    static: bool = False
-    const: bool = False
-    deleted: bool = False
-    default: bool = False
-    constexpr: bool = False
+    static: bool
+    const: bool
+    deleted: bool
+    default: bool
+    constexpr: bool
 
     def __init__(self,
                  language: str = "",
@@ -250,6 +348,20 @@ class Compound(ReferableElement):
                  exceptions: Optional[List[ThrowsClause]] = None,
                  sections: Optional[Dict[str, str]] = None,
                  **kwargs):
+        self.returns = None
+        self.include = None
+        self.namespace = None
+        self.prot = ""
+        self.definition = ""
+        self.args = ""
+        self.initializer = ""
+        self.brief = ""
+        self.description = ""
+        self.static = False
+        self.const = False
+        self.deleted = False
+        self.default = False
+        self.constexpr = False
         super().__init__(language, **kwargs)
         self.members = members or []
         self.params = params or []
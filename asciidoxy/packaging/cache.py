@@ -0,0 +1,114 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Persistent cache for API reference information loaded from packages."""
+
+import hashlib
+import logging
+import os
+import pickle
+import re
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .._version import __version__
+from ..document import Package
+from ..parser.doxygen import ParseResult
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceCache:
+    """Cache for the parsed API reference of packages.
+
+    The parse results of each package are stored in a separate file. The results are only used if
+    the package name, version and the list of XML files, including their modification times and
+    sizes, are the same. Results from a different version of AsciiDoxy, or using a different forced
+    language, are never used.
+
+    Attributes:
+        cache_dir:      Directory to store the cached API reference in.
+        force_language: Language forced when parsing the XML files, if any.
+    """
+    cache_dir: Path
+    force_language: Optional[str]
+
+    def __init__(self, cache_dir: Path, force_language: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.force_language = force_language
+
+    def load(self, pkg: Package, xml_files: Sequence[Path]) -> Optional[ParseResult]:
+        """Load the cached API reference for a package.
+
+        Args:
+            pkg:       Package to load the API reference for.
+            xml_files: All XML files in the package.
+
+        Returns:
+            The cached results, or None if there are no valid results in the cache.
+        """
+        cache_file = self._cache_file(pkg)
+        if not cache_file.is_file():
+            return None
+
+        try:
+            with cache_file.open("rb") as f:
+                if pickle.load(f) != self._key(pkg, xml_files):
+                    logger.debug(f"Cached API reference of {pkg.name} is outdated.")
+                    return None
+                result = pickle.load(f)
+        except Exception:
+            logger.debug(f"Cannot load cached API reference of {pkg.name}.", exc_info=True)
+            return None
+
+        if not isinstance(result, ParseResult):
+            return None
+        logger.debug(f"Using cached API reference of {pkg.name}.")
+        return result
+
+    def store(self, pkg: Package, xml_files: Sequence[Path], result: ParseResult) -> None:
+        """Store the API reference of a package in the cache.
+
+        Args:
+            pkg:       Package the API reference is loaded from.
+            xml_files: All XML files in the package.
+            result:    Results of parsing the XML files, before resolving references.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file = self._cache_file(pkg)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_file.open("wb") as f:
+                pickle.dump(self._key(pkg, xml_files), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            logger.warning(f"Failed to store API reference of {pkg.name} in the cache.",
+                           exc_info=True)
+            if tmp_file.exists():
+                tmp_file.unlink()
+
+    def _cache_file(self, pkg: Package) -> Path:
+        safe_name = re.sub(r"[^\w.-]", "_", pkg.name)
+        return self.cache_dir / f"{safe_name}.pickle"
+
+    def _key(self, pkg: Package, xml_files: Sequence[Path]) -> str:
+        key = hashlib.sha256()
+        for part in (__version__, self.force_language or "", pkg.name, pkg.version
+                     or "", str(pkg.reference_dir)):
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+        for xml_file in sorted(xml_files):
+            stat = xml_file.stat()
+            key.update(f"{xml_file}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode("utf-8"))
+        return key.hexdigest()
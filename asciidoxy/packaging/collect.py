@@ -20,7 +20,7 @@ other files that can be directly included in the documentation.
 
 import asyncio
 import csv
-import io
+import hashlib
 import logging
 import netrc
 import os
@@ -30,16 +30,21 @@ import urllib
 import warnings
 from abc import ABC, abstractmethod
 from pathlib import Path, PurePath
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Type, TypeVar, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Type, TypeVar, Union
 
 import aiohttp
 import toml
 from tqdm import tqdm
 
 from ..document import Package
+from .store import DownloadStore, link_tree
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONNECTIONS_PER_HOST = 4
+DOWNLOAD_ATTEMPTS = 3
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class CollectError(Exception):
     """Base class for errors while collecting packages.
@@ -83,6 +88,7 @@ class SpecificationError(Exception):
         return f"Invalid specification: {self.message}"
 
 
+ExtractResultT = TypeVar("ExtractResultT")
 PackageSpecT = TypeVar("PackageSpecT", bound="PackageSpec")
 
 
@@ -103,12 +109,16 @@ class PackageSpec(ABC):
         self.name = name
 
     @abstractmethod
-    async def collect(self, download_dir: Path, session: aiohttp.ClientSession) -> Package:
+    async def collect(self,
+                      download_dir: Path,
+                      session: aiohttp.ClientSession,
+                      store: Optional[DownloadStore] = None) -> Package:
         """Collect the package.
 
         Args:
             download_dir: Directory to store downloaded packages.
             session: HTTP session to use for content that needs to be downloaded.
+            store: Optional store for downloads shared with other build directories.
 
         Returns:
             Information about the package.
@@ -210,7 +220,10 @@ class LocalPackageSpec(PackageSpec):
         super().__init__(name)
         self.package_dir = Path(package_dir)
 
-    async def collect(self, download_dir: Path, session: aiohttp.ClientSession) -> Package:
+    async def collect(self,
+                      download_dir: Path,
+                      session: aiohttp.ClientSession,
+                      store: Optional[DownloadStore] = None) -> Package:
         """See PackageSpec.collect"""
         return self._make_package(self.package_dir)
 
@@ -288,7 +301,10 @@ class HttpPackageSpec(PackageSpec):
         self.login_env = login_env
         self.password_env = password_env
 
-    async def collect(self, download_dir: Path, session: aiohttp.ClientSession) -> Package:
+    async def collect(self,
+                      download_dir: Path,
+                      session: aiohttp.ClientSession,
+                      store: Optional[DownloadStore] = None) -> Package:
         """See PackageSpec.collect"""
         package_dir = download_dir / self.name / self.version
         if package_dir.is_dir():
@@ -300,7 +316,7 @@ class HttpPackageSpec(PackageSpec):
                                  "Downloading package again.")
                 shutil.rmtree(package_dir)
 
-        await self._download_files(package_dir, session)
+        await self._download_files(package_dir, session, store)
 
         try:
             return self._make_package(package_dir)
@@ -309,8 +325,16 @@ class HttpPackageSpec(PackageSpec):
                 shutil.rmtree(package_dir)
             raise
 
-    async def _download_files(self, package_dir: Path, session: aiohttp.ClientSession):
+    def _make_package(self, package_dir: Path) -> Package:
+        pkg = super()._make_package(package_dir)
+        pkg.version = self.version
+        return pkg
+
+    async def _download_files(self, package_dir: Path, session: aiohttp.ClientSession,
+                              store: Optional[DownloadStore]):
         package_dir.mkdir(parents=True, exist_ok=True)
+        partial_dir = package_dir.with_name(f"{package_dir.name}.partial")
+        partial_dir.mkdir(parents=True, exist_ok=True)
 
         jobs = []
         for file_name in self.file_names:
@@ -324,25 +348,112 @@ class HttpPackageSpec(PackageSpec):
                                            version=self.version,
                                            file_name=file_name)
 
-            jobs.append(self._download(session, url, package_dir))
-        await asyncio.gather(*jobs)
-
-    async def _download(self, session: aiohttp.ClientSession, url: str, target_dir: Path):
+            jobs.append(self._download(session, url, package_dir, partial_dir, store))
         try:
-            auth = self._make_authentication(url)
-            async with session.get(url, auth=auth) as response:
-                data = await response.read()
-        except aiohttp.client_exceptions.ClientResponseError as http_error:
-            raise DownloadError(self.name, f"Failed to download: {http_error}.") from http_error
+            await asyncio.gather(*jobs)
+        finally:
+            if partial_dir.exists() and not any(partial_dir.iterdir()):
+                partial_dir.rmdir()
+
+    async def _download(self, session: aiohttp.ClientSession, url: str, target_dir: Path,
+                        partial_dir: Path, store: Optional[DownloadStore]):
+        partial_file = partial_dir / hashlib.sha256(url.encode()).hexdigest()
+
+        if store is None:
+            await self._download_to_partial_file(session, url, partial_file)
+            await self._extract(url, partial_file, target_dir, _extract_tar_file, partial_file,
+                                target_dir)
+            return
+
+        async with store.lock(url):
+            content_dir = store.lookup(url)
+            if content_dir is None:
+                await self._download_to_partial_file(session, url, partial_file)
+                content_dir = await self._extract(url, partial_file, target_dir, store.add, url,
+                                                  partial_file)
+            else:
+                logger.debug(f"Using {url} from the download store.")
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, link_tree, content_dir, target_dir)
+
+    async def _download_to_partial_file(self, session: aiohttp.ClientSession, url: str,
+                                        partial_file: Path):
+        for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+            try:
+                await self._download_range(session, url, partial_file)
+                break
+            except aiohttp.ClientResponseError as http_error:
+                if http_error.status == 416 and partial_file.exists():
+                    logger.warning(f"Cannot resume download of {url}. Restarting download.")
+                    _remove_partial_file(partial_file)
+                    continue
+                raise DownloadError(self.name, f"Failed to download: {http_error}.") from http_error
+            except (aiohttp.ClientPayloadError, aiohttp.ClientConnectionError) as error:
+                if attempt == DOWNLOAD_ATTEMPTS:
+                    raise DownloadError(self.name, f"Failed to download {url}: {error}.") from error
+                logger.warning(f"Download of {url} was interrupted: {error}. Resuming download.")
+        else:
+            raise DownloadError(self.name, f"Failed to download {url}.")
 
+    async def _extract(self, url: str, partial_file: Path, target_dir: Path,
+                       extract: Callable[..., ExtractResultT], *args) -> ExtractResultT:
+        """Run `extract` for the downloaded `partial_file` in a worker thread."""
         try:
-            target_dir.mkdir(parents=True, exist_ok=True)
-            tar_file = tarfile.open(fileobj=io.BytesIO(data))
-            tar_file.extractall(target_dir)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, extract, *args)
         except tarfile.TarError as tar_error:
             if target_dir.exists():
                 shutil.rmtree(target_dir)
             raise DownloadError(self.name, f"Cannot read tar file from {url}.") from tar_error
+        finally:
+            _remove_partial_file(partial_file)
+
+    async def _download_range(self, session: aiohttp.ClientSession, url: str, partial_file: Path):
+        """Stream the file at `url` to `partial_file`.
+
+        If `partial_file` already contains part of the file, only the remaining part is requested,
+        on condition that the file did not change since the download started. Servers that do not
+        support range requests, or for which the file changed, send the complete file, which then
+        replaces the partial file. Downloads can only be resumed if the server sent an entity tag or
+        modification time to check for changes.
+        """
+        validator_file = _validator_file(partial_file)
+        offset = partial_file.stat().st_size if partial_file.exists() else 0
+        if offset > 0 and validator_file.exists():
+            headers: Optional[Dict[str, str]] = {
+                "Range": f"bytes={offset}-",
+                "If-Range": validator_file.read_text(encoding="utf-8"),
+            }
+        else:
+            offset = 0
+            headers = None
+
+        auth = self._make_authentication(url)
+        async with session.get(url, auth=auth, headers=headers) as response:
+            mode: Optional[str]
+            if response.status != 206 or offset == 0:
+                mode = "wb"
+                validator = _validator(response.headers)
+                if validator is not None:
+                    validator_file.write_text(validator, encoding="utf-8")
+                elif validator_file.exists():
+                    validator_file.unlink()
+            elif _content_range_start(response.headers.get("Content-Range")) == offset:
+                mode = "ab"
+            else:
+                mode = None
+
+            if mode is not None:
+                with partial_file.open(mode) as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                return
+
+        logger.warning(f"Received the wrong part of {url} to resume the download. Restarting"
+                       " download.")
+        _remove_partial_file(partial_file)
+        await self._download_range(session, url, partial_file)
 
     def _make_authentication(self, url):
         if self.login_env:
@@ -387,14 +498,54 @@ class HttpPackageSpec(PackageSpec):
         return spec
 
 
+def _validator_file(partial_file: Path) -> Path:
+    return partial_file.with_name(f"{partial_file.name}.validator")
+
+
+def _remove_partial_file(partial_file: Path) -> None:
+    for file in (partial_file, _validator_file(partial_file)):
+        if file.exists():
+            file.unlink()
+
+
+def _validator(headers: Mapping[str, str]) -> Optional[str]:
+    """Strong validator of the file in a response, for use in an If-Range header."""
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+
+def _content_range_start(content_range: Optional[str]) -> Optional[int]:
+    """First byte in a Content-Range header: `bytes <start>-<end>/<size>`."""
+    if content_range is None:
+        return None
+    unit, _, byte_range = content_range.partition(" ")
+    start, _, _ = byte_range.partition("-")
+    if unit != "bytes" or not start.isdigit():
+        return None
+    return int(start)
+
+
+def _extract_tar_file(tar_path: Path, target_dir: Path) -> None:
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(tar_path) as tar_file:
+        tar_file.extractall(target_dir)
+
+
 async def collect(specs: Sequence[PackageSpec],
                   download_dir: Path,
-                  progress: Optional[tqdm] = None) -> List[Package]:
+                  progress: Optional[tqdm] = None,
+                  connections_per_host: int = DEFAULT_CONNECTIONS_PER_HOST,
+                  store: Optional[DownloadStore] = None) -> List[Package]:
     """Collect the packages based on the list of specifications.
 
     Args:
         specs: A list of package specifications to collect.
         download_dir: Directory to store downloaded packages.
+        progress: Optional progress reporting.
+        connections_per_host: Maximum number of simultaneous connections to a single host.
+        store: Optional store for downloads shared with other build directories.
 
     Returns:
         A list of packages matching the package specifications.
@@ -415,11 +566,11 @@ async def collect(specs: Sequence[PackageSpec],
         async def _progress_report(coro):
             return await coro
 
-    conn = aiohttp.TCPConnector(limit=4)
+    conn = aiohttp.TCPConnector(limit_per_host=connections_per_host)
     async with aiohttp.ClientSession(connector=conn, raise_for_status=True) as session:
         jobs = []
         for spec in specs:
-            jobs.append(_progress_report(spec.collect(download_dir, session)))
+            jobs.append(_progress_report(spec.collect(download_dir, session, store)))
         return await asyncio.gather(*jobs)
 
 
@@ -23,7 +23,10 @@ from tqdm import tqdm
 
 from ..document import Document, Package
 from ..parser.doxygen import Driver
-from .collect import CollectError, collect, specs_from_file
+from ..profiling import count
+from .cache import ReferenceCache
+from .collect import DEFAULT_CONNECTIONS_PER_HOST, CollectError, collect, specs_from_file
+from .store import DownloadStore
 
 logger = logging.getLogger(__name__)
 
@@ -120,13 +123,18 @@ class PackageManager:
     def collect(self,
                 spec_file: Path,
                 version_file: Optional[Path] = None,
-                progress: Optional[tqdm] = None) -> None:
+                progress: Optional[tqdm] = None,
+                connections_per_host: int = DEFAULT_CONNECTIONS_PER_HOST,
+                download_cache_dir: Optional[Path] = None) -> None:
         """Collect specified packages.
 
         Args:
-            spec_file:    TOML file containing specifications.
-            version_file: CSV file with versions to apply to the spec file.
-            progress:     Optional progress reporting.
+            spec_file:            TOML file containing specifications.
+            version_file:         CSV file with versions to apply to the spec file.
+            progress:             Optional progress reporting.
+            connections_per_host: Maximum number of simultaneous connections to a single host.
+            download_cache_dir:   Directory for downloads shared with other build directories.
+                                      `None` to only keep downloads in the build directory.
 
         Raises:
             SpecificationError: The specification file is invalid.
@@ -138,27 +146,79 @@ class PackageManager:
             progress.update(0)
 
         download_dir = self.build_dir / "download"
+        store = DownloadStore(download_cache_dir) if download_cache_dir is not None else None
         loop = asyncio.get_event_loop_policy().new_event_loop()
-        packages = loop.run_until_complete(collect(specs, download_dir, progress))
+        packages = loop.run_until_complete(
+            collect(specs, download_dir, progress, connections_per_host, store))
         self.packages.update({pkg.name: pkg for pkg in packages})
 
-    def load_reference(self, parser: Driver, progress: Optional[tqdm] = None) -> None:
+    def load_reference(self,
+                       parser: Driver,
+                       progress: Optional[tqdm] = None,
+                       jobs: int = 1,
+                       cache_dir: Optional[Path] = None,
+                       lazy: bool = False) -> None:
         """Load API reference from available packages.
 
         Args:
-            parser:   Parser to feed the API reference.
-            progress: Optional progress reporting.
+            parser:    Parser to feed the API reference.
+            progress:  Optional progress reporting.
+            jobs:      Number of processes to use for parsing. The result is the same for any
+                           number of processes.
+            cache_dir: Directory to cache the parsed API reference in. `None` to disable the cache.
+            lazy:      Only parse XML files listed in a Doxygen index when their elements are
+                           needed. Directories without an `index.xml` are parsed completely.
         """
         if progress is not None:
             progress.total = len(self.packages)
             progress.update(0)
 
-        for pkg in self.packages.values():
-            if pkg.reference_dir is not None:
-                for xml_file in pkg.reference_dir.glob("**/*.xml"):
-                    parser.parse(xml_file)
+        reference_cache = None
+        if cache_dir is not None:
+            reference_cache = ReferenceCache(cache_dir, parser.force_language)
+
+        xml_files_per_package = [
+            (pkg, list(pkg.reference_dir.glob("**/*.xml")) if pkg.reference_dir is not None else [])
+            for pkg in self.packages.values()
+        ]
+        if lazy:
+            xml_files_per_package = [(pkg, _register_indexes(parser, xml_files))
+                                     for pkg, xml_files in xml_files_per_package]
+
+        cached_results = {}
+        if reference_cache is not None:
+            for pkg, xml_files in xml_files_per_package:
+                if xml_files:
+                    cached_result = reference_cache.load(pkg, xml_files)
+                    if cached_result is not None:
+                        cached_results[pkg.name] = cached_result
+
+        elements_before = len(parser.api_reference.elements)
+        files_to_parse = [
+            xml_file for pkg, xml_files in xml_files_per_package if pkg.name not in cached_results
+            for xml_file in xml_files
+        ]
+        if jobs > 1:
+            results = parser.parse_parallel(files_to_parse, jobs)
+        else:
+            results = (parser.parse(xml_file) for xml_file in files_to_parse)
+
+        for pkg, xml_files in xml_files_per_package:
+            cached_result = cached_results.get(pkg.name)
+            if cached_result is not None:
+                parser.merge(cached_result)
+                count("packages_loaded_from_cache")
+            elif xml_files:
+                mark = parser.mark() if reference_cache is not None else None
+                for _ in xml_files:
+                    if next(results):
+                        count("xml_files_parsed")
+                if reference_cache is not None and mark is not None:
+                    reference_cache.store(pkg, xml_files, parser.results_since(mark))
             if progress is not None:
                 progress.update()
+        results.close()
+        count("elements_registered", len(parser.api_reference.elements) - elements_before)
 
     def prepare_work_directory(self,
                                in_file: Path,
@@ -358,3 +418,17 @@ class PackageManager:
                 self.copied_files[dst_entry] = pkg
             elif src_entry.is_dir():
                 self._copy_dir_contents(src_entry, dst_entry, pkg)
+
+
+def _register_indexes(parser: Driver, xml_files: List[Path]) -> List[Path]:
+    """Register all Doxygen index files for lazy parsing.
+
+    Returns:
+        The XML files in directories without a valid index, which need to be parsed completely.
+    """
+    indexed_dirs = {
+        xml_file.parent
+        for xml_file in xml_files if xml_file.name == "index.xml" and parser.parse_index(xml_file)
+    }
+    count("xml_indexes_registered", len(indexed_dirs))
+    return [xml_file for xml_file in xml_files if xml_file.parent not in indexed_dirs]
@@ -0,0 +1,206 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Store for downloaded packages shared between build directories.
+
+Extracted tar files are stored by the hash of their contents. For each URL the store remembers the
+hash of the tar file downloaded from it, so the same URL is never downloaded twice. Files are hard
+linked from the store into the build directory, or copied if hard links are not possible.
+
+Multiple builds can use the same store at the same time. Downloading and adding the file for a URL
+is protected by a lock file per URL.
+
+Layout of the store:
+* `urls/<url hash>`: Hash of the contents of the tar file downloaded from the URL.
+* `locks/<url hash>.lock`: Lock for downloading from the URL.
+* `contents/<content hash>/`: Extracted contents of the tar file.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import IO, Optional
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+LOCK_POLL_INTERVAL = 0.1
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _hash_file(file: Path) -> str:
+    file_hash = hashlib.sha256()
+    with file.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _try_lock(lock_file: IO) -> bool:
+    try:
+        if sys.platform == "win32":
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(lock_file: IO) -> None:
+    if sys.platform == "win32":
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class UrlLock:
+    """Lock for downloading from a single URL, shared with other processes using the same store.
+
+    Use as asynchronous context manager. Waiting for the lock does not block the event loop.
+    """
+    _lock_path: Path
+    _lock_file: Optional[IO]
+
+    def __init__(self, lock_path: Path):
+        self._lock_path = lock_path
+        self._lock_file = None
+
+    async def __aenter__(self) -> "UrlLock":
+        self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = self._lock_path.open("a+b")
+        while not _try_lock(lock_file):
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+        self._lock_file = lock_file
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._lock_file is not None:
+            _unlock(self._lock_file)
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class DownloadStore:
+    """Store for downloaded packages shared between build directories.
+
+    Attributes:
+        directory: Root directory of the store.
+    """
+    directory: Path
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def lock(self, url: str) -> UrlLock:
+        """Lock to hold while looking up, downloading and adding the file for `url`."""
+        return UrlLock(self.directory / "locks" / f"{_hash_text(url)}.lock")
+
+    def lookup(self, url: str) -> Optional[Path]:
+        """Find the extracted contents of the tar file downloaded from `url`.
+
+        Returns:
+            Directory containing the extracted contents, or None if `url` is not in the store.
+        """
+        url_file = self._url_file(url)
+        if not url_file.is_file():
+            return None
+
+        content_dir = self._content_dir(url_file.read_text(encoding="utf-8").strip())
+        if not content_dir.is_dir():
+            return None
+        return content_dir
+
+    def add(self, url: str, tar_file: Path) -> Path:
+        """Add a tar file downloaded from `url` to the store.
+
+        The tar file is only extracted if the store does not contain the same tar file yet.
+
+        Returns:
+            Directory containing the extracted contents.
+
+        Raises:
+            tarfile.TarError: The tar file cannot be read.
+        """
+        content_hash = _hash_file(tar_file)
+        content_dir = self._content_dir(content_hash)
+        if not content_dir.is_dir():
+            content_dir.parent.mkdir(parents=True, exist_ok=True)
+            extract_dir = Path(tempfile.mkdtemp(dir=content_dir.parent, suffix=".tmp"))
+            try:
+                with tarfile.open(tar_file) as tar:
+                    tar.extractall(extract_dir)
+                os.rename(extract_dir, content_dir)
+            except OSError:
+                if not content_dir.is_dir():
+                    raise
+                logger.debug(f"Contents of {url} were added to the store concurrently.")
+            finally:
+                if extract_dir.exists():
+                    shutil.rmtree(extract_dir)
+
+        url_file = self._url_file(url)
+        url_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = url_file.with_name(f"{url_file.name}.{os.getpid()}.tmp")
+        temp_file.write_text(content_hash, encoding="utf-8")
+        os.replace(temp_file, url_file)
+        return content_dir
+
+    def _url_file(self, url: str) -> Path:
+        return self.directory / "urls" / _hash_text(url)
+
+    def _content_dir(self, content_hash: str) -> Path:
+        return self.directory / "contents" / content_hash
+
+
+def link_tree(source_dir: Path, target_dir: Path) -> None:
+    """Hard link all files in `source_dir` into `target_dir`.
+
+    Files are copied if they cannot be hard linked, for example because the directories are on
+    different file systems. Existing files in `target_dir` are replaced.
+    """
+    for dir_path, dir_names, file_names in os.walk(source_dir):
+        source = Path(dir_path)
+        target = target_dir / source.relative_to(source_dir)
+        target.mkdir(parents=True, exist_ok=True)
+
+        for name in list(dir_names):
+            if (source / name).is_symlink():
+                dir_names.remove(name)
+                file_names.append(name)
+
+        for name in file_names:
+            target_file = target / name
+            if target_file.is_symlink() or target_file.exists():
+                target_file.unlink()
+            if (source / name).is_symlink():
+                os.symlink(os.readlink(source / name), target_file)
+                continue
+            try:
+                os.link(source / name, target_file)
+            except OSError:
+                shutil.copy2(source / name, target_file)
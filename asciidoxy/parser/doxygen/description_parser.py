@@ -16,7 +16,20 @@
 import logging
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
-from typing import Iterator, List, Mapping, Optional, Tuple, Type, TypeVar, Union
+from collections import defaultdict, deque
+from typing import (
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from .language_traits import unique_id
 
@@ -601,21 +614,31 @@ class ParaContainer(NestedDescriptionElement):
         super().append(content)
 
     def to_asciidoc(self, context: AsciiDocContext = None) -> str:
-        return "\n\n".join(
-            element.to_asciidoc(context) for element in self.contents
-            if element.to_asciidoc(context).strip())
+        return self._join_contents("\n\n", context)
+
+    def _join_contents(self, separator: str, context: Optional[AsciiDocContext]) -> str:
+        """Join the AsciiDoc of all non-empty contained elements.
+
+        Each element is converted only once. Converting it again to check whether it is empty makes
+        the conversion time grow exponentially with the nesting depth.
+        """
+        contents = (element.to_asciidoc(context) for element in self.contents)
+        return separator.join(adoc for adoc in contents if adoc.strip())
 
     def normalize(self) -> None:
         new_contents: List[DescriptionElement] = []
-        while self.contents:
-            child = self.contents.pop(0)
+
+        # Elements promoted from a Para are already normalized as part of the Para
+        pending: Deque[Tuple[DescriptionElement, bool]] = deque(
+            (child, False) for child in self.contents)
+        while pending:
+            child, normalized = pending.popleft()
 
             # Normalize ParaContainers and add them if not empty
-            if isinstance(child, (Para, ParaContainer)):
+            if not normalized and isinstance(child, (Para, ParaContainer)):
                 child.normalize()
 
             if isinstance(child, ParaContainer):
-                child.normalize()
                 if child.contents:
                     new_contents.append(child)
                 continue
@@ -625,44 +648,94 @@ class ParaContainer(NestedDescriptionElement):
             # Paras and ParaContainers inside a Para need to be promoted to the current
             # ParaContainer. Split the existing content in separate Paras around other Paras and
             # ParaContainers
+            contents = child.contents
+            end = len(contents)
+            pos = 0
 
             # Clone the original Para for the initial non-Para content
             new_para = child.clone_without_contents()
-            while child.contents and not isinstance(child.contents[0], (Para, ParaContainer)):
-                new_para.append(child.contents.pop(0))
+            while pos < end and not isinstance(contents[pos], (Para, ParaContainer)):
+                new_para.append(contents[pos])
+                pos += 1
             new_contents.append(new_para)
 
-            reassess = []
-            while child.contents:
+            reassess: List[DescriptionElement] = []
+            while pos < end:
                 # Promote Paras and ParaContainers
-                while child.contents and isinstance(child.contents[0], (Para, ParaContainer)):
-                    reassess.append(child.contents.pop(0))
+                while pos < end and isinstance(contents[pos], (Para, ParaContainer)):
+                    reassess.append(contents[pos])
+                    pos += 1
 
                 # Use the last Para to reasses, or clone the original Para for following non-Para
                 # content
-                if isinstance(reassess[-1], Para):
-                    new_para = reassess.pop(-1)
+                last = reassess.pop(-1)
+                if isinstance(last, Para):
+                    new_para = last
                 else:
+                    reassess.append(last)
                     new_para = child.clone_without_contents()
-                while child.contents and not isinstance(child.contents[0], (Para, ParaContainer)):
-                    new_para.append(child.contents.pop(0))
+                while pos < end and not isinstance(contents[pos], (Para, ParaContainer)):
+                    new_para.append(contents[pos])
+                    pos += 1
                 reassess.append(new_para)
-            self.contents = reassess + self.contents
+            child.contents = []
+            pending.extendleft((element, True) for element in reversed(reassess))
 
         self.contents = new_contents
 
     SectionT = TypeVar("SectionT", bound="NamedSection")
 
     def pop_section(self, section_type: Type[SectionT], name: str) -> Optional[SectionT]:
-        queue: List[NestedDescriptionElement] = [self]
-        while queue:
-            current = queue.pop(0)
-            for i, child in enumerate(current.contents):
-                if isinstance(child, section_type) and child.name == name:
-                    return current.contents.pop(i)
-                elif isinstance(child, NestedDescriptionElement):
-                    queue.append(child)
-        return None
+        return cast(Optional[ParaContainer.SectionT], self.pop_sections((section_type, name))[0])
+
+    def pop_sections(self, *sections: Tuple[Type[NamedSection],
+                                            str]) -> List[Optional[NamedSection]]:
+        """Remove multiple sections in a single traversal of the description.
+
+        The result is the same as calling `pop_section` for each section in the given order. A
+        section is not found inside a section removed before it, but it is found inside a section
+        removed after it.
+
+        Args:
+            sections: Type and name of each section to remove.
+
+        Returns:
+            The removed sections, in the same order as `sections`. None for sections that are not
+            found.
+        """
+        found: List[Optional[NamedSection]] = [None] * len(sections)
+        indices_by_name: Dict[str, List[int]] = defaultdict(list)
+        for index, (_, name) in enumerate(sections):
+            indices_by_name[name].append(index)
+
+        # Elements inside a removed section are only searched for sections requested before it
+        queue: Deque[Tuple[NestedDescriptionElement, int]] = deque([(self, len(sections))])
+        missing = len(sections)
+        while queue and missing > 0:
+            current, limit = queue.popleft()
+            removed: List[int] = []
+            for position, child in enumerate(current.contents):
+                if not isinstance(child, NestedDescriptionElement):
+                    continue
+
+                child_limit = limit
+                if isinstance(child, NamedSection):
+                    for index in indices_by_name.get(child.name, ()):
+                        if index >= limit:
+                            break
+                        if found[index] is None and isinstance(child, sections[index][0]):
+                            found[index] = child
+                            child_limit = index
+                            missing -= 1
+                            removed.append(position)
+                            break
+
+                if child_limit > 0:
+                    queue.append((child, child_limit))
+
+            for position in reversed(removed):
+                del current.contents[position]
+        return found
 
 
 class Para(NestedDescriptionElement):
@@ -861,9 +934,7 @@ class ParBlock(ParaContainer):
     in blocks like definitions or lists.
     """
     def to_asciidoc(self, context: AsciiDocContext = None) -> str:
-        return "\n+\n".join(
-            element.to_asciidoc(context) for element in self.contents
-            if element.to_asciidoc(context).strip())
+        return self._join_contents("\n+\n", context)
 
 
 ###################################################################################################
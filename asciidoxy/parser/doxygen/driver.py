@@ -15,38 +15,214 @@
 
 import logging
 import xml.etree.ElementTree as ET
-from typing import List, Mapping, Optional, Set, Tuple
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
 from tqdm import tqdm
 
-from ...api_reference import AmbiguousLookupError, ApiReference
+from ...api_reference import (
+    AmbiguousLookupError,
+    ApiReference,
+    ElementLoader,
+    NameQuery,
+    uniform_short_name,
+)
 from ...model import Compound, ReferableElement, TypeRef
+from ...profiling import count, counters
 from .cpp import CppParser
 from .driver_base import DriverBase
 from .java import JavaParser
+from .language_traits import LanguageTraits
 from .objc import ObjectiveCParser
 from .parser_base import ParserBase
 from .python import PythonParser
 
 logger = logging.getLogger(__name__)
 
+ReferenceResolver = Callable[[TypeRef], Optional[ReferableElement]]
+
+
+class ParseResult(NamedTuple):
+    """Results of parsing one or more XML files, before references are resolved.
+
+    Used to transfer results from separate processes and to store results in a cache. All results
+    are kept together to preserve references between the elements and the pending references.
+    """
+    elements: List[ReferableElement]
+    unresolved_refs: List[TypeRef]
+    unchecked_refs: List[TypeRef]
+    inner_type_refs: List[Tuple[Compound, TypeRef]]
+
+
+def _parse_file(driver: "Driver", file_path: Path) -> Optional[ParseResult]:
+    """Parse a single XML file with a driver reused for multiple files.
+
+    The results are taken from the driver, so only its parsers, and the types cached by them, are
+    kept for the next file.
+    """
+    parsed = driver.parse(file_path)
+    result = driver._take_results()
+    return result if parsed else None
+
+
+_worker_driver: Optional["Driver"] = None
+
+
+def _init_parsing_worker(force_language: Optional[str], streaming: bool) -> None:
+    global _worker_driver
+    _worker_driver = Driver(force_language=force_language, streaming=streaming)
+
+
+def _parse_in_worker(file_path: Path) -> Tuple[Optional[ParseResult], Dict[str, int]]:
+    assert _worker_driver is not None
+    start_counters = counters()
+
+    result = _parse_file(_worker_driver, file_path)
+
+    worker_counters = {
+        name: value - start_counters.get(name, 0)
+        for name, value in counters().items() if value != start_counters.get(name, 0)
+    }
+    return result, worker_counters
+
+
+class ParseMark(NamedTuple):
+    """Position in the results of a driver, used to retrieve all results added after it."""
+    elements: int
+    unresolved_refs: int
+    unchecked_refs: int
+    inner_type_refs: int
+
+
+class _LazyLoader(ElementLoader):
+    """Parses the XML files listed in Doxygen index files when their elements are searched for.
+
+    The names in the index are not cleaned up for a specific language. Each file is registered
+    under the short names as cleaned up for each of the languages. Members are registered with the
+    files of all compounds listing them, as their id does not tell which compound defines them.
+
+    References from parsed files are resolved before the search that loaded them continues.
+    Resolving them can load more files, which are resolved afterwards, in the same order.
+    """
+    _driver: "Driver"
+    _file_driver: "Driver"
+    _files_by_name: Dict[str, Dict[Path, None]]
+    _files_by_id: Dict[str, Dict[Path, None]]
+    _parsed_files: Set[Path]
+    _unresolved_results: Deque[ParseResult]
+    _resolving: bool
+
+    def __init__(self, driver: "Driver"):
+        self._driver = driver
+        self._file_driver = Driver(force_language=driver.force_language, streaming=driver.streaming)
+        self._files_by_name = defaultdict(dict)
+        self._files_by_id = defaultdict(dict)
+        self._parsed_files = set()
+        self._unresolved_results = deque()
+        self._resolving = False
+
+    def add_index(self, index_root: ET.Element, xml_dir: Path) -> None:
+        traits = [parser.TRAITS for parser in self._driver.parsers()]
+
+        for compound in index_root.iterfind("compound"):
+            refid = compound.get("refid", "")
+            compound_file = xml_dir / f"{refid}.xml"
+            self._add(traits, compound.findtext("name", ""), refid, compound_file)
+
+            for member in compound.iterfind("member"):
+                self._add(traits, member.findtext("name", ""), member.get("refid", ""),
+                          compound_file)
+
+    def _add(self, traits: List[Type[LanguageTraits]], name: str, refid: str,
+             file_path: Path) -> None:
+        for short_name in {uniform_short_name(t.cleanup_name(name)) for t in traits}:
+            self._files_by_name[short_name][file_path] = None
+        # Same id as `LanguageTraits.unique_id` without the language tag
+        self._files_by_id[refid.replace("__", "-")][file_path] = None
+
+    def load_name(self, short_name: str) -> None:
+        files = self._files_by_name.pop(short_name, None)
+        if files:
+            self._load(files)
+
+    def load_id(self, target_id: str) -> None:
+        _, _, refid = target_id.partition("-")
+        files = self._files_by_id.pop(refid, None)
+        if files:
+            self._load(files)
+
+    def _load(self, file_paths: Iterable[Path]) -> None:
+        for file_path in file_paths:
+            if file_path in self._parsed_files:
+                continue
+            self._parsed_files.add(file_path)
+            if not file_path.is_file():
+                logger.debug(f"Missing XML file for index entry: {file_path}")
+                continue
+
+            result = _parse_file(self._file_driver, file_path)
+            if result is not None:
+                count("xml_files_parsed")
+                for element in result.elements:
+                    self._driver.register(element)
+                self._unresolved_results.append(result)
+
+        if self._resolving:
+            return
+        self._resolving = True
+        try:
+            while self._unresolved_results:
+                self._driver._resolve_loaded(self._unresolved_results.popleft())
+        finally:
+            self._resolving = False
+
 
 class Driver(DriverBase):
-    """Driver for parsing Doxygen XML output."""
+    """Driver for parsing Doxygen XML output.
+
+    By default each XML file is read completely before it is processed. In streaming mode each
+    compound is processed and discarded as soon as it is read, so memory usage depends on the
+    largest compound instead of the largest XML file.
+
+    Files listed in a Doxygen index file added with `parse_index` are only parsed when the API
+    reference is searched for their elements.
+    """
     api_reference: ApiReference
     _unresolved_refs: List[TypeRef]
     _unchecked_refs: List[TypeRef]
     _inner_type_refs: List[Tuple[Compound, TypeRef]]
     _force_language: Optional[str]
+    _streaming: bool
 
     _parsers: Mapping[str, ParserBase]
+    _lazy_loader: Optional[_LazyLoader]
+    _file_driver: Optional["Driver"]
 
-    def __init__(self, force_language: Optional[str] = None):
+    def __init__(self, force_language: Optional[str] = None, streaming: bool = False):
         self.api_reference = ApiReference()
         self._unresolved_refs = []
         self._unchecked_refs = []
         self._inner_type_refs = []
         self._force_language = safe_language_tag(force_language)
+        self._streaming = streaming
+        self._lazy_loader = None
+        self._file_driver = None
 
         self._parsers = {
             CppParser.TRAITS.TAG: CppParser(self),
@@ -62,6 +238,20 @@ class Driver(DriverBase):
                          " detection.")
             self._force_language = None
 
+    @property
+    def force_language(self) -> Optional[str]:
+        return self._force_language
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
+    def parsers(self) -> List[ParserBase]:
+        """Parsers for the languages that can be parsed."""
+        if self._force_language is not None:
+            return [self._parsers[self._force_language]]
+        return list(self._parsers.values())
+
     @property
     def unresolved_ref_count(self):
         return len(self._unresolved_refs) + len(self._inner_type_refs)
@@ -95,6 +285,8 @@ class Driver(DriverBase):
         Returns:
             True if file is parsed. False if the file is invalid.
         """
+        if self._streaming:
+            return self._parse_streaming(file_or_path)
 
         try:
             tree = ET.parse(file_or_path)
@@ -113,6 +305,138 @@ class Driver(DriverBase):
             self._parse_element(e)
         return True
 
+    def parse_index(self, index_file: Path) -> bool:
+        """Register the compounds listed in a Doxygen index file, to parse them when needed.
+
+        The XML file of a compound is parsed when the API reference is first searched for the name
+        or id of the compound or one of its members. The XML files need to be in the same directory
+        as the index file.
+
+        Params:
+            index_file: Path of the `index.xml` file.
+
+        Returns:
+            True if the index is registered. False if the file is not a valid Doxygen index.
+        """
+        try:
+            root = ET.parse(index_file).getroot()
+        except ET.ParseError:
+            logger.exception(f"Failure while parsing XML from `{index_file}`. The XML may be"
+                             " malformed or the file has encoding errors.")
+            return False
+
+        if root.tag != "doxygenindex":
+            logger.error(f"File `{index_file}` does not contain a valid Doxygen index.")
+            return False
+
+        if self._lazy_loader is None:
+            self._lazy_loader = _LazyLoader(self)
+            self.api_reference.loader = self._lazy_loader
+        self._lazy_loader.add_index(root, index_file.parent)
+        return True
+
+    def _parse_streaming(self, file_or_path) -> bool:
+        # Parse into a separate driver to only add the results if the complete file is valid. The
+        # driver is reused to keep the types cached by its parsers.
+        if self._file_driver is None:
+            self._file_driver = Driver(force_language=self._force_language)
+        file_driver = self._file_driver
+        try:
+            events = ET.iterparse(file_or_path, events=("start", "end"))
+            _, root = next(events)
+            if root.tag != "doxygen":
+                if root.tag != "doxygenindex":
+                    logger.error(f"File `{file_or_path}` does not contain valid Doxygen XML.")
+                return False
+
+            depth = 0
+            for event, xml_element in events:
+                if event == "start":
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if depth == 0:
+                    file_driver._parse_element(xml_element)
+                    root.clear()
+
+        except ET.ParseError:
+            logger.exception(f"Failure while parsing XML from `{file_or_path}`. The XML may be"
+                             " malformed or the file has encoding errors.")
+            file_driver._take_results()
+            return False
+
+        self.merge(file_driver._take_results())
+        return True
+
+    def parse_parallel(self, file_paths: Iterable[Path], jobs: int) -> Generator[bool, None, None]:
+        """Parse multiple XML files using a pool of worker processes.
+
+        The results of each file are merged in the same order as the files are given, making the
+        result identical to calling `parse` for each file. Merging happens while iterating over the
+        returned generator, so it needs to be consumed completely or closed.
+
+        Params:
+            file_paths: Paths of the XML files to parse.
+            jobs:       Number of worker processes to use.
+
+        Returns:
+            For each file, True if the file is parsed. False if the file is invalid.
+        """
+        file_paths = list(file_paths)
+        chunksize = max(1, len(file_paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs,
+                                 initializer=_init_parsing_worker,
+                                 initargs=(self._force_language, self._streaming)) as executor:
+            for result, worker_counters in executor.map(_parse_in_worker,
+                                                        file_paths,
+                                                        chunksize=chunksize):
+                for name, amount in worker_counters.items():
+                    count(name, amount)
+                if result is None:
+                    yield False
+                else:
+                    self.merge(result)
+                    yield True
+
+    def merge(self, result: ParseResult) -> None:
+        """Add results parsed by another driver, or loaded from a cache."""
+        for element in result.elements:
+            self.register(element)
+        self._unresolved_refs.extend(result.unresolved_refs)
+        self._unchecked_refs.extend(result.unchecked_refs)
+        self._inner_type_refs.extend(result.inner_type_refs)
+
+    def mark(self) -> ParseMark:
+        """Mark the current position in the parse results.
+
+        Use `results_since` to get all results added after the mark.
+        """
+        return ParseMark(len(self.api_reference.elements), len(self._unresolved_refs),
+                         len(self._unchecked_refs), len(self._inner_type_refs))
+
+    def results_since(self, mark: ParseMark) -> ParseResult:
+        """Get all results added after `mark`.
+
+        Only valid before references are resolved or checked.
+        """
+        return ParseResult(self.api_reference.elements[mark.elements:],
+                           self._unresolved_refs[mark.unresolved_refs:],
+                           self._unchecked_refs[mark.unchecked_refs:],
+                           self._inner_type_refs[mark.inner_type_refs:])
+
+    def _take_results(self) -> ParseResult:
+        """Remove all results from the driver, keeping the parsers for parsing more files.
+
+        Only valid before references are resolved or checked.
+        """
+        result = self.results_since(ParseMark(0, 0, 0, 0))
+        self.api_reference = ApiReference()
+        self._unresolved_refs = []
+        self._unchecked_refs = []
+        self._inner_type_refs = []
+        return result
+
     def register(self, element: ReferableElement) -> None:
         self.api_reference.append(element)
 
@@ -127,17 +451,32 @@ class Driver(DriverBase):
 
     def resolve_references(self, progress: Optional[tqdm] = None) -> None:
         """Resolve all references between objects from different XML files."""
-
-        unresolved_names: Set[str] = set()
+        # Elements loaded lazily while resolving add their remaining references to the driver
+        refs, self._unresolved_refs = self._unresolved_refs, []
+        inner_type_refs, self._inner_type_refs = self._inner_type_refs, []
         if progress is not None:
-            progress.total = len(self._unresolved_refs) + len(self._inner_type_refs)
+            progress.total = len(refs) + len(inner_type_refs)
+
+        still_unresolved_refs, still_unresolved_inner_type_refs = self._resolve(
+            refs, inner_type_refs, progress)
+        self._unresolved_refs = still_unresolved_refs + self._unresolved_refs
+        self._inner_type_refs = still_unresolved_inner_type_refs + self._inner_type_refs
+
+    def _resolve(
+            self,
+            refs: List[TypeRef],
+            inner_type_refs: List[Tuple[Compound, TypeRef]],
+            progress: Optional[tqdm] = None
+    ) -> Tuple[List[TypeRef], List[Tuple[Compound, TypeRef]]]:
+        unresolved_names: Set[str] = set()
+        resolve_reference = self._cached_resolver(chain(refs, (ref for _, ref in inner_type_refs)))
 
         still_unresolved_refs = []
-        for ref in self._unresolved_refs:
+        for ref in refs:
             if progress is not None:
                 progress.update()
             assert ref.name
-            element = self.resolve_reference(ref)
+            element = resolve_reference(ref)
             if element is not None:
                 ref.resolve(element)
             else:
@@ -145,11 +484,11 @@ class Driver(DriverBase):
                 unresolved_names.add(ref.name)
 
         still_unresolved_inner_type_refs: List[Tuple[Compound, TypeRef]] = []
-        for parent, ref in self._inner_type_refs:
+        for parent, ref in inner_type_refs:
             if progress is not None:
                 progress.update()
             assert ref.name
-            element = self.resolve_reference(ref)
+            element = resolve_reference(ref)
             if element is not None:
                 assert isinstance(element, Compound)
                 if ref.prot:
@@ -159,29 +498,41 @@ class Driver(DriverBase):
                 still_unresolved_inner_type_refs.append((parent, ref))
                 unresolved_names.add(ref.name)
 
-        resolved_ref_count = len(self._unresolved_refs) - len(still_unresolved_refs)
-        resolved_inner_type_ref_count = (len(self._inner_type_refs) -
+        resolved_ref_count = len(refs) - len(still_unresolved_refs)
+        resolved_inner_type_ref_count = (len(inner_type_refs) -
                                          len(still_unresolved_inner_type_refs))
         unresolved_ref_count = len(still_unresolved_refs) + len(still_unresolved_inner_type_refs)
+        count("references_resolved", resolved_ref_count + resolved_inner_type_ref_count)
         logger.debug(f"Resolved refs: {resolved_ref_count + resolved_inner_type_ref_count}")
         logger.debug(f"Still unresolved: {unresolved_ref_count}: {', '.join(unresolved_names)}")
 
-        self._unresolved_refs = still_unresolved_refs
-        self._inner_type_refs = still_unresolved_inner_type_refs
+        return still_unresolved_refs, still_unresolved_inner_type_refs
 
     def check_references(self, progress: Optional[tqdm] = None) -> None:
         """Verify all references point to an existing element."""
+        refs, self._unchecked_refs = self._unchecked_refs, []
         if progress is not None:
-            progress.total = len(self._unchecked_refs)
+            progress.total = len(refs)
+        self._check(refs, progress)
 
-        for ref in self._unchecked_refs:
+    def _check(self, refs: List[TypeRef], progress: Optional[tqdm] = None) -> None:
+        resolve_reference = self._cached_resolver()
+
+        for ref in refs:
             if progress is not None:
                 progress.update()
-            if self.resolve_reference(ref) is None:
+            if resolve_reference(ref) is None:
                 logger.warning(f"Unknown reference id `{ref.id}`. Some XML files may be missing or"
                                " cannot be parsed.")
                 ref.id = None
-        self._unchecked_refs = []
+
+    def _resolve_loaded(self, result: ParseResult) -> None:
+        """Resolve and check the references of elements loaded lazily."""
+        still_unresolved_refs, still_unresolved_inner_type_refs = self._resolve(
+            result.unresolved_refs, result.inner_type_refs)
+        self._unresolved_refs.extend(still_unresolved_refs)
+        self._inner_type_refs.extend(still_unresolved_inner_type_refs)
+        self._check(result.unchecked_refs)
 
     def resolve_reference(self, ref: TypeRef) -> Optional[ReferableElement]:
         try:
@@ -192,6 +543,37 @@ class Driver(DriverBase):
         except AmbiguousLookupError:
             return None
 
+    def _cached_resolver(self, refs: Iterable[TypeRef] = ()) -> ReferenceResolver:
+        """Create a function resolving references that remembers all results, including failures.
+
+        Remembered results stay valid while elements are added, as long as no element is added
+        for a name or id that was already looked up. Loading elements lazily guarantees this: the
+        first search for a short name or id loads all files listing it, and these files are never
+        loaded again. Elements with that name or id from other files are already registered.
+
+        Args:
+            refs: References without id to look up in advance. Looking them up together is faster
+                      than looking them up one by one.
+        """
+        cache: Dict[Tuple[str, Optional[str], Optional[str], Optional[str]],
+                    Optional[ReferableElement]] = {}
+        queries = (NameQuery(ref.name, ref.namespace, ref.language) for ref in refs
+                   if ref.id is None)
+        for query, element in self.api_reference.find_many(queries).items():
+            cache[(query.name, None, query.lang, query.namespace)] = element
+
+        def resolve_reference(ref: TypeRef) -> Optional[ReferableElement]:
+            key = (ref.name, ref.id, ref.language, ref.namespace)
+            try:
+                element = cache[key]
+                count("reference_lookup_cache_hits")
+                return element
+            except KeyError:
+                element = cache[key] = self.resolve_reference(ref)
+                return element
+
+        return resolve_reference
+
 
 def safe_language_tag(name: Optional[str]) -> str:
     """Convert language names to tags that are safe to use for identifiers and file names.
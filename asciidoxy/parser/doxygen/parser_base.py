@@ -14,13 +14,15 @@
 """Base support for parsing documentation for different languages."""
 
 import logging
+import sys
 import xml.etree.ElementTree as ET
 from abc import ABC
-from typing import Dict, List, Optional, Type
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type, Union, cast
 
-from ...model import Compound, Parameter, ReturnValue, ThrowsClause, TypeRef
+from ...model import Compound, Lazy, Parameter, ReturnValue, ThrowsClause, TypeRef
 from .description_parser import (
     Admonition,
+    NamedSection,
     NestedDescriptionElement,
     ParaContainer,
     ParameterItem,
@@ -31,7 +33,7 @@ from .description_parser import (
 )
 from .driver_base import DriverBase
 from .language_traits import LanguageTraits
-from .type_parser import TypeParseError, TypeParser
+from .type_parser import TypeCache, TypeParseError, TypeParser
 
 logger = logging.getLogger(__name__)
 
@@ -52,26 +54,17 @@ def _to_asciidoc_or_empty(description: Optional[NestedDescriptionElement]) -> st
     return ""
 
 
-def _pop_sections(description: Optional[ParaContainer]) -> Dict[str, str]:
-    if description is None:
-        return {}
-
-    sections = {}
-    for section_name, section_title in {
-            "author": "Author",
-            "bug": "Bug",
-            "copyright": "Copyright",
-            "date": "Date",
-            "deprecated": "Deprecated",
-            "pre": "Precondition",
-            "post": "Postcondition",
-            "since": "Since",
-            "todo": "Todo",
-    }.items():
-        section = description.pop_section(Admonition, section_name)
-        if section is not None:
-            sections[section_title] = _to_asciidoc_or_empty(section)
-    return sections
+_SECTIONS = {
+    "author": "Author",
+    "bug": "Bug",
+    "copyright": "Copyright",
+    "date": "Date",
+    "deprecated": "Deprecated",
+    "pre": "Precondition",
+    "post": "Postcondition",
+    "since": "Since",
+    "todo": "Todo",
+}
 
 
 def _find_parameter_documentation(descriptions: ParameterList,
@@ -83,10 +76,190 @@ def _find_parameter_documentation(descriptions: ParameterList,
     return None
 
 
+class _ParsedDescriptions(NamedTuple):
+    brief: ParaContainer
+    detailed: ParaContainer
+    sections: List[Tuple[str, Admonition]]
+    params: Optional[ParameterList]
+    tparams: Optional[ParameterList]
+    returns: Optional[Admonition]
+    exceptions: Optional[ParameterList]
+
+
+class LazyDescriptions:
+    """Brief and detailed description of an element, parsed when they are first needed.
+
+    Most elements in an API reference are never inserted in a document. Instead of converting all
+    descriptions to AsciiDoc while loading the API reference, the XML of the descriptions is stored
+    as text. It is parsed when one of the parts of the description is first read, and each part is
+    converted to AsciiDoc when it is read. Storing text instead of the XML elements does not keep
+    the XML tree of the file alive.
+
+    Args:
+        element:      XML element containing the `briefdescription` and `detaileddescription`.
+        language_tag: Tag indicating the programming language.
+        member:       True for members, which can also document return values and exceptions.
+        extract:      False to keep all sections in the detailed description.
+    """
+    __slots__ = ("_language_tag", "_member", "_extract", "_xml", "_parsed", "_selected")
+
+    _xml: Tuple[Optional[bytes], Optional[bytes]]
+    _parsed: Optional[_ParsedDescriptions]
+    _selected: Optional[Tuple[str, str]]
+
+    def __init__(self,
+                 element: ET.Element,
+                 language_tag: str,
+                 member: bool = False,
+                 extract: bool = True):
+        self._language_tag = language_tag
+        self._member = member
+        self._extract = extract
+        self._xml = (self._non_empty(element.find("briefdescription")),
+                     self._non_empty(element.find("detaileddescription")))
+        self._parsed = None
+        self._selected = None
+
+    def __getstate__(self):
+        return (self._language_tag, self._member, self._extract, self._xml)
+
+    def __setstate__(self, state) -> None:
+        self._language_tag, self._member, self._extract, self._xml = state
+        self._parsed = None
+        self._selected = None
+
+    @staticmethod
+    def _non_empty(xml: Optional[ET.Element]) -> Optional[bytes]:
+        # Only nested elements contain descriptions
+        if xml is None or len(xml) == 0:
+            return None
+        return ET.tostring(xml)
+
+    def is_empty(self) -> bool:
+        """True if there is neither a brief nor a detailed description."""
+        return all(xml is None for xml in self._xml)
+
+    def has_details(self) -> bool:
+        """True if there is a detailed description."""
+        return self._xml[1] is not None
+
+    def brief(self) -> Lazy[str]:
+        return _DescriptionPart(self, "brief")
+
+    def description(self) -> Lazy[str]:
+        return _DescriptionPart(self, "description")
+
+    def sections(self) -> Lazy[Dict[str, str]]:
+        return _DescriptionPart(self, "sections")
+
+    def returns(self) -> Lazy[str]:
+        return _DescriptionPart(self, "returns")
+
+    def param(self, kind: str, name: str) -> Lazy[str]:
+        return _DescriptionPart(self, kind, name)
+
+    def exception(self, index: int) -> Lazy[str]:
+        return _DescriptionPart(self, "exception", index)
+
+    def exceptions(self) -> Optional[ParameterList]:
+        """Documentation of exceptions thrown by a member.
+
+        The exceptions are needed to resolve the types of exceptions in the API reference. The
+        descriptions are only parsed if they document any exceptions.
+        """
+        detailed_xml = self._xml[1]
+        if not self._member or detailed_xml is None or b'kind="exception"' not in detailed_xml:
+            return None
+        return self._parse().exceptions
+
+    def resolve(self, part: str, key: Union[str, int, None] = None) -> Any:
+        """Convert a part of the descriptions to AsciiDoc."""
+        if part in ("brief", "description"):
+            if self._selected is None:
+                parsed = self._parse()
+                self._selected = select_descriptions(parsed.brief, parsed.detailed)
+            return self._selected[0] if part == "brief" else self._selected[1]
+
+        parsed = self._parse()
+        if part == "sections":
+            return {title: _to_asciidoc_or_empty(section) for title, section in parsed.sections}
+        elif part == "returns":
+            return _to_asciidoc_or_empty(parsed.returns)
+        elif part in ("param", "tparam"):
+            assert isinstance(key, str)
+            param_list = parsed.params if part == "param" else parsed.tparams
+            if param_list is not None:
+                documentation = _find_parameter_documentation(param_list, key)
+                if documentation is not None:
+                    return _to_asciidoc_or_empty(documentation.description())
+            return ""
+        elif part == "exception":
+            assert isinstance(key, int) and parsed.exceptions is not None
+            item = list(parsed.exceptions.children_of_type(ParameterItem))[key]
+            return _to_asciidoc_or_empty(item.description())
+        raise ValueError(f"Unknown description part: {part}")
+
+    def _parse(self) -> _ParsedDescriptions:
+        if self._parsed is None:
+            brief_xml, detailed_xml = (ET.fromstring(xml) if xml is not None else None
+                                       for xml in self._xml)
+            brief = parse_description(brief_xml, self._language_tag)
+            detailed = parse_description(detailed_xml, self._language_tag)
+
+            # First extract other descriptions, leaving the unused sections in the description
+            sections = []
+            params = tparams = returns = exceptions = None
+            if self._extract:
+                # Sections found first are not searched for inside the sections found later.
+                # Members extract their return value, parameters and exceptions first, compounds
+                # their parameters last.
+                named_sections: List[Tuple[Type[NamedSection],
+                                           str]] = [(Admonition, section_name)
+                                                    for section_name in _SECTIONS]
+                param_sections: List[Tuple[Type[NamedSection],
+                                           str]] = [(ParameterList, "param"),
+                                                    (ParameterList, "templateparam")]
+                if self._member:
+                    requested = ([(Admonition, "return")] + param_sections +
+                                 [(ParameterList, "exception")] + named_sections)
+                else:
+                    requested = named_sections + param_sections
+
+                found = dict(zip(requested, detailed.pop_sections(*requested)))
+                sections = [(section_title, cast(Admonition, found[(Admonition, section_name)]))
+                            for section_name, section_title in _SECTIONS.items()
+                            if found[(Admonition, section_name)] is not None]
+                params = cast(Optional[ParameterList], found[(ParameterList, "param")])
+                tparams = cast(Optional[ParameterList], found[(ParameterList, "templateparam")])
+                if self._member:
+                    returns = cast(Optional[Admonition], found[(Admonition, "return")])
+                    exceptions = cast(Optional[ParameterList], found[(ParameterList, "exception")])
+
+            self._parsed = _ParsedDescriptions(brief, detailed, sections, params, tparams, returns,
+                                               exceptions)
+        return self._parsed
+
+
+class _DescriptionPart(Lazy):
+    __slots__ = ("descriptions", "part", "key")
+
+    def __init__(self,
+                 descriptions: LazyDescriptions,
+                 part: str,
+                 key: Union[str, int, None] = None):
+        self.descriptions = descriptions
+        self.part = part
+        self.key = key
+
+    def resolve(self) -> Any:
+        return self.descriptions.resolve(self.part, self.key)
+
+
 class ParserBase(ABC):
     """Base functionality for language parsers.
 
-    The parser is mostly anemic by design: there is no internal state that changes during parsing.
+    The parser is mostly anemic by design: the only internal state that changes during parsing is a
+    cache of parsed types.
 
     Attributes:
         TRAITS:      Specifics for the language grammar to parse.
@@ -96,13 +269,14 @@ class ParserBase(ABC):
     TYPE_PARSER: Type[TypeParser]
 
     _driver: DriverBase
+    _type_cache: TypeCache
 
     def __init__(self, driver: DriverBase):
         self._driver = driver
+        self._type_cache = TypeCache(self.TYPE_PARSER, driver)
 
     def parse_parameters(self, memberdef_element: ET.Element, parent: Compound,
-                         descriptions: Optional[ParameterList],
-                         tparam_descriptions: Optional[ParameterList]) -> List[Parameter]:
+                         descriptions: LazyDescriptions) -> List[Parameter]:
         params = [
             self.parse_parameter(param_element, parent, descriptions, "param")
             for param_element in memberdef_element.iterfind("param")
@@ -110,14 +284,14 @@ class ParserBase(ABC):
         tparamlist_element = memberdef_element.find("templateparamlist")
         if tparamlist_element is not None:
             tparams = [
-                self.parse_parameter(param_element, parent, tparam_descriptions, "tparam")
+                self.parse_parameter(param_element, parent, descriptions, "tparam")
                 for param_element in tparamlist_element.iterfind("param")
             ]
             return params + tparams
         return params
 
     def parse_parameter(self, param_element: ET.Element, parent: Compound,
-                        descriptions: Optional[ParameterList], kind: str) -> Parameter:
+                        descriptions: LazyDescriptions, kind: str) -> Parameter:
         param = Parameter()
         param.type = self.parse_type(param_element.find("type"),
                                      param_element.find("array"),
@@ -126,15 +300,11 @@ class ParserBase(ABC):
         param.default_value = param_element.findtext("defval", "")
         param.kind = kind
 
-        if descriptions:
+        if descriptions.has_details():
             if kind == "param":
-                documentation = _find_parameter_documentation(descriptions, param.name)
+                param.description = descriptions.param(kind, param.name)
             elif param.type is not None:
-                documentation = _find_parameter_documentation(descriptions, param.type.name)
-            else:
-                documentation = None
-            if documentation:
-                param.description = _to_asciidoc_or_empty(documentation.description())
+                param.description = descriptions.param(kind, param.type.name)
 
         return param
 
@@ -146,20 +316,18 @@ class ParserBase(ABC):
             return None
 
         try:
-            return self.TYPE_PARSER.parse_xml(type_element,
-                                              array_element,
-                                              driver=self._driver,
-                                              namespace=namespace)
+            return self._type_cache.parse_xml(type_element, array_element, namespace=namespace)
         except TypeParseError:
             logger.exception(
                 f"Failed to parse type {ET.tostring(type_element, encoding='unicode')}.")
             return None
 
     def parse_exceptions(self, memberdef_element: ET.Element, parent: Compound,
-                         descriptions: Optional[ParameterList]) -> List[ThrowsClause]:
+                         descriptions: LazyDescriptions) -> List[ThrowsClause]:
         exceptions = []
-        if descriptions:
-            for desc in descriptions.children_of_type(ParameterItem):
+        exception_list = descriptions.exceptions()
+        if exception_list:
+            for index, desc in enumerate(exception_list.children_of_type(ParameterItem)):
                 exception = ThrowsClause(self.TRAITS.TAG)
 
                 name = desc.first_name()
@@ -179,7 +347,7 @@ class ParserBase(ABC):
                     assert False, "Expected either type ref or name"
 
                 exception.type.namespace = parent.namespace
-                exception.description = _to_asciidoc_or_empty(desc.description())
+                exception.description = descriptions.exception(index)
 
                 exceptions.append(exception)
                 if exception.type.id:
@@ -189,12 +357,13 @@ class ParserBase(ABC):
         return exceptions
 
     def parse_returns(self, memberdef_element: ET.Element, parent: Compound,
-                      description: Optional[Admonition]) -> Optional[ReturnValue]:
+                      descriptions: LazyDescriptions) -> Optional[ReturnValue]:
         returns = ReturnValue()
         returns.type = self.parse_type(memberdef_element.find("type"), namespace=parent.namespace)
-        returns.description = _to_asciidoc_or_empty(description)
 
         if returns.type:
+            if descriptions.has_details():
+                returns.description = descriptions.returns()
             return returns
         else:
             return None
@@ -208,15 +377,14 @@ class ParserBase(ABC):
     def parse_enumvalue(self, enumvalue_element: ET.Element, parent_name: str) -> Compound:
         enumvalue = Compound(self.TRAITS.TAG, kind="enumvalue")
         enumvalue.id = self.TRAITS.unique_id(enumvalue_element.get("id"))
-        enumvalue.prot = enumvalue_element.get("prot", "")
+        enumvalue.prot = sys.intern(enumvalue_element.get("prot", ""))
 
         enumvalue.name, enumvalue.full_name, _ = self.TRAITS.names(
             enumvalue_element.findtext("name", ""), parent_name, "enumvalue")
 
         enumvalue.initializer = enumvalue_element.findtext("initializer", "")
-        enumvalue.brief, enumvalue.description = select_descriptions(
-            parse_description(enumvalue_element.find("briefdescription"), self.TRAITS.TAG),
-            parse_description(enumvalue_element.find("detaileddescription"), self.TRAITS.TAG))
+        self.set_descriptions(enumvalue,
+                              LazyDescriptions(enumvalue_element, self.TRAITS.TAG, extract=False))
 
         self._driver.register(enumvalue)
         return enumvalue
@@ -224,8 +392,8 @@ class ParserBase(ABC):
     def parse_member(self, memberdef_element: ET.Element, parent: Compound) -> Optional[Compound]:
         member = Compound(self.TRAITS.TAG)
         member.id = self.TRAITS.unique_id(memberdef_element.get("id"))
-        member.kind = memberdef_element.get("kind", "")
-        member.prot = memberdef_element.get("prot", "")
+        member.kind = sys.intern(memberdef_element.get("kind", ""))
+        member.prot = sys.intern(memberdef_element.get("prot", ""))
 
         member.name, member.full_name, member.namespace = self.TRAITS.names(
             memberdef_element.findtext("name", ""), parent.full_name, member.kind)
@@ -234,21 +402,11 @@ class ParserBase(ABC):
         if self.TRAITS.is_member_blacklisted(member.kind, member.name):
             return None
 
-        brief = parse_description(memberdef_element.find("briefdescription"), self.TRAITS.TAG)
-        detailed = parse_description(memberdef_element.find("detaileddescription"), self.TRAITS.TAG)
-
-        # First extract other descriptions
-        member.returns = self.parse_returns(memberdef_element, member,
-                                            detailed.pop_section(Admonition, "return"))
-        member.params = self.parse_parameters(memberdef_element, member,
-                                              detailed.pop_section(ParameterList, "param"),
-                                              detailed.pop_section(ParameterList, "templateparam"))
-        member.exceptions = self.parse_exceptions(memberdef_element, member,
-                                                  detailed.pop_section(ParameterList, "exception"))
-        member.sections = _pop_sections(detailed)
-
-        # Then generate description with unused sections
-        member.brief, member.description = select_descriptions(brief, detailed)
+        descriptions = LazyDescriptions(memberdef_element, self.TRAITS.TAG, member=True)
+        member.returns = self.parse_returns(memberdef_element, member, descriptions)
+        member.params = self.parse_parameters(memberdef_element, member, descriptions)
+        member.exceptions = self.parse_exceptions(memberdef_element, member, descriptions)
+        self.set_descriptions(member, descriptions)
 
         member.definition = memberdef_element.findtext("definition", "")
         member.args = memberdef_element.findtext("argsstring", "")
@@ -266,15 +424,15 @@ class ParserBase(ABC):
         inner_type.name = \
             self.TRAITS.cleanup_name(innerclass_element.text if innerclass_element.text else "")
         inner_type.namespace = parent.full_name
-        inner_type.prot = innerclass_element.get("prot", "")
+        inner_type.prot = sys.intern(innerclass_element.get("prot", ""))
 
         self._driver.inner_type_ref(parent, inner_type)
 
     def parse_compounddef(self, compounddef_element: ET.Element) -> None:
         compound = Compound(self.TRAITS.TAG)
         compound.id = self.TRAITS.unique_id(compounddef_element.get("id"))
-        compound.kind = compounddef_element.get("kind", "")
-        compound.prot = compounddef_element.get("prot", "")
+        compound.kind = sys.intern(compounddef_element.get("kind", ""))
+        compound.prot = sys.intern(compounddef_element.get("prot", ""))
 
         compound.name, compound.full_name, compound.namespace = self.TRAITS.names(
             compounddef_element.findtext("compoundname", ""), kind=compound.kind)
@@ -287,24 +445,23 @@ class ParserBase(ABC):
             if member is not None
         ] + self.parse_enumvalues(compounddef_element, compound.full_name)
 
-        brief = parse_description(compounddef_element.find("briefdescription"), self.TRAITS.TAG)
-        detailed = parse_description(compounddef_element.find("detaileddescription"),
-                                     self.TRAITS.TAG)
-
-        # First extract other descriptions
-        compound.sections = _pop_sections(detailed)
-        compound.params = self.parse_parameters(
-            compounddef_element, compound, detailed.pop_section(ParameterList, "param"),
-            detailed.pop_section(ParameterList, "templateparam"))
-
-        # Then generate description with unused sections
-        compound.brief, compound.description = select_descriptions(brief, detailed)
+        descriptions = LazyDescriptions(compounddef_element, self.TRAITS.TAG)
+        compound.params = self.parse_parameters(compounddef_element, compound, descriptions)
+        self.set_descriptions(compound, descriptions)
 
         for innerclass_element in compounddef_element.iterfind("innerclass"):
             self.parse_innerclass(compound, innerclass_element)
 
         self._driver.register(compound)
 
+    def set_descriptions(self, element: Compound, descriptions: LazyDescriptions) -> None:
+        if descriptions.is_empty():
+            return
+        element.brief = descriptions.brief()
+        element.description = descriptions.description()
+        if descriptions.has_details():
+            element.sections = descriptions.sections()
+
     def find_include(self, element: ET.Element) -> Optional[str]:
         include = element.findtext("includes")
 
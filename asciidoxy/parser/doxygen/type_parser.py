@@ -14,10 +14,12 @@
 """Parsing of types from strings and XML."""
 
 import logging
+import re
 import xml.etree.ElementTree as ET
-from typing import Iterator, List, Optional, Sequence, Tuple, Type
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Tuple, Type
 
-from ...model import Parameter, TypeRef
+from ...model import Compound, Parameter, ReferableElement, TypeRef
+from ...profiling import count
 from .driver_base import DriverBase
 from .language_traits import LanguageTraits, TokenCategory
 
@@ -56,6 +58,35 @@ class Token:
     __repr__ = __str__
 
 
+class _Tokenizer:
+    """Tokenizer compiled from the grammar of a language.
+
+    Attributes:
+        boundaries: Pattern splitting text at token boundaries, keeping the boundaries.
+        categories: Category of each known token.
+    """
+    boundaries: Optional[Pattern]
+    categories: Dict[str, TokenCategory]
+
+    def __init__(self, traits: Type[LanguageTraits]):
+        # Only single characters can be boundaries
+        boundary_chars = "".join(
+            sorted(set(boundary for boundary in traits.TOKEN_BOUNDARIES if len(boundary) == 1)))
+        if boundary_chars:
+            self.boundaries = re.compile(f"([{re.escape(boundary_chars)}])")
+        else:
+            self.boundaries = None
+
+        # If a token is in multiple categories, the first category wins
+        self.categories = {}
+        for category, tokens in traits.TOKENS.items():
+            for token in tokens:
+                self.categories.setdefault(token, category)
+
+
+_tokenizers: Dict[Type[LanguageTraits], _Tokenizer] = {}
+
+
 class TypeParseError(Exception):
     """Error raised when type parsing fails.
 
@@ -161,45 +192,36 @@ class TypeParser:
     @classmethod
     def tokenize_text(cls, text: str) -> List[Token]:
         """Split a text into language grammar tokens."""
-        tokens: List[Token] = []
+        tokenizer = cls._tokenizer()
+        parts = tokenizer.boundaries.split(text) if tokenizer.boundaries is not None else [text]
+        categories = tokenizer.categories
 
-        def append_token(text: str) -> None:
-            token = cls.make_text_token(text)
-            if token.category == TokenCategory.WHITESPACE and tokens and tokens[
-                    -1].category == token.category:
-                pass
-            else:
-                tokens.append(token)
-
-        while text:
-            for i, c in enumerate(text):
-                if c in cls.TRAITS.TOKEN_BOUNDARIES:
-                    if i > 0:
-                        append_token(text[:i])
-                    append_token(text[i])
-                    text = text[i + 1:]
-                    break
+        tokens: List[Token] = []
+        for part in parts:
+            if not part:
+                continue
+            if part.isspace():
+                # Consecutive whitespace is merged into a single token
+                if not tokens or tokens[-1].category != TokenCategory.WHITESPACE:
+                    tokens.append(Token(" ", TokenCategory.WHITESPACE))
             else:
-                append_token(text)
-                text = ""
-
+                tokens.append(Token(part, categories.get(part, TokenCategory.NAME)))
         return tokens
 
     @classmethod
     def make_text_token(cls, text: str) -> Token:
         """Determine the token category for a text and create a token for it."""
         if text.isspace():
-            category = TokenCategory.WHITESPACE
-            text = " "
-        else:
-            for token_type, tokens in cls.TRAITS.TOKENS.items():
-                if text in tokens:
-                    category = token_type
-                    break
-            else:
-                category = TokenCategory.NAME
+            return Token(" ", TokenCategory.WHITESPACE)
+        return Token(text, cls._tokenizer().categories.get(text, TokenCategory.NAME))
 
-        return Token(text, category)
+    @classmethod
+    def _tokenizer(cls) -> _Tokenizer:
+        """Tokenizer for the language, compiled the first time it is needed."""
+        tokenizer = _tokenizers.get(cls.TRAITS)
+        if tokenizer is None:
+            tokenizer = _tokenizers[cls.TRAITS] = _Tokenizer(cls.TRAITS)
+        return tokenizer
 
     @classmethod
     def tokenize_xml(cls, element: ET.Element) -> List[Token]:
@@ -594,3 +616,141 @@ def find_tokens(
             yield tokens[search_start:search_index]
 
     return None
+
+
+_XmlKey = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str], tuple]
+_CacheKey = Tuple[_XmlKey, Optional[_XmlKey], Optional[str]]
+_DriverCall = Tuple[str, TypeRef]
+
+
+def _xml_key(element: ET.Element) -> _XmlKey:
+    """Hashable representation of all information the type parser uses from an XML element."""
+    return (element.tag, element.text, element.tail, element.get("refid"), element.get("kindref"),
+            tuple(_xml_key(child) for child in element))
+
+
+class _RecordingDriver(DriverBase):
+    """Driver recording the references registered while parsing a type."""
+    calls: List[_DriverCall]
+
+    def __init__(self):
+        self.calls = []
+
+    # The type parser only reports references. Elements and inner types are registered by the
+    # language parsers, which never use the recording driver.
+    def register(self, element: ReferableElement) -> None:
+        assert False, "Type parser cannot register elements."
+
+    def unchecked_ref(self, ref: TypeRef) -> None:
+        self.calls.append(("unchecked_ref", ref))
+
+    def unresolved_ref(self, ref: TypeRef) -> None:
+        self.calls.append(("unresolved_ref", ref))
+
+    def inner_type_ref(self, parent: Compound, ref: TypeRef) -> None:
+        assert False, "Type parser cannot register inner types."
+
+    def replay(self, driver: DriverBase, copies: Dict[int, TypeRef]) -> None:
+        """Register the recorded references with another driver.
+
+        Args:
+            driver: Driver to register the references with.
+            copies: Copy of each recorded reference, by id of the recorded reference.
+        """
+        for method, ref in self.calls:
+            ref_copy = copies.get(id(ref))
+            if ref_copy is None:
+                ref_copy = _copy_type_ref(ref, copies)
+            getattr(driver, method)(ref_copy)
+
+
+def _copy_type_ref(type_ref: TypeRef, copies: Dict[int, TypeRef]) -> TypeRef:
+    """Deep copy a type reference created by the type parser.
+
+    Args:
+        type_ref: Type reference to copy.
+        copies:   Filled with the copy of `type_ref` and all types nested in it, by id of the
+                      original.
+    """
+    ref_copy = TypeRef.__new__(TypeRef)
+    for name in TypeRef.__slots__:
+        setattr(ref_copy, name, getattr(type_ref, name))
+    copies[id(type_ref)] = ref_copy
+
+    if type_ref.nested is not None:
+        ref_copy.nested = [_copy_type_ref(nested, copies) for nested in type_ref.nested]
+    if type_ref.args is not None:
+        ref_copy.args = [_copy_parameter(arg, copies) for arg in type_ref.args]
+    if type_ref.returns is not None:
+        ref_copy.returns = _copy_type_ref(type_ref.returns, copies)
+    return ref_copy
+
+
+def _copy_parameter(param: Parameter, copies: Dict[int, TypeRef]) -> Parameter:
+    param_copy = Parameter.__new__(Parameter)
+    for name in Parameter.__slots__:
+        setattr(param_copy, name, getattr(param, name))
+    if param.type is not None:
+        param_copy.type = _copy_type_ref(param.type, copies)
+    return param_copy
+
+
+class TypeCache:
+    """Cache of types parsed from XML for a single language.
+
+    Identical `<type>` elements, like `const std::string &` or `void`, are only parsed once. Each
+    use gets its own copy of the parsed type, because types are modified when references are
+    resolved. The driver is notified of the references in each copy, as if the type was parsed
+    again.
+
+    Attributes:
+        type_parser: Type parser for the language.
+        driver:      Driver to register types with.
+    """
+    type_parser: Type[TypeParser]
+    driver: Optional[DriverBase]
+
+    _types: Dict[_CacheKey, Tuple[Optional[TypeRef], _RecordingDriver]]
+
+    def __init__(self, type_parser: Type[TypeParser], driver: Optional[DriverBase] = None):
+        self.type_parser = type_parser
+        self.driver = driver
+        self._types = {}
+
+    def parse_xml(self,
+                  type_element: ET.Element,
+                  array_element: Optional[ET.Element] = None,
+                  namespace: Optional[str] = None) -> Optional[TypeRef]:
+        """Parse a type from an XML element, or copy it from the cache.
+
+        See `TypeParser.parse_xml`.
+
+        Raises:
+            TypeParseError: The type cannot be parsed. Failures are not cached.
+        """
+        key = (_xml_key(type_element),
+               _xml_key(array_element) if array_element is not None else None, namespace)
+
+        cached = self._types.get(key)
+        if cached is None:
+            recorder = _RecordingDriver()
+            try:
+                type_ref = self.type_parser.parse_xml(type_element, array_element, recorder,
+                                                      namespace)
+            except TypeParseError:
+                if self.driver is not None:
+                    recorder.replay(self.driver, {})
+                raise
+            cached = self._types[key] = (type_ref, recorder)
+        else:
+            count("type_cache_hits")
+
+        type_ref, recorder = cached
+        if type_ref is None:
+            return None
+
+        copies: Dict[int, TypeRef] = {}
+        type_ref = _copy_type_ref(type_ref, copies)
+        if self.driver is not None:
+            recorder.replay(self.driver, copies)
+        return type_ref
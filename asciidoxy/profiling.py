@@ -0,0 +1,179 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measuring the performance of the phases of a build."""
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from ._version import __version__
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore
+
+_counters: Counter = Counter()
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Increase a performance counter.
+
+    Counters are always recorded, even if no report is written. Only counts from the current
+    process are recorded.
+
+    Args:
+        name:   Name of the counter.
+        amount: Amount to add to the counter.
+    """
+    _counters[name] += amount
+
+
+def counters() -> Dict[str, int]:
+    """Current value of all performance counters."""
+    return dict(_counters)
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of the current process in bytes.
+
+    Returns:
+        Peak resident set size, or None if not supported on this platform.
+    """
+    return _peak_rss(resource.RUSAGE_SELF) if resource is not None else None
+
+
+def peak_rss_children() -> Optional[int]:
+    """Largest peak resident set size of all terminated child processes in bytes.
+
+    Returns:
+        Peak resident set size, or None if not supported on this platform.
+    """
+    return _peak_rss(resource.RUSAGE_CHILDREN) if resource is not None else None
+
+
+def _peak_rss(who: int) -> int:
+    max_rss = resource.getrusage(who).ru_maxrss
+    if sys.platform == "darwin":
+        return max_rss
+    else:
+        return max_rss * 1024
+
+
+class Profiler:
+    """Record wall time, CPU time, peak memory usage and counters for each phase of a build.
+
+    CPU time of child processes, like the processes parsing XML files and running AsciiDoctor, is
+    only included after the child processes have terminated.
+
+    The operating system only reports the peak memory usage of a process since it started. Each
+    phase reports this peak at its end as `peak_rss`, and how much the phase increased it as
+    `peak_rss_increase`. A phase using less memory than an earlier phase has no increase.
+
+    Attributes:
+        phases:   Measurements of all completed phases.
+        sections: Additional sections to add to the report.
+    """
+    phases: List[Dict[str, Any]]
+    sections: Dict[str, Any]
+
+    _start_time: float
+    _start_cpu_times: os.times_result
+    _start_peak_rss: Optional[int]
+    _start_counters: Counter
+
+    def __init__(self):
+        self.phases = []
+        self.sections = {}
+        self._start_time = time.perf_counter()
+        self._start_cpu_times = os.times()
+        self._start_peak_rss = peak_rss()
+        self._start_counters = Counter(_counters)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure a phase of the build.
+
+        Args:
+            name: Name of the phase.
+        """
+        start_time = time.perf_counter()
+        start_cpu_times = os.times()
+        start_peak_rss = peak_rss()
+        start_counters = Counter(_counters)
+        try:
+            yield
+        finally:
+            measurement = self._measure(start_time, start_cpu_times, start_peak_rss, start_counters)
+            self.phases.append({"name": name, **measurement})
+
+    def report(self) -> Dict[str, Any]:
+        """Create a report of all measurements.
+
+        Returns:
+            The report as a JSON serializable dictionary.
+        """
+        return {
+            "version":
+            __version__,
+            "phases":
+            self.phases,
+            "total":
+            self._measure(self._start_time, self._start_cpu_times, self._start_peak_rss,
+                          self._start_counters),
+            **self.sections,
+        }
+
+    def write_report(self, report_file: Path) -> None:
+        """Write a report of all measurements to a JSON file."""
+        with report_file.open("w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+    @staticmethod
+    def _measure(start_time: float, start_cpu_times: os.times_result, start_peak_rss: Optional[int],
+                 start_counters: Counter) -> Dict[str, Any]:
+        end_time = time.perf_counter()
+        end_cpu_times = os.times()
+        end_peak_rss = peak_rss()
+
+        cpu_time = ((end_cpu_times.user + end_cpu_times.system) -
+                    (start_cpu_times.user + start_cpu_times.system))
+        children_cpu_time = ((end_cpu_times.children_user + end_cpu_times.children_system) -
+                             (start_cpu_times.children_user + start_cpu_times.children_system))
+
+        phase_counters = Counter(_counters)
+        phase_counters.subtract(start_counters)
+
+        return {
+            "wall_time":
+            end_time - start_time,
+            "cpu_time":
+            cpu_time,
+            "children_cpu_time":
+            children_cpu_time,
+            "peak_rss":
+            end_peak_rss,
+            "peak_rss_increase":
+            (end_peak_rss -
+             start_peak_rss if end_peak_rss is not None and start_peak_rss is not None else None),
+            "peak_rss_children":
+            peak_rss_children(),
+            "counters": {name: value
+                         for name, value in sorted(phase_counters.items()) if value},
+        }
@@ -33,6 +33,7 @@ class TranscoderError(AsciiDocError):
     msg: str
 
     def __init__(self, msg: str):
+        super().__init__(msg)
         self.msg = msg
 
     def __str__(self) -> str:
@@ -181,6 +181,9 @@ class KotlinTranscoder(TranscoderBase):
     def _compound(self, compound: Compound) -> Compound:
         transcoded = super()._compound(compound)
         transform_properties(transcoded.members)
+        for member in transcoded.members:
+            # Getters can be changed into properties
+            self.reference.reindex(member)
 
         if (transcoded.returns is not None and transcoded.returns.type is not None
                 and transcoded.returns.type.name == "Unit"):
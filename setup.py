@@ -16,6 +16,35 @@
 # limitations under the License.
 """The setup script."""
 
+import importlib.util
+from pathlib import Path
+
 import setuptools
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithTemplateBundle(build_py):
+    """Precompile the built-in templates into modules that are shipped with the package."""
+    def run(self):
+        super().run()
+
+        templates_dir = Path(self.build_lib) / "asciidoxy" / "generator" / "templates"
+        try:
+            bundle = _load_module("bundle", templates_dir / "bundle.py")
+        except ImportError:
+            self.warn("Mako is not available. Templates will be compiled when they are used.")
+            return
+
+        for module_file in bundle.compile_bundle(templates_dir):
+            self.announce(f"precompiled template {module_file}", level=2)
+
+
+def _load_module(name, path):
+    # Load by path, the build does not have the other dependencies of AsciiDoxy
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
 
-setuptools.setup()
+setuptools.setup(cmdclass={"build_py": BuildPyWithTemplateBundle})
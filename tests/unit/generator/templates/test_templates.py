@@ -15,8 +15,10 @@
 
 import pytest
 
+from asciidoxy.generator.asciidoc import PreprocessingApi
+from asciidoxy.generator.context import Context
 
-@pytest.mark.parametrize("element_name,language,expected_result", [
+fragment_testdata = [
     ("asciidoxy::geometry::Coordinate", "cpp", "fragments/cpp/class.adoc"),
     ("asciidoxy::traffic::TrafficEvent::Severity", "cpp", "fragments/cpp/enum.adoc"),
     ("asciidoxy::system::Service", "cpp", "fragments/cpp/interface.adoc"),
@@ -44,7 +46,10 @@ import pytest
     ("asciidoxy.traffic.TrafficEvent.update", "python", "fragments/python/function.adoc"),
     ("asciidoxy.default_values.Point.increment", "python",
      "fragments/python/function_default_value.adoc"),
-])
+]
+
+
+@pytest.mark.parametrize("element_name,language,expected_result", fragment_testdata)
 def test_fragment(generating_api, adoc_data, element_name, language, expected_result,
                   update_expected_results, doxygen_version):
     content = generating_api.insert(element_name, lang=language)
@@ -140,7 +145,7 @@ def test_local_filter(generating_api, adoc_data, element_name, language, filter_
     assert content == expected_result_file.read_text(encoding="UTF-8")
 
 
-@pytest.mark.parametrize("element_name,source,target,expected_result", [
+transcoded_testdata = [
     ("ADTrafficEvent", "objc", "swift", "fragments/swift/transcoded_protocol.adoc"),
     ("ADSeverity", "objc", "swift", "fragments/swift/transcoded_enum.adoc"),
     ("ADCoordinate", "objc", "swift", "fragments/swift/transcoded_interface.adoc"),
@@ -154,7 +159,10 @@ def test_local_filter(generating_api, adoc_data, element_name, language, filter_
      "fragments/kotlin/transcoded_interface.adoc"),
     ("com.asciidoxy.traffic.TrafficEvent", "java", "kotlin",
      "fragments/kotlin/transcoded_nested.adoc"),
-])
+]
+
+
+@pytest.mark.parametrize("element_name,source,target,expected_result", transcoded_testdata)
 def test_transcoded_fragment(generating_api, adoc_data, element_name, source, target,
                              expected_result, update_expected_results, doxygen_version):
     generating_api.language(target, source=source)
@@ -165,3 +173,37 @@ def test_transcoded_fragment(generating_api, adoc_data, element_name, source, ta
         expected_result_file.write_text(content, encoding="UTF-8")
 
     assert content == expected_result_file.read_text(encoding="UTF-8")
+
+
+def _preprocess(context, element_name, filter_spec, lang=None, source=None):
+    api = PreprocessingApi(context)
+    if lang is not None:
+        api.language(lang, source=source)
+    api.insert(element_name, **filter_spec)
+    return ({element_id: data.stacktrace
+             for element_id, data in context.inserted.items()}, dict(context.linked))
+
+
+@pytest.mark.parametrize("element_name,lang,source,filter_spec", [
+    *((name, lang, None, {}) for name, lang, _ in fragment_testdata),
+    *((name, lang, None, filter_spec) for name, lang, filter_spec, _ in filtered_testdata),
+    *((name, target, source, {}) for name, source, target, _ in transcoded_testdata),
+])
+def test_preprocessing_matches_rendering(document, api_reference, package_manager, default_config,
+                                         tmp_path, element_name, lang, source, filter_spec):
+    context = Context(api_reference, package_manager, document, default_config)
+    preprocessed = _preprocess(context, element_name, filter_spec, lang, source)
+
+    # An empty custom template directory forces rendering the default templates
+    default_config.template_dir = tmp_path
+    context = Context(api_reference, package_manager, document, default_config)
+    rendered = _preprocess(context, element_name, filter_spec, lang, source)
+
+    preprocessed_inserted, preprocessed_linked = preprocessed
+    rendered_inserted, rendered_linked = rendered
+    assert preprocessed_inserted
+    assert preprocessed_inserted == rendered_inserted
+    assert list(preprocessed_linked) == list(rendered_linked)
+    for element_id, stacks in preprocessed_linked.items():
+        assert len(stacks) == len(rendered_linked[element_id]), element_id
+        assert stacks == rendered_linked[element_id], element_id
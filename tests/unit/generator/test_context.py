@@ -63,8 +63,10 @@ def test_create_sub_context(empty_context, document):
     assert sub.templates is context.templates
     assert sub.document_cache is context.document_cache
     assert sub.config is context.config
+    assert sub.deferred is context.deferred
+    assert sub.rendered is context.rendered
 
-    assert sub.insert_filter is not context.insert_filter
+    assert sub.insert_filter is context.insert_filter
 
     sub.namespace = "other"
     sub.language = "objc"
@@ -365,6 +367,34 @@ def test_link_to_anchor__unknown(empty_context):
         empty_context.link_to_anchor("my-anchor")
 
 
+def test_defer(empty_context):
+    empty_context.push_stack("link('Coordinate')")
+    first = empty_context.defer(lambda: "first")
+    empty_context.pop_stack()
+    second = empty_context.defer(lambda: "second")
+
+    assert first != second
+    assert empty_context.resolve_deferred(f"a {first} b {second} c {first}") == (
+        "a first b second c first")
+    assert empty_context.resolve_deferred("no placeholders") == "no placeholders"
+
+
+def test_defer__call_stack_is_restored(empty_context):
+    call_stacks = []
+
+    def generate():
+        call_stacks.append(empty_context.call_stack[:])
+        return ""
+
+    empty_context.push_stack("cross_document_ref('other.adoc')")
+    placeholder = empty_context.defer(generate)
+    empty_context.pop_stack()
+
+    empty_context.resolve_deferred(placeholder)
+    assert [frame.command for frame in call_stacks[0]] == ["cross_document_ref('other.adoc')"]
+    assert empty_context.call_stack == []
+
+
 def test_link_to_element__single_link(empty_context, document):
     empty_context.push_stack("link(\"MyElement\")", document, Package.INPUT_PACKAGE_NAME)
     empty_context.link_to_element("my-element-id")
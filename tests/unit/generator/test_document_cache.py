@@ -13,7 +13,12 @@
 # limitations under the License.
 """Test the template cache implementation."""
 
+import os
+import time
+
 import pytest
+from mako.exceptions import RichTraceback
+from mako.template import ModuleTemplate
 
 from asciidoxy.generator.cache import DocumentCache
 
@@ -45,5 +50,113 @@ def test_cache_dir(tmp_path, document):
     template = cache.get_document(document)
     assert template is not None
     assert template.source.startswith("= My document")
-    assert (cache_dir / "documents" /
-            str(document.original_file.with_suffix(".adoc.py"))[1:]).is_file()
+    assert len(list((cache_dir / "documents").glob("*.py"))) == 1
+
+
+def test_cache_dir__load_from_cache(tmp_path, document):
+    document.original_file.write_text("= My document\n${1 + 1}")
+
+    cache_dir = tmp_path / "cache"
+    DocumentCache(cache_dir=cache_dir).get_document(document)
+
+    cache = DocumentCache(cache_dir=cache_dir)
+    template = cache.get_document(document)
+    assert isinstance(template, ModuleTemplate)
+    assert template.source.startswith("= My document")
+    assert template.render() == "= My document\n2"
+    assert cache.get_document(document) is template
+
+
+def test_cache_dir__traceback_refers_to_document(tmp_path, document):
+    document.original_file.write_text("= My document\n\n${1 / 0}")
+
+    cache_dir = tmp_path / "cache"
+    DocumentCache(cache_dir=cache_dir).get_document(document)
+
+    template = DocumentCache(cache_dir=cache_dir).get_document(document)
+    assert isinstance(template, ModuleTemplate)
+    with pytest.raises(ZeroDivisionError) as exception_info:
+        template.render()
+    traceback = RichTraceback(exception_info.value, exception_info.tb)
+    filename, lineno, _, line = traceback.traceback[-1]
+    assert filename == str(document.original_file)
+    assert lineno == 3
+    assert line == "${1 / 0}"
+
+
+def test_cache_dir__changed_document_is_compiled_again(tmp_path, document):
+    cache_dir = tmp_path / "cache"
+
+    document.original_file.write_text("= My document")
+    DocumentCache(cache_dir=cache_dir).get_document(document)
+
+    document.original_file.write_text("= My changed document")
+    template = DocumentCache(cache_dir=cache_dir).get_document(document)
+    assert not isinstance(template, ModuleTemplate)
+    assert template.render() == "= My changed document"
+    assert len(list((cache_dir / "documents").glob("*.py"))) == 2
+
+
+def test_cache_dir__different_python_paths_are_compiled_separately(tmp_path, document):
+    cache_dir = tmp_path / "cache"
+    document.original_file.write_text("= My document")
+
+    DocumentCache(cache_dir=cache_dir).get_document(document)
+    template = DocumentCache(cache_dir=cache_dir,
+                             python_paths=[tmp_path / "python"]).get_document(document)
+    assert not isinstance(template, ModuleTemplate)
+    assert str(tmp_path / "python") in template.code
+
+
+def test_cache_dir__invalid_cached_code_is_replaced(tmp_path, document):
+    cache_dir = tmp_path / "cache"
+    document.original_file.write_text("= My document")
+    DocumentCache(cache_dir=cache_dir).get_document(document)
+
+    module_file, = (cache_dir / "documents").glob("*.py")
+    module_file.write_text("invalid python")
+
+    template = DocumentCache(cache_dir=cache_dir).get_document(document)
+    assert not isinstance(template, ModuleTemplate)
+    assert template.render() == "= My document"
+    assert module_file.read_text() == template.code
+
+
+def test_prune__old_code_is_removed(tmp_path, document):
+    cache_dir = tmp_path / "cache"
+    cache = DocumentCache(cache_dir=cache_dir)
+
+    old_doc = document.with_relative_path("old.adoc")
+    old_doc.original_file.write_text("= Old document")
+    cache.get_document(old_doc)
+    old_module_file, = (cache_dir / "documents").glob("*.py")
+    os.utime(old_module_file, (time.time() - 3600, time.time() - 3600))
+
+    document.original_file.write_text("= My document")
+    cache.get_document(document)
+
+    cache.prune(max_age=60)
+    assert not old_module_file.exists()
+    assert len(list((cache_dir / "documents").glob("*.py"))) == 1
+
+
+def test_prune__least_recently_used_code_is_removed_if_too_large(tmp_path, document):
+    cache_dir = tmp_path / "cache"
+    cache = DocumentCache(cache_dir=cache_dir)
+
+    for i in range(3):
+        doc = document.with_relative_path(f"doc{i}.adoc")
+        doc.original_file.write_text(f"= Document {i}")
+        cache.get_document(doc)
+
+    module_files = sorted((cache_dir / "documents").glob("*.py"), key=lambda f: f.stat().st_mtime)
+    for i, module_file in enumerate(module_files):
+        os.utime(module_file, (time.time() - 100 + i, time.time() - 100 + i))
+    size = max(module_file.stat().st_size for module_file in module_files)
+
+    cache.prune(max_size=2 * size)
+    assert [f.exists() for f in module_files] == [False, True, True]
+
+
+def test_prune__no_cache_dir(document):
+    DocumentCache().prune()
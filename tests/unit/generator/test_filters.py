@@ -13,6 +13,8 @@
 # limitations under the License.
 """Test filters for generated parts."""
 
+import copy
+
 import pytest
 
 from asciidoxy.generator.filters import (
@@ -308,6 +310,29 @@ def test_insertion_filter__compound__filter_members(cpp_class):
     ])
 
 
+def test_insertion_filter__extend_creates_new_filter(cpp_class):
+    insertion_filter = InsertionFilter(members={"kind": "variable"})
+    extended = insertion_filter.extend(members={"name": "-Private"})
+
+    assert extended is not insertion_filter
+    assert sorted(member.name for member in insertion_filter.members(cpp_class)) == sorted([
+        "PublicVariable",
+        "ProtectedVariable",
+        "PrivateVariable",
+    ])
+    assert sorted(member.name for member in extended.members(cpp_class)) == sorted([
+        "PublicVariable",
+        "ProtectedVariable",
+    ])
+
+
+def test_insertion_filter__copies_are_shared():
+    insertion_filter = InsertionFilter(members="-Private", exceptions="NONE")
+
+    assert copy.copy(insertion_filter) is insertion_filter
+    assert copy.deepcopy(insertion_filter) is insertion_filter
+
+
 def test_insertion_filer__member__exceptions__no_filters(api_reference):
     member = api_reference.find("asciidoxy::traffic::TrafficEvent::CalculateDelay")
     assert member is not None
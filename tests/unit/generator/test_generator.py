@@ -15,17 +15,26 @@
 Tests for the `asciidoxy.generator.asciidoc`.
 """
 
+import pickle
 from pathlib import Path
 
 import pytest
 
 from asciidoxy import __version__
-from asciidoxy.generator.asciidoc import ApiProxy, GeneratingApi, PreprocessingApi, process_adoc
+from asciidoxy.document import Document
+from asciidoxy.generator.asciidoc import (
+    ApiProxy,
+    GeneratingApi,
+    PreprocessingApi,
+    SinglePassApi,
+    process_adoc,
+)
 from asciidoxy.generator.cache import TemplateCache
 from asciidoxy.generator.context import InsertData, StackFrame
 from asciidoxy.generator.errors import (
     AmbiguousReferenceError,
     ConsistencyError,
+    DuplicateAnchorError,
     DuplicateIncludeError,
     IncludeFileNotFoundError,
     IncompatibleVersionError,
@@ -35,7 +44,9 @@ from asciidoxy.generator.errors import (
     ReferenceNotFoundError,
     TemplateMissingError,
     UnknownAnchorError,
+    UnlinkableError,
 )
+from asciidoxy.model import ReferableElement
 from asciidoxy.packaging import Package
 
 from ..shared import ProgressMock
@@ -53,6 +64,18 @@ def tdb_warnings_are_and_are_not_errors(request, file_builder):
     return request.param
 
 
+@pytest.fixture(params=[False, True], ids=["two-pass", "single-pass"])
+def single_and_two_pass(request, default_config):
+    default_config.single_pass = request.param
+    return request.param
+
+
+@pytest.fixture(params=[1, 2], ids=["serial", "parallel"])
+def serial_and_parallel(request, default_config):
+    default_config.jobs = request.param
+    return request.param
+
+
 @pytest.fixture
 def adoc_data_document(adoc_data, package_manager):
     def prepare(adoc_file):
@@ -1326,12 +1349,24 @@ def test_multipage_toc__preprocessing_run(preprocessing_api, document, multipage
     assert not document.docinfo_footer_file.exists()
 
 
+def test_multipage_toc__single_pass_run(context, document, multipage):
+    result = SinglePassApi(context).multipage_toc()
+    assert not document.docinfo_footer_file.exists()
+
+    assert context.resolve_deferred(result) == """\
+:docinfo: private
+:stylesheet: asciidoxy-toc-left.css"""
+    assert document.docinfo_footer_file.is_file()
+    assert document.stylesheet == "asciidoxy-toc-left.css"
+
+
 @pytest.mark.parametrize("warnings_are_errors", [True, False],
                          ids=["warnings-are-errors", "warnings-are-not-errors"])
 @pytest.mark.parametrize("test_file_name", ["simple_test", "link_to_member"])
 def test_process_adoc_single_file(warnings_are_errors, test_file_name, single_and_multipage,
                                   adoc_data, api_reference, package_manager,
-                                  update_expected_results, doxygen_version, default_config):
+                                  update_expected_results, doxygen_version, default_config,
+                                  single_and_two_pass):
     input_file = adoc_data / f"{test_file_name}.input.adoc"
     expected_output_file = adoc_data_expected_result_file(input_file, single_and_multipage,
                                                           doxygen_version)
@@ -1361,7 +1396,8 @@ def test_process_adoc_single_file(warnings_are_errors, test_file_name, single_an
 
 def test_process_adoc_multi_file(single_and_multipage, api_reference, package_manager,
                                  adoc_data_document, update_expected_results, adoc_data,
-                                 doxygen_version, default_config):
+                                 doxygen_version, default_config, single_and_two_pass,
+                                 serial_and_parallel):
     main_doc = adoc_data_document("multifile_test.input.adoc")
 
     progress_mock = ProgressMock()
@@ -1399,7 +1435,8 @@ def test_process_adoc_multi_file(single_and_multipage, api_reference, package_ma
 
 def test_process_adoc_env_variables(single_and_multipage, api_reference, package_manager,
                                     adoc_data_document, doxygen_version, update_expected_results,
-                                    adoc_data, default_config):
+                                    adoc_data, default_config, single_and_two_pass,
+                                    serial_and_parallel):
     main_doc = adoc_data_document("env_variables.input.adoc")
 
     progress_mock = ProgressMock()
@@ -1433,7 +1470,8 @@ def test_process_adoc_env_variables(single_and_multipage, api_reference, package
 
 
 def test_process_adoc__embedded_doc_included(single_and_multipage, api_reference, package_manager,
-                                             adoc_data_document, default_config):
+                                             adoc_data_document, default_config,
+                                             single_and_two_pass, serial_and_parallel):
     main_doc = adoc_data_document("embeddedfile_test.input.adoc")
 
     progress_mock = ProgressMock()
@@ -1454,6 +1492,28 @@ def test_process_adoc__embedded_doc_included(single_and_multipage, api_reference
     assert progress_mock.total == 2
 
 
+def test_errors_can_be_sent_between_processes(tmp_path):
+    errors = [
+        TemplateMissingError("cpp", "class"),
+        ReferenceNotFoundError("geometry::Coordinate", lang="cpp", kind=None),
+        UnlinkableError("geometry::Coordinate", lang=None, kind="class"),
+        AmbiguousReferenceError("Coordinate", [ReferableElement(name="Coordinate")]),
+        IncludeFileNotFoundError("missing.adoc"),
+        ConsistencyError("Something is wrong"),
+        IncompatibleVersionError("100.0.0"),
+        InvalidApiCallError("Invalid call"),
+        MissingPackageError("package"),
+        MissingPackageFileError("package", "file.adoc"),
+        DuplicateAnchorError("anchor"),
+        UnknownAnchorError("anchor"),
+        DuplicateIncludeError(Document(Path("a.adoc"), Package("package"), tmp_path), True),
+    ]
+    for error in errors:
+        copied = pickle.loads(pickle.dumps(error))
+        assert type(copied) is type(error)
+        assert str(copied) == str(error)
+
+
 def test_process_adoc_custom_templates(warnings_are_errors, single_and_multipage, adoc_data,
                                        api_reference, package_manager, update_expected_results,
                                        doxygen_version, tmp_path, default_config):
@@ -1531,7 +1591,7 @@ def test_process_adoc_include_python(warnings_are_errors, single_and_multipage,
     ["dangling_link", "dangling_cross_doc_ref", "double_insert", "dangling_link_in_insert"])
 def test_process_adoc_file_warning(test_file_name, single_and_multipage, adoc_data, api_reference,
                                    package_manager, update_expected_results, doxygen_version,
-                                   default_config):
+                                   default_config, single_and_two_pass):
     input_file = adoc_data / f"{test_file_name}.input.adoc"
     package_manager.set_input_files(input_file)
     doc = package_manager.prepare_work_directory(input_file)
@@ -1555,7 +1615,8 @@ def test_process_adoc_file_warning(test_file_name, single_and_multipage, adoc_da
                           ("double_insert", ConsistencyError),
                           ("dangling_link_in_insert", ConsistencyError)])
 def test_process_adoc_file_warning_as_error(test_file_name, error, single_and_multipage, adoc_data,
-                                            api_reference, package_manager, default_config):
+                                            api_reference, package_manager, default_config,
+                                            single_and_two_pass):
     input_file = adoc_data / f"{test_file_name}.input.adoc"
     package_manager.set_input_files(input_file)
     doc = package_manager.prepare_work_directory(input_file)
@@ -1646,6 +1707,19 @@ def test_context_link_to_element_multipage_element_in_the_same_document(
                                            link_text) == f"xref:{element_id}[++{link_text}++]")
 
 
+def test_context_link_to_element_multipage_single_pass(context, multipage):
+    element_id = "element"
+    file_containing_element = "other_file.adoc"
+    link_text = "Link"
+    result = SinglePassApi(context).link_to_element(element_id, link_text)
+    assert element_id in context.linked
+
+    context.inserted[element_id] = InsertData(
+        context.document.with_relative_path(file_containing_element), [])
+    assert (context.resolve_deferred(result) ==
+            f"xref:{file_containing_element}#{element_id}[++{link_text}++]")
+
+
 def test_context_link_to_element_element_not_inserted(context, single_and_multipage,
                                                       generating_api):
     element_id = "element"
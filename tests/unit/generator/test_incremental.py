@@ -0,0 +1,202 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for incremental builds."""
+
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from asciidoxy.generator.asciidoc import GeneratingApi, process_adoc
+from asciidoxy.generator.incremental import BuildManifest
+from asciidoxy.packaging import PackageManager
+
+from ..shared import ProgressMock
+
+
+def append_text(file: Path, text: str) -> None:
+    file.write_text(file.read_text(encoding="utf-8") + text, encoding="utf-8")
+    # Make sure the document cache detects the change
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+
+@pytest.fixture
+def input_dir(adoc_data, tmp_path):
+    d = tmp_path / "input"
+    shutil.copytree(adoc_data, d)
+    return d
+
+
+@pytest.fixture
+def build(input_dir, api_reference, default_config):
+    def _build(input_file="multifile_test.input.adoc", incremental=True):
+        package_manager = PackageManager(default_config.build_dir)
+        package_manager.set_input_files(input_dir / input_file, input_dir)
+        doc = package_manager.prepare_work_directory(input_dir / input_file)
+
+        if incremental:
+            build_manifest = BuildManifest(default_config.build_dir / "incremental")
+        else:
+            build_manifest = None
+
+        progress = ProgressMock()
+        with patch.object(GeneratingApi,
+                          "render_adoc",
+                          autospec=True,
+                          side_effect=GeneratingApi.render_adoc) as render_mock:
+            documents = process_adoc(doc,
+                                     api_reference,
+                                     package_manager,
+                                     default_config,
+                                     progress=progress,
+                                     build_manifest=build_manifest)
+        assert progress.ready == progress.total
+
+        if build_manifest is not None:
+            build_manifest.save()
+
+        rendered = {c.args[0]._context.document.relative_path for c in render_mock.call_args_list}
+        output = {doc.relative_path: doc.work_file.read_text(encoding="utf-8") for doc in documents}
+        return documents, rendered, output
+
+    return _build
+
+
+def test_incremental__first_build_renders_all(build, single_and_multipage):
+    documents, rendered, _ = build()
+    assert rendered == {
+        Path("multifile_test.input.adoc"),
+        Path("sub_directory/multifile_subdoc_test.input.adoc"),
+        Path("sub_directory/multifile_subdoc_in_table_test.input.adoc"),
+    }
+    assert not any(doc.is_up_to_date for doc in documents)
+
+
+def test_incremental__unchanged_build_renders_nothing(build, single_and_multipage):
+    _, _, first_output = build()
+    documents, rendered, second_output = build()
+
+    assert rendered == set()
+    assert second_output == first_output
+    for doc in documents:
+        assert doc.is_up_to_date
+        assert doc.stylesheet == "asciidoxy-no-toc.css"
+        assert doc.stylesheet_file.is_file()
+
+
+def test_incremental__changed_document_and_its_includes_are_rendered(build, input_dir,
+                                                                     single_and_multipage):
+    build()
+
+    sub_doc = input_dir / "sub_directory" / "multifile_subdoc_test.input.adoc"
+    append_text(sub_doc, "\nExtra text.\n")
+    documents, rendered, output = build()
+
+    assert rendered == {Path("sub_directory/multifile_subdoc_test.input.adoc")}
+    assert "Extra text." in output[Path("sub_directory/multifile_subdoc_test.input.adoc")]
+
+    up_to_date = {doc.relative_path for doc in documents if doc.is_up_to_date}
+    if single_and_multipage:
+        assert up_to_date == {
+            Path("multifile_test.input.adoc"),
+            Path("sub_directory/multifile_subdoc_in_table_test.input.adoc"),
+        }
+    else:
+        # The root document needs to be converted again to include the changes
+        assert up_to_date == {Path("sub_directory/multifile_subdoc_in_table_test.input.adoc")}
+
+
+def test_incremental__changed_root_document_renders_all(build, input_dir, single_and_multipage):
+    build()
+
+    root_doc = input_dir / "multifile_test.input.adoc"
+    append_text(root_doc, "\nExtra text.\n")
+    _, rendered, _ = build()
+
+    assert len(rendered) == 3
+
+
+def test_incremental__output_identical_to_full_build(build, input_dir, single_and_multipage):
+    build()
+    sub_doc = input_dir / "sub_directory" / "multifile_subdoc_test.input.adoc"
+    append_text(sub_doc, "\nExtra text.\n")
+
+    _, _, incremental_output = build()
+    _, _, full_output = build(incremental=False)
+    assert incremental_output == full_output
+
+
+def test_incremental__changed_config_renders_all(build, default_config):
+    build()
+    default_config.attribute = ["some-attribute"]
+    _, rendered, _ = build()
+    assert len(rendered) == 3
+
+
+@pytest.mark.parametrize("option,value", [
+    ("debug", True),
+    ("log_level", "DEBUG"),
+    ("profile_report", Path("profile.json")),
+    ("jobs", 4),
+    ("stream_xml", True),
+    ("lazy_reference", True),
+    ("single_pass", True),
+    ("connections_per_host", 1),
+    ("download_cache_dir", Path("downloads")),
+    ("cache_dir", Path("cache")),
+])
+def test_incremental__changed_config_not_affecting_output_renders_nothing(
+        build, default_config, tmp_path, option, value):
+    build()
+    if isinstance(value, Path):
+        value = tmp_path / value
+    setattr(default_config, option, value)
+    _, rendered, _ = build()
+    assert rendered == set()
+
+
+def test_incremental__no_manifest_saved_renders_all(build, default_config):
+    build(incremental=False)
+    _, rendered, _ = build()
+    assert len(rendered) == 3
+
+
+def test_incremental__removed_output_is_regenerated(build, default_config):
+    build()
+    shutil.rmtree(default_config.build_dir / "incremental" / "output")
+    _, rendered, _ = build()
+    assert len(rendered) == 3
+
+
+def test_incremental__corrupt_manifest(build, default_config):
+    build()
+    (default_config.build_dir / "incremental" / "manifest.json").write_text("{invalid")
+    _, rendered, _ = build()
+    assert len(rendered) == 3
+
+
+def test_incremental__embedded_documents(build, input_dir, single_and_multipage):
+    _, _, first_output = build("embeddedfile_test.input.adoc")
+    _, rendered, second_output = build("embeddedfile_test.input.adoc")
+    assert rendered == set()
+    assert second_output == first_output
+
+    embedded_doc = input_dir / "sub_directory" / "embeddedfile_subdoc_test.input.adoc"
+    append_text(embedded_doc, "\nExtra text.\n")
+    _, rendered, output = build("embeddedfile_test.input.adoc")
+    assert Path("embeddedfile_test.input.adoc") in rendered
+    assert "Extra text." in output[Path("embeddedfile_test.input.adoc")]
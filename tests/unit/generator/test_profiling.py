@@ -0,0 +1,192 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for measuring the time spent rendering."""
+
+import time
+
+import pytest
+
+from asciidoxy.generator.asciidoc import process_adoc
+from asciidoxy.generator.profiling import RenderProfiler
+
+
+def test_measure__nested():
+    profiler = RenderProfiler()
+
+    with profiler.measure("document", "index.adoc", []):
+        time.sleep(0.01)
+        with profiler.measure("insert", "Coordinate", ["index.adoc: insert('Coordinate')"],
+                              "cpp/class"):
+            time.sleep(0.02)
+
+    document = profiler.timings[("document", "index.adoc", None)]
+    insert = profiler.timings[("insert", "Coordinate", "cpp/class")]
+
+    assert document.count == 1
+    assert insert.count == 1
+    assert insert.total_time >= 0.02
+    assert insert.self_time == pytest.approx(insert.total_time)
+    assert document.total_time >= document.self_time + insert.total_time
+    assert document.self_time >= 0.01
+
+    assert profiler.stacks.keys() == {
+        ("document index.adoc", ),
+        ("document index.adoc", "index.adoc: insert('Coordinate')",
+         "insert Coordinate [cpp/class]"),
+    }
+
+
+def test_measure__repeated():
+    profiler = RenderProfiler()
+
+    for _ in range(3):
+        with profiler.measure("find", "Coordinate", []):
+            pass
+
+    assert profiler.timings[("find", "Coordinate", None)].count == 3
+    assert len(profiler.stacks) == 1
+
+
+def test_measure__recorded_on_exception():
+    profiler = RenderProfiler()
+
+    with pytest.raises(RuntimeError):
+        with profiler.measure("document", "index.adoc", []):
+            raise RuntimeError()
+
+    assert profiler.timings[("document", "index.adoc", None)].count == 1
+
+
+def test_measure__only_new_commands_added_to_nested_stack():
+    profiler = RenderProfiler()
+
+    with profiler.measure("document", "index.adoc", ["include('index.adoc')"]):
+        with profiler.measure("insert", "Coordinate", ["include('index.adoc')", "insert()"]):
+            pass
+
+    assert ("include('index.adoc')", "document index.adoc", "insert()",
+            "insert Coordinate") in profiler.stacks
+
+
+def test_slowest():
+    profiler = RenderProfiler()
+
+    for name, duration in (("fast", 0.0), ("slow", 0.02), ("medium", 0.01)):
+        with profiler.measure("insert", name, []):
+            time.sleep(duration)
+    with profiler.measure("document", "index.adoc", []):
+        pass
+
+    assert [t.name for t in profiler.slowest("insert")] == ["slow", "medium", "fast"]
+    assert [t.name for t in profiler.slowest("insert", 2)] == ["slow", "medium"]
+    assert [t.name for t in profiler.slowest("document")] == ["index.adoc"]
+    assert profiler.slowest("find") == []
+
+
+def test_report():
+    profiler = RenderProfiler()
+
+    with profiler.measure("document", "index.adoc", []):
+        with profiler.measure("insert", "Coordinate", [], "cpp/class"):
+            with profiler.measure("find", "Point", []):
+                pass
+
+    report = profiler.report()
+    assert report["slowest_documents"][0]["name"] == "index.adoc"
+    assert report["slowest_inserts"][0]["name"] == "Coordinate"
+    assert report["slowest_inserts"][0]["template"] == "cpp/class"
+    assert report["slowest_inserts"][0]["count"] == 1
+    assert report["slowest_lookups"][0]["name"] == "Point"
+
+
+def test_merge():
+    profiler = RenderProfiler()
+    with profiler.measure("document", "index.adoc", []):
+        pass
+
+    other = RenderProfiler()
+    with other.measure("document", "index.adoc", []):
+        pass
+    with other.measure("insert", "Coordinate", [], "cpp/class"):
+        pass
+
+    profiler.merge(other)
+
+    assert profiler.timings[("document", "index.adoc", None)].count == 2
+    assert profiler.timings[("insert", "Coordinate", "cpp/class")].count == 1
+    assert profiler.stacks.keys() == {("document index.adoc", ),
+                                      ("insert Coordinate [cpp/class]", )}
+
+
+def test_write_stacks(tmp_path):
+    profiler = RenderProfiler()
+    profiler.stacks[("document index.adoc", )] = 0.5
+    profiler.stacks[("document index.adoc", "insert a;b\nc")] = 0.000002
+    profiler.stacks[("document index.adoc", "insert tiny")] = 0.0000001
+
+    stack_file = tmp_path / "stacks.folded"
+    profiler.write_stacks(stack_file)
+
+    assert stack_file.read_text(encoding="utf-8").splitlines() == [
+        "document index.adoc 500000",
+        "document index.adoc;insert a,b c 2",
+    ]
+
+
+def test_process_adoc__measures_documents_and_inserts(adoc_data, api_reference, package_manager,
+                                                      default_config, single_and_multipage):
+    input_file = adoc_data / "multifile_test.input.adoc"
+    package_manager.set_input_files(input_file, adoc_data)
+    doc = package_manager.prepare_work_directory(input_file)
+
+    profiler = RenderProfiler()
+    process_adoc(doc, api_reference, package_manager, default_config, render_profiler=profiler)
+
+    assert {t.name
+            for t in profiler.slowest("document")} == {
+                "multifile_test.input.adoc",
+                "sub_directory/multifile_subdoc_test.input.adoc",
+                "sub_directory/multifile_subdoc_in_table_test.input.adoc",
+            }
+    inserts = profiler.slowest("insert", 100)
+    assert inserts
+    assert all(t.template for t in inserts)
+    assert profiler.slowest("find")
+
+    # Only the generating pass is measured
+    assert all(t.count == 1 for t in profiler.slowest("document"))
+
+    # All stacks start at the root document
+    assert all(stack[0] == "document multifile_test.input.adoc" for stack in profiler.stacks)
+
+
+def test_process_adoc__measures_documents_in_worker_processes(adoc_data, api_reference,
+                                                              package_manager, default_config,
+                                                              single_and_multipage):
+    input_file = adoc_data / "multifile_test.input.adoc"
+    package_manager.set_input_files(input_file, adoc_data)
+    doc = package_manager.prepare_work_directory(input_file)
+
+    default_config.jobs = 2
+    profiler = RenderProfiler()
+    process_adoc(doc, api_reference, package_manager, default_config, render_profiler=profiler)
+
+    assert {t.name
+            for t in profiler.slowest("document")} == {
+                "multifile_test.input.adoc",
+                "sub_directory/multifile_subdoc_test.input.adoc",
+                "sub_directory/multifile_subdoc_in_table_test.input.adoc",
+            }
+    assert all(t.count == 1 for t in profiler.slowest("document"))
+    assert profiler.slowest("insert")
@@ -13,10 +13,36 @@
 # limitations under the License.
 """Test the template cache implementation."""
 
+import importlib
+import sys
+from pathlib import Path
+
 import pytest
+from mako.exceptions import RichTraceback
+from mako.template import ModuleTemplate
 
+import asciidoxy.generator.templates
 from asciidoxy.generator.cache import TemplateCache
 from asciidoxy.generator.errors import TemplateMissingError
+from asciidoxy.generator.templates.bundle import SOURCE_HASH_ATTRIBUTE, compile_bundle
+
+
+@pytest.fixture
+def template_bundle(tmp_path, monkeypatch):
+    """Precompile the built-in templates outside the source tree and make them importable."""
+    templates_dir = Path(asciidoxy.generator.templates.__file__).parent
+    bundle_dir = tmp_path / "bundle"
+    compile_bundle(templates_dir, bundle_dir)
+
+    for lang_dir in bundle_dir.iterdir():
+        lang_package = importlib.import_module(f"asciidoxy.generator.templates.{lang_dir.name}")
+        monkeypatch.setattr(lang_package, "__path__", [*lang_package.__path__, str(lang_dir)])
+
+    yield bundle_dir
+
+    for name in list(sys.modules):
+        if name.startswith("asciidoxy.generator.templates.") and name.endswith("_mako"):
+            del sys.modules[name]
 
 
 def test_template_for__internal__template_available():
@@ -95,3 +121,52 @@ def test_cache_dir(tmp_path):
     assert template is not None
     assert template.source.startswith("## Copyright (C) 2019, TomTom (http://tomtom.com).")
     assert (cache_dir / "templates" / "cpp" / "class.mako.py").is_file()
+
+
+def test_template_for__bundle(template_bundle):
+    cache = TemplateCache()
+    template = cache.template_for("cpp", "class")
+    assert isinstance(template, ModuleTemplate)
+    assert template.module.__file__ == str(template_bundle / "cpp" / "class_mako.py")
+    assert template.source.startswith("## Copyright (C) 2019, TomTom (http://tomtom.com).")
+
+    assert cache.template_for("cpp", "class") is template
+
+
+def test_template_for__bundle__traceback_refers_to_template(template_bundle):
+    template = TemplateCache().template_for("cpp", "class")
+    assert isinstance(template, ModuleTemplate)
+
+    with pytest.raises(Exception) as exception_info:
+        template.render()
+    traceback = RichTraceback(exception_info.value, exception_info.tb)
+    assert any(filename.endswith("class.mako") for filename, *_ in traceback.traceback)
+
+
+def test_template_for__bundle__includes_are_loaded_from_bundle(template_bundle):
+    cache = TemplateCache()
+    cache.template_for("cpp", "function")
+    assert isinstance(cache.get_template("/cpp/_function.mako"), ModuleTemplate)
+
+
+def test_template_for__bundle__outdated_module_is_not_used(template_bundle):
+    module_file = template_bundle / "cpp" / "class_mako.py"
+    with module_file.open("a") as f:
+        print(f"{SOURCE_HASH_ATTRIBUTE} = 'outdated'", file=f)
+
+    cache = TemplateCache()
+    template = cache.template_for("cpp", "class")
+    assert not isinstance(template, ModuleTemplate)
+    assert template.source.startswith("## Copyright (C) 2019, TomTom (http://tomtom.com).")
+
+
+def test_template_for__bundle__custom_template_has_priority(template_bundle, tmp_path):
+    (tmp_path / "cpp").mkdir(parents=True)
+    (tmp_path / "cpp" / "class.mako").write_text("Hello world")
+
+    cache = TemplateCache(custom_template_dir=tmp_path)
+    template = cache.template_for("cpp", "class")
+    assert not isinstance(template, ModuleTemplate)
+    assert template.source.startswith("Hello world")
+
+    assert isinstance(cache.template_for("cpp", "struct"), ModuleTemplate)
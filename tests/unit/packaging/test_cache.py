@@ -0,0 +1,115 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for caching the API reference of packages."""
+
+import os
+import shutil
+
+import pytest
+
+from asciidoxy.document import Package
+from asciidoxy.packaging.cache import ReferenceCache
+from asciidoxy.parser.doxygen import Driver
+
+
+@pytest.fixture
+def package(tmp_path, xml_data):
+    pkg = Package("my-package")
+    pkg.version = "1.0.0"
+    pkg.reference_dir = tmp_path / "package" / "xml"
+    shutil.copytree(xml_data / "cpp" / "default" / "xml", pkg.reference_dir)
+    return pkg
+
+
+@pytest.fixture
+def xml_files(package):
+    return list(package.reference_dir.glob("**/*.xml"))
+
+
+@pytest.fixture
+def parse_result(xml_files):
+    driver = Driver()
+    mark = driver.mark()
+    for xml_file in xml_files:
+        driver.parse(xml_file)
+    return driver.results_since(mark)
+
+
+@pytest.fixture
+def cache(build_dir):
+    return ReferenceCache(build_dir / "cache" / "reference")
+
+
+def test_load__empty_cache(cache, package, xml_files):
+    assert cache.load(package, xml_files) is None
+
+
+def test_store_and_load(cache, package, xml_files, parse_result):
+    cache.store(package, xml_files, parse_result)
+
+    result = cache.load(package, xml_files)
+    assert result is not None
+    assert result.elements == parse_result.elements
+    assert len(result.unresolved_refs) == len(parse_result.unresolved_refs)
+    assert len(result.unchecked_refs) == len(parse_result.unchecked_refs)
+    assert len(result.inner_type_refs) == len(parse_result.inner_type_refs)
+
+
+def test_store_and_load__references_point_into_elements(cache, package, xml_files, parse_result):
+    cache.store(package, xml_files, parse_result)
+    result = cache.load(package, xml_files)
+    assert result is not None
+
+    driver = Driver()
+    driver.merge(result)
+    driver.resolve_references()
+
+    parent_class = driver.api_reference.find("asciidoxy::traffic::TrafficEvent",
+                                             kind="class",
+                                             lang="cpp")
+    assert parent_class is not None
+    inner_classes = [m for m in parent_class.members if m.kind == "struct"]
+    assert len(inner_classes) > 0
+    assert inner_classes[0] is driver.api_reference.find(
+        "asciidoxy::traffic::TrafficEvent::TrafficEventData", kind="struct", lang="cpp")
+
+
+def test_load__changed_version(cache, package, xml_files, parse_result):
+    cache.store(package, xml_files, parse_result)
+    package.version = "1.0.1"
+    assert cache.load(package, xml_files) is None
+
+
+def test_load__changed_file(cache, package, xml_files, parse_result):
+    cache.store(package, xml_files, parse_result)
+    stat = xml_files[0].stat()
+    os.utime(xml_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.load(package, xml_files) is None
+
+
+def test_load__removed_file(cache, package, xml_files, parse_result):
+    cache.store(package, xml_files, parse_result)
+    assert cache.load(package, xml_files[1:]) is None
+
+
+def test_load__different_forced_language(cache, build_dir, package, xml_files, parse_result):
+    cache.store(package, xml_files, parse_result)
+    assert ReferenceCache(cache.cache_dir, "java").load(package, xml_files) is None
+
+
+def test_load__corrupt_cache_file(cache, package, xml_files, parse_result):
+    cache.store(package, xml_files, parse_result)
+    for cache_file in cache.cache_dir.iterdir():
+        cache_file.write_bytes(b"garbage")
+    assert cache.load(package, xml_files) is None
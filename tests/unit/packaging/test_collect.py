@@ -13,6 +13,7 @@
 # limitations under the License.
 """Tests for collecting source files."""
 
+import asyncio
 import base64
 import os
 from pathlib import Path
@@ -22,6 +23,7 @@ import pytest
 from aiohttp import web
 
 from asciidoxy.packaging.collect import (
+    DOWNLOAD_ATTEMPTS,
     DownloadError,
     HttpPackageSpec,
     InvalidPackageError,
@@ -31,6 +33,7 @@ from asciidoxy.packaging.collect import (
     specs_from_file,
     versions_from_file,
 )
+from asciidoxy.packaging.store import DownloadStore
 
 from ..shared import ProgressMock
 
@@ -440,6 +443,231 @@ async def test_http_package_not_a_tarfile(aiohttp_server, tmp_path):
     assert not (tmp_path / "test" / "1.0.0").exists()
 
 
+def interrupting_package_file_response(requests,
+                                       support_ranges=True,
+                                       interruptions=1,
+                                       etag='"package"',
+                                       changed=False,
+                                       range_start=None):
+    """Response sending half of the package before closing the connection `interruptions` times.
+
+    Args:
+        requests:       Filled with the Range and If-Range headers of each request.
+        support_ranges: Send only the requested part if the If-Range header matches.
+        interruptions:  Number of requests to interrupt.
+        etag:           Entity tag of the package, or None to send none.
+        changed:        Interrupt sending a different file, with a different entity tag.
+        range_start:    Send the part starting at this offset instead of the requested part.
+    """
+    data = (Path(__file__).parent.parent.parent / "data" / "package.tar.gz").read_bytes()
+    headers = {"ETag": etag} if etag else {}
+
+    async def _response(request):
+        requests.append((request.headers.get("Range"), request.headers.get("If-Range")))
+        if len(requests) > interruptions:
+            range_header = request.headers.get("Range")
+            if (support_ranges and range_header and etag
+                    and request.headers.get("If-Range") == etag):
+                start = int(range_header[len("bytes="):-1])
+                if range_start is not None:
+                    start = range_start
+                return web.Response(status=206,
+                                    body=data[start:],
+                                    headers={
+                                        **headers, "Content-Range":
+                                        f"bytes {start}-{len(data) - 1}/{len(data)}"
+                                    })
+            return web.Response(body=data, headers=headers)
+
+        if changed:
+            response = web.StreamResponse(headers={"ETag": '"old-package"'})
+            response.content_length = len(data)
+            await response.prepare(request)
+            await response.write(bytes(len(data) // 2))
+        else:
+            response = web.StreamResponse(headers=headers)
+            response.content_length = len(data)
+            await response.prepare(request)
+            await response.write(data[:len(data) // 2])
+        request.transport.close()
+        return response
+
+    return _response
+
+
+async def test_http_package__resume_interrupted_download(aiohttp_server, tmp_path):
+    requests = []
+    server = await start_server(
+        aiohttp_server, web.get("/test/1.0.0/package",
+                                interrupting_package_file_response(requests)))
+
+    spec = HttpPackageSpec("test", "1.0.0",
+                           f"http://localhost:{server.port}/{{name}}/{{version}}/{{file_name}}")
+    spec.file_names = ["package"]
+
+    packages = await collect([spec], tmp_path)
+
+    assert len(packages) == 1
+    verify_default_package(packages[0], tmp_path)
+    assert len(requests) == 2
+    assert requests[0] == (None, None)
+    assert requests[1][0] is not None
+    assert requests[1][0].startswith("bytes=")
+    assert requests[1][1] == '"package"'
+    assert not (tmp_path / "test" / "1.0.0.partial").exists()
+
+
+@pytest.mark.parametrize(
+    "changed,range_start,etag,expected_requests",
+    [
+        # The server sends the complete new file
+        (True, None, '"package"', [(False, None), (True, '"old-package"')]),
+        # The partial file is removed and the complete file requested again
+        (False, 0, '"package"', [(False, None), (True, '"package"'), (False, None)]),
+        # The complete file is requested again
+        (False, None, None, [(False, None), (False, None)]),
+    ],
+    ids=["file-changed", "wrong-range", "no-validator"])
+async def test_http_package__resume_restarts_download(aiohttp_server, tmp_path, changed,
+                                                      range_start, etag, expected_requests):
+    requests = []
+    server = await start_server(
+        aiohttp_server,
+        web.get(
+            "/test/1.0.0/package",
+            interrupting_package_file_response(requests,
+                                               etag=etag,
+                                               changed=changed,
+                                               range_start=range_start)))
+
+    spec = HttpPackageSpec("test", "1.0.0",
+                           f"http://localhost:{server.port}/{{name}}/{{version}}/{{file_name}}")
+    spec.file_names = ["package"]
+
+    packages = await collect([spec], tmp_path)
+
+    assert len(packages) == 1
+    verify_default_package(packages[0], tmp_path)
+    assert [(range_header is not None, if_range)
+            for range_header, if_range in requests] == expected_requests
+    assert not (tmp_path / "test" / "1.0.0.partial").exists()
+
+
+async def test_http_package__resume_not_supported_by_server(aiohttp_server, tmp_path):
+    requests = []
+    server = await start_server(
+        aiohttp_server,
+        web.get("/test/1.0.0/package",
+                interrupting_package_file_response(requests, support_ranges=False)))
+
+    spec = HttpPackageSpec("test", "1.0.0",
+                           f"http://localhost:{server.port}/{{name}}/{{version}}/{{file_name}}")
+    spec.file_names = ["package"]
+
+    packages = await collect([spec], tmp_path)
+
+    assert len(packages) == 1
+    verify_default_package(packages[0], tmp_path)
+    assert len(requests) == 2
+
+
+async def test_http_package__resume_in_next_run(aiohttp_server, tmp_path):
+    requests = []
+    server = await start_server(
+        aiohttp_server,
+        web.get("/test/1.0.0/package",
+                interrupting_package_file_response(requests, interruptions=DOWNLOAD_ATTEMPTS)))
+
+    spec = HttpPackageSpec("test", "1.0.0",
+                           f"http://localhost:{server.port}/{{name}}/{{version}}/{{file_name}}")
+    spec.file_names = ["package"]
+
+    with pytest.raises(DownloadError):
+        await collect([spec], tmp_path)
+    assert len(requests) == DOWNLOAD_ATTEMPTS
+    assert any((tmp_path / "test" / "1.0.0.partial").iterdir())
+
+    packages = await collect([spec], tmp_path)
+
+    assert len(packages) == 1
+    verify_default_package(packages[0], tmp_path)
+    assert len(requests) == DOWNLOAD_ATTEMPTS + 1
+    assert requests[-1][0].startswith("bytes=")
+    assert not (tmp_path / "test" / "1.0.0.partial").exists()
+
+
+async def test_http_package__connections_per_host(aiohttp_server, tmp_path):
+    active = 0
+    max_active = 0
+
+    async def _response(request):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(active, max_active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return await package_file_response(request)
+
+    server = await start_server(aiohttp_server, web.get("/{name}/1.0.0/package", _response))
+
+    specs = []
+    for name in ("a", "b", "c"):
+        spec = HttpPackageSpec(
+            name, "1.0.0", f"http://localhost:{server.port}/{{name}}/{{version}}/{{file_name}}")
+        spec.file_names = ["package"]
+        specs.append(spec)
+
+    packages = await collect(specs, tmp_path, connections_per_host=1)
+
+    assert len(packages) == 3
+    assert max_active == 1
+
+
+async def test_http_package__download_store(aiohttp_server, tmp_path):
+    requests = []
+
+    async def _response(request):
+        requests.append(request.path)
+        return await package_file_response(request)
+
+    server = await start_server(aiohttp_server, web.get("/test/1.0.0/package", _response))
+
+    spec = HttpPackageSpec("test", "1.0.0",
+                           f"http://localhost:{server.port}/{{name}}/{{version}}/{{file_name}}")
+    spec.file_names = ["package"]
+    store = DownloadStore(tmp_path / "store")
+
+    packages = await collect([spec], tmp_path / "build1", store=store)
+    assert len(packages) == 1
+    verify_default_package(packages[0], tmp_path / "build1")
+    assert len(requests) == 1
+
+    packages = await collect([spec], tmp_path / "build2", store=store)
+    assert len(packages) == 1
+    verify_default_package(packages[0], tmp_path / "build2")
+    assert len(requests) == 1
+
+    shared_file = Path("test") / "1.0.0" / "xml" / "content.xml"
+    first_file = tmp_path / "build1" / shared_file
+    second_file = tmp_path / "build2" / shared_file
+    assert first_file.stat().st_ino == second_file.stat().st_ino
+
+
+async def test_http_package__download_store__not_a_tarfile(aiohttp_server, tmp_path):
+    server = await start_server(aiohttp_server, web.get("/test/1.0.0/text", text_response))
+
+    spec = HttpPackageSpec("test", "1.0.0",
+                           f"http://localhost:{server.port}/{{name}}/{{version}}/{{file_name}}")
+    spec.file_names = ["text"]
+    store = DownloadStore(tmp_path / "store")
+
+    with pytest.raises(DownloadError):
+        await collect([spec], tmp_path / "build", store=store)
+    assert not (tmp_path / "build" / "test" / "1.0.0").exists()
+    assert store.lookup(spec.url_template.format(name="test", version="1.0.0",
+                                                 file_name="text")) is None
+
+
 async def test_http_package_name_interpolation_in_file_names(aiohttp_server, tmp_path):
     server = await start_server(aiohttp_server, web.get("/test/1.0.0/test", xml_file_response))
 
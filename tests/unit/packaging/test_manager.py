@@ -13,8 +13,9 @@
 # limitations under the License.
 """Tests for managing packages."""
 
+import shutil
 from pathlib import Path
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 import toml
@@ -26,6 +27,8 @@ from asciidoxy.packaging.manager import (
     UnknownFileError,
     UnknownPackageError,
 )
+from asciidoxy.parser.doxygen import Driver
+from tests.unit.shared import ProgressMock
 
 
 @pytest.fixture
@@ -158,6 +161,65 @@ def test_load_reference(package_manager, tmp_path, build_dir):
          call(pkg_b_dir / "xml" / "b.xml")], any_order=True)
 
 
+def test_load_reference__parallel(package_manager, tmp_path, build_dir):
+    pkg_a_dir = create_package_dir(tmp_path, "a")
+    pkg_b_dir = create_package_dir(tmp_path, "b")
+    spec_file = create_package_spec(tmp_path, "a", "b")
+    package_manager.collect(spec_file)
+
+    parser_mock = MagicMock()
+    parser_mock.parse_parallel.return_value = (True for _ in range(2))
+    progress_mock = ProgressMock()
+    package_manager.load_reference(parser_mock, progress_mock, jobs=3)
+
+    parser_mock.parse_parallel.assert_called_once()
+    xml_files, jobs = parser_mock.parse_parallel.call_args[0]
+    assert sorted(xml_files) == sorted([pkg_a_dir / "xml" / "a.xml", pkg_b_dir / "xml" / "b.xml"])
+    assert jobs == 3
+    assert progress_mock.ready == progress_mock.total == 2
+
+
+def test_load_reference__cache(package_manager, tmp_path, build_dir, xml_data):
+    pkg_a_dir = create_package_dir(tmp_path, "a")
+    shutil.rmtree(pkg_a_dir / "xml")
+    shutil.copytree(xml_data / "cpp" / "default" / "xml", pkg_a_dir / "xml")
+    create_package_dir(tmp_path, "b", xml=False)
+    spec_file = create_package_spec(tmp_path, "a", "b")
+    package_manager.collect(spec_file)
+    cache_dir = build_dir / "cache" / "reference"
+
+    first_parser = Driver()
+    package_manager.load_reference(first_parser, cache_dir=cache_dir)
+    assert (cache_dir / "a.pickle").is_file()
+    assert not (cache_dir / "b.pickle").exists()
+
+    second_parser = Driver()
+    with patch.object(second_parser, "parse", wraps=second_parser.parse) as parse_mock:
+        package_manager.load_reference(second_parser, cache_dir=cache_dir)
+    parse_mock.assert_not_called()
+
+    assert second_parser.api_reference.elements == first_parser.api_reference.elements
+    assert second_parser.unresolved_ref_count == first_parser.unresolved_ref_count
+    assert second_parser.unchecked_ref_count == first_parser.unchecked_ref_count
+
+
+def test_load_reference__lazy(package_manager, tmp_path, build_dir, xml_data):
+    pkg_a_dir = create_package_dir(tmp_path, "a")
+    shutil.rmtree(pkg_a_dir / "xml")
+    shutil.copytree(xml_data / "cpp" / "default" / "xml", pkg_a_dir / "xml")
+    pkg_b_dir = create_package_dir(tmp_path, "b")
+    spec_file = create_package_spec(tmp_path, "a", "b")
+    package_manager.collect(spec_file)
+
+    parser = Driver()
+    with patch.object(parser, "parse", wraps=parser.parse) as parse_mock:
+        package_manager.load_reference(parser, lazy=True)
+    parse_mock.assert_called_once_with(pkg_b_dir / "xml" / "b.xml")
+    assert not parser.api_reference.elements
+
+    assert parser.api_reference.find("asciidoxy::geometry::Coordinate") is not None
+
+
 def test_prepare_work_directory(package_manager, tmp_path, build_dir):
     create_package_dir(tmp_path, "a")
     create_package_dir(tmp_path, "b")
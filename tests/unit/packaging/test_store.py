@@ -0,0 +1,103 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the store for downloaded packages."""
+
+import asyncio
+import shutil
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from asciidoxy.packaging.store import DownloadStore, link_tree
+
+PACKAGE_FILE = Path(__file__).parent.parent.parent / "data" / "package.tar.gz"
+
+
+def test_add_and_lookup(tmp_path):
+    store = DownloadStore(tmp_path / "store")
+    assert store.lookup("http://example.com/package") is None
+
+    content_dir = store.add("http://example.com/package", PACKAGE_FILE)
+    assert (content_dir / "contents.toml").is_file()
+    assert store.lookup("http://example.com/package") == content_dir
+    assert store.lookup("http://example.com/other") is None
+
+
+def test_add__same_contents_from_different_urls(tmp_path):
+    store = DownloadStore(tmp_path / "store")
+
+    content_dir = store.add("http://example.com/package", PACKAGE_FILE)
+    assert store.add("http://mirror.example.com/package", PACKAGE_FILE) == content_dir
+    assert store.lookup("http://mirror.example.com/package") == content_dir
+    assert [d.name for d in content_dir.parent.iterdir()] == [content_dir.name]
+
+
+def test_add__not_a_tar_file(tmp_path):
+    text_file = tmp_path / "text"
+    text_file.write_text("normal text instead of a file")
+
+    store = DownloadStore(tmp_path / "store")
+    with pytest.raises(tarfile.TarError):
+        store.add("http://example.com/package", text_file)
+    assert store.lookup("http://example.com/package") is None
+    assert not any((tmp_path / "store" / "contents").iterdir())
+
+
+def test_lookup__contents_removed(tmp_path):
+    store = DownloadStore(tmp_path / "store")
+    content_dir = store.add("http://example.com/package", PACKAGE_FILE)
+    shutil.rmtree(content_dir)
+
+    assert store.lookup("http://example.com/package") is None
+
+
+async def test_lock__excludes_other_holders(tmp_path):
+    store = DownloadStore(tmp_path / "store")
+    events = []
+
+    async def _hold(name):
+        async with store.lock("http://example.com/package"):
+            events.append(f"{name} start")
+            await asyncio.sleep(0.2)
+            events.append(f"{name} end")
+
+    await asyncio.gather(_hold("a"), _hold("b"))
+
+    assert events in (["a start", "a end", "b start",
+                       "b end"], ["b start", "b end", "a start", "a end"])
+
+
+async def test_lock__different_urls_do_not_wait(tmp_path):
+    store = DownloadStore(tmp_path / "store")
+
+    async with store.lock("http://example.com/package"):
+        await asyncio.wait_for(store.lock("http://example.com/other").__aenter__(), timeout=1)
+
+
+def test_link_tree(tmp_path):
+    source_dir = tmp_path / "source"
+    (source_dir / "sub").mkdir(parents=True)
+    (source_dir / "file.txt").write_text("file")
+    (source_dir / "sub" / "other.txt").write_text("other")
+
+    target_dir = tmp_path / "target"
+    (target_dir).mkdir()
+    (target_dir / "file.txt").write_text("old")
+
+    link_tree(source_dir, target_dir)
+
+    assert (target_dir / "file.txt").read_text() == "file"
+    assert (target_dir / "sub" / "other.txt").read_text() == "other"
+    assert (target_dir / "file.txt").stat().st_ino == (source_dir / "file.txt").stat().st_ino
@@ -22,7 +22,9 @@ from asciidoxy.parser.doxygen.description_parser import (
     Admonition,
     DescriptionElement,
     NestedDescriptionElement,
+    ParaContainer,
     ParameterList,
+    PlainText,
     Ref,
     SpecialCharacter,
     parse_description,
@@ -1193,6 +1195,110 @@ Second paragraph about the parameter."""
 Parblocks are used to add multiple paragraphs to commands that only accept a single parameter."""
 
 
+def nested_description_xml(depth: int) -> str:
+    content = "<para>Innermost paragraph.</para>"
+    for level in range(depth):
+        content = f"""\
+<para>Level {level}.<itemizedlist><listitem><parblock>{content}<para>Item {level}.</para></parblock>
+</listitem></itemizedlist></para>"""
+    return f"""\
+<detaileddescription><sect1><title>Nested</title><para><table rows="1" cols="1"><row>
+<entry thead="no">{content}</entry></row></table></para></sect1></detaileddescription>"""
+
+
+@pytest.mark.parametrize("depth", [1, 2, 4])
+def test_to_asciidoc__each_element_converted_once(monkeypatch, depth):
+    output = parse_description(ET.fromstring(nested_description_xml(depth)), "lang")
+
+    conversions = []
+    original_to_asciidoc = PlainText.to_asciidoc
+
+    def _counting_to_asciidoc(self, context=None):
+        conversions.append(self)
+        return original_to_asciidoc(self, context)
+
+    monkeypatch.setattr(PlainText, "to_asciidoc", _counting_to_asciidoc)
+    adoc = output.to_asciidoc()
+
+    assert "Innermost paragraph." in adoc
+    assert len(conversions) == len(set(map(id, conversions)))
+    assert len(conversions) <= 4 * depth + 4
+
+
+@pytest.mark.parametrize("depth", [1, 10, 50])
+def test_normalize__each_container_normalized_once(monkeypatch, depth):
+    normalized = []
+    original_normalize = ParaContainer.normalize
+
+    def _counting_normalize(self):
+        normalized.append(self)
+        original_normalize(self)
+
+    monkeypatch.setattr(ParaContainer, "normalize", _counting_normalize)
+    output = parse_description(ET.fromstring(nested_description_xml(depth)), "lang")
+
+    assert "Innermost paragraph." in output.to_asciidoc()
+    assert len(normalized) == len(set(map(id, normalized)))
+
+
+SECTIONS_XML = """\
+<detaileddescription>
+<para>Description.<simplesect kind="return"><para>Return value.<parameterlist kind="param">
+<parameteritem><parameternamelist><parametername>inner</parametername></parameternamelist>
+<parameterdescription><para>Inner parameter.</para></parameterdescription></parameteritem>
+</parameterlist></para></simplesect>
+<simplesect kind="note"><para>Note.</para></simplesect>
+<parameterlist kind="param">
+<parameteritem><parameternamelist><parametername>outer</parametername></parameternamelist>
+<parameterdescription><para>Outer parameter.</para></parameterdescription></parameteritem>
+</parameterlist></para>
+</detaileddescription>
+"""
+
+
+@pytest.mark.parametrize("requested", [
+    [(Admonition, "return"), (ParameterList, "param")],
+    [(ParameterList, "param"), (Admonition, "return")],
+    [(ParameterList, "param"), (Admonition, "return"), (Admonition, "todo"),
+     (ParameterList, "param")],
+    [(Admonition, "param"), (ParameterList, "note"), (Admonition, "note")],
+])
+def test_pop_sections__same_as_pop_section_in_order(requested):
+    expected_output = parse(SECTIONS_XML)
+    expected = [expected_output.pop_section(section_type, name) for section_type, name in requested]
+
+    output = parse(SECTIONS_XML)
+    sections = output.pop_sections(*requested)
+
+    assert ([s.to_asciidoc() if s is not None else None
+             for s in sections] == [s.to_asciidoc() if s is not None else None for s in expected])
+    assert output.to_asciidoc() == expected_output.to_asciidoc()
+
+
+def test_pop_sections__not_found_inside_earlier_section():
+    output = parse(SECTIONS_XML)
+    returns, params = output.pop_sections((Admonition, "return"), (ParameterList, "param"))
+
+    assert params is not None
+    assert params.contents[0].first_name().name == "outer"
+    assert returns is not None
+    assert returns.pop_section(ParameterList, "param") is not None
+
+
+def test_pop_sections__found_inside_later_section():
+    output = parse(SECTIONS_XML)
+    outer_params = output.pop_section(ParameterList, "param")
+    assert outer_params is not None
+    assert outer_params.contents[0].first_name().name == "outer"
+
+    params, returns = output.pop_sections((ParameterList, "param"), (Admonition, "return"))
+
+    assert params is not None
+    assert params.contents[0].first_name().name == "inner"
+    assert returns is not None
+    assert returns.pop_section(ParameterList, "param") is None
+
+
 def test_parse_output_specific_blocks():
     input_xml = """\
     <detaileddescription>
@@ -13,7 +13,18 @@
 # limitations under the License.
 """Generic tests for parsing Doxygen XML files."""
 
+import pickle
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+import pytest
+
+from asciidoxy.api_reference import AmbiguousLookupError
+from asciidoxy.model import Lazy, TypeRef
 from asciidoxy.parser.doxygen import Driver as ParserDriver
+from asciidoxy.parser.doxygen.description_parser import parse_description
+from asciidoxy.parser.doxygen.parser_base import LazyDescriptions
+from asciidoxy.profiling import counters
 from tests.unit.shared import ProgressMock
 
 
@@ -331,3 +342,390 @@ def test_force_language_empty(parser_driver_factory):
                                         lang="cpp")
     assert element is not None
     assert element.language == "cpp"
+
+
+def test_parse_parallel__same_result_as_serial(xml_data):
+    xml_files = [
+        xml_file for test_dir in ("cpp/default", "cpp/consumer")
+        for xml_file in (xml_data / test_dir).glob("**/*.xml")
+    ]
+
+    serial_parser = ParserDriver()
+    for xml_file in xml_files:
+        serial_parser.parse(xml_file)
+
+    parallel_parser = ParserDriver()
+    results = list(parallel_parser.parse_parallel(xml_files, jobs=2))
+    assert len(results) == len(xml_files)
+
+    assert parallel_parser.api_reference.elements == serial_parser.api_reference.elements
+    assert parallel_parser.unresolved_ref_count == serial_parser.unresolved_ref_count
+    assert parallel_parser.unchecked_ref_count == serial_parser.unchecked_ref_count
+
+    serial_parser.resolve_references()
+    serial_parser.check_references()
+    parallel_parser.resolve_references()
+    parallel_parser.check_references()
+
+    assert parallel_parser.api_reference.elements == serial_parser.api_reference.elements
+    assert parallel_parser.unresolved_ref_count == serial_parser.unresolved_ref_count
+
+
+def test_parse_parallel__invalid_file(tmp_path, xml_data):
+    invalid_file = tmp_path / "invalid.xml"
+    invalid_file.write_text("<doxygen><compounddef")
+
+    parser = ParserDriver()
+    results = list(
+        parser.parse_parallel(
+            [invalid_file, xml_data / "cpp/default/xml/namespaceasciidoxy_1_1geometry.xml"],
+            jobs=2))
+    assert results == [False, True]
+    assert parser.api_reference.find("asciidoxy::geometry::Print") is not None
+
+
+def test_parse_streaming__same_result_as_default(xml_data):
+    xml_files = sorted(xml_data.glob("**/*.xml"))
+
+    default_parser = ParserDriver()
+    streaming_parser = ParserDriver(streaming=True)
+    for xml_file in xml_files:
+        assert streaming_parser.parse(xml_file) == default_parser.parse(xml_file)
+
+    assert streaming_parser.api_reference.elements == default_parser.api_reference.elements
+    assert streaming_parser.unresolved_ref_count == default_parser.unresolved_ref_count
+    assert streaming_parser.unchecked_ref_count == default_parser.unchecked_ref_count
+
+    default_parser.resolve_references()
+    default_parser.check_references()
+    streaming_parser.resolve_references()
+    streaming_parser.check_references()
+
+    assert streaming_parser.api_reference.elements == default_parser.api_reference.elements
+    assert streaming_parser.unresolved_ref_count == default_parser.unresolved_ref_count
+
+
+def test_parse_streaming__invalid_file_adds_nothing(tmp_path, xml_data):
+    invalid_file = tmp_path / "invalid.xml"
+    valid_xml = (xml_data /
+                 "cpp/default/xml/namespaceasciidoxy_1_1geometry.xml").read_text(encoding="utf-8")
+    invalid_file.write_text(valid_xml.replace("</doxygen>", "<compounddef"), encoding="utf-8")
+
+    parser = ParserDriver(streaming=True)
+    assert not parser.parse(invalid_file)
+    assert not parser.api_reference.elements
+    assert parser.unresolved_ref_count == 0
+    assert parser.unchecked_ref_count == 0
+
+
+def test_parse_streaming__not_doxygen_xml(tmp_path):
+    other_file = tmp_path / "other.xml"
+    other_file.write_text("<other><compounddef/></other>")
+
+    parser = ParserDriver(streaming=True)
+    assert not parser.parse(other_file)
+    assert not parser.api_reference.elements
+
+
+def test_parse_parallel__streaming(xml_data):
+    xml_files = sorted((xml_data / "cpp/default").glob("**/*.xml"))
+
+    serial_parser = ParserDriver()
+    for xml_file in xml_files:
+        serial_parser.parse(xml_file)
+
+    parallel_parser = ParserDriver(streaming=True)
+    list(parallel_parser.parse_parallel(xml_files, jobs=2))
+    assert parallel_parser.api_reference.elements == serial_parser.api_reference.elements
+
+
+@pytest.fixture
+def copied_class_files(xml_data, tmp_path):
+    """Two copies of the same class, to get the same types in separate files."""
+    xml = (xml_data / "cpp/default/xml/classasciidoxy_1_1geometry_1_1_coordinate.xml").read_text(
+        encoding="utf-8")
+    xml_files = []
+    for refid in ("classfirst", "classsecond"):
+        xml_file = tmp_path / f"{refid}.xml"
+        xml_file.write_text(xml, encoding="utf-8")
+        xml_files.append(xml_file)
+    (tmp_path / "index.xml").write_text("""<doxygenindex>
+<compound refid="classfirst" kind="class"><name>First</name></compound>
+<compound refid="classsecond" kind="class"><name>Second</name></compound>
+</doxygenindex>""")
+    return xml_files
+
+
+def _type_cache_hits(parse, *args):
+    hits_before = counters().get("type_cache_hits", 0)
+    parse(*args)
+    return counters().get("type_cache_hits", 0) - hits_before
+
+
+def _parse_each(parser, xml_files):
+    for xml_file in xml_files:
+        assert parser.parse(xml_file)
+
+
+def _parse_parallel(parser, xml_files):
+    assert all(parser.parse_parallel(xml_files, jobs=1))
+
+
+def _parse_index(parser, xml_files):
+    assert parser.parse_index(xml_files[0].parent / "index.xml")
+    for name in ("First", "Second"):
+        parser.api_reference.find(name)
+    assert parser.api_reference.loader._parsed_files == set(xml_files)
+
+
+@pytest.mark.parametrize("streaming", [False, True], ids=["default", "streaming"])
+@pytest.mark.parametrize("parse", [_parse_each, _parse_parallel, _parse_index],
+                         ids=["serial", "parallel", "lazy"])
+def test_parse__type_cache_is_kept_for_next_file(copied_class_files, parse, streaming):
+    hits_first_file = _type_cache_hits(_parse_each, ParserDriver(), copied_class_files[:1])
+
+    hits = _type_cache_hits(parse, ParserDriver(streaming=streaming), copied_class_files)
+    assert hits > 2 * hits_first_file
+
+
+def test_resolve_references__identical_references_are_looked_up_once(parser_driver_factory):
+    parser = parser_driver_factory("cpp/default", "cpp/consumer")
+    unique_refs = {(ref.name, ref.id, ref.language, ref.namespace)
+                   for ref in parser._unresolved_refs}
+    unique_refs.update(
+        (ref.name, ref.id, ref.language, ref.namespace) for _, ref in parser._inner_type_refs)
+    assert len(unique_refs) < parser.unresolved_ref_count
+
+    lookups_before = counters().get("reference_lookups", 0)
+    parser.resolve_references()
+    assert counters()["reference_lookups"] - lookups_before == len(unique_refs)
+
+
+def test_resolve_references__namespaced_references_are_looked_up_together(parser_driver_factory):
+    parser = parser_driver_factory("cpp/default", "cpp/consumer")
+    namespaced_refs = {(ref.name, ref.namespace)
+                       for ref in parser._unresolved_refs if ref.namespace is not None}
+    assert len(namespaced_refs) > 1
+
+    with patch.object(parser.api_reference, "find",
+                      wraps=parser.api_reference.find) as find_mock, patch.object(
+                          parser.api_reference, "find_many",
+                          wraps=parser.api_reference.find_many) as find_many_mock:
+        parser.resolve_references()
+    find_many_mock.assert_called_once()
+    assert not [
+        c for c in find_mock.call_args_list
+        if c.kwargs["namespace"] is not None and c.kwargs["target_id"] is None
+    ]
+
+
+def test_resolve_references__same_result_as_without_cache(parser_driver_factory):
+    cached_parser = parser_driver_factory("cpp/default", "cpp/consumer")
+    uncached_parser = parser_driver_factory("cpp/default", "cpp/consumer")
+
+    cached_parser.resolve_references()
+    cached_parser.check_references()
+    with patch.object(ParserDriver,
+                      "_cached_resolver",
+                      autospec=True,
+                      side_effect=lambda self, refs=(): self.resolve_reference):
+        uncached_parser.resolve_references()
+        uncached_parser.check_references()
+
+    assert cached_parser.api_reference.elements == uncached_parser.api_reference.elements
+    assert cached_parser.unresolved_ref_count == uncached_parser.unresolved_ref_count
+
+
+def test_resolve_references__ambiguous_result_is_cached(parser_driver_factory):
+    parser = parser_driver_factory("cpp/default")
+    refs = [TypeRef(name="Coordinate", language="cpp") for _ in range(3)]
+    for ref in refs:
+        parser.unresolved_ref(ref)
+
+    with patch.object(parser.api_reference, "find",
+                      side_effect=AmbiguousLookupError([])) as find_mock:
+        parser.resolve_references()
+    find_mock.assert_any_call("Coordinate", target_id=None, lang="cpp", namespace=None)
+    assert len([c for c in find_mock.call_args_list if c.args == ("Coordinate", )]) == 1
+    assert all(ref.id is None for ref in refs)
+
+
+def test_parse__kind_and_prot_are_interned(api_reference):
+    elements = [e for e in api_reference.elements if e.kind == "function" and e.prot == "public"]
+    assert len(elements) > 1
+    assert all(e.kind is elements[0].kind for e in elements)
+    assert all(e.prot is elements[0].prot for e in elements)
+
+
+def test_parse__descriptions_are_parsed_when_first_read(parser_driver_factory):
+    parser = parser_driver_factory("cpp/default")
+    element = parser.api_reference.find("asciidoxy::geometry::Coordinate::IsValid",
+                                        kind="function",
+                                        lang="cpp")
+    assert element is not None
+    assert isinstance(element._brief, Lazy)
+    assert isinstance(element.returns._description, Lazy)
+
+    with patch("asciidoxy.parser.doxygen.parser_base.parse_description",
+               wraps=parse_description) as parse_mock:
+        assert element.brief == "Check if the coordinate is valid."
+        assert parse_mock.call_count == 2
+
+        assert element.description == "A coordinate is valid if its values are within WGS84 bounds."
+        assert element.returns.description == "True if valid, false if not."
+        assert element.sections == {}
+        assert parse_mock.call_count == 2
+
+
+def test_parse__pickled_descriptions_are_still_lazy(parser_driver_factory):
+    parser = parser_driver_factory("cpp/default")
+    element = parser.api_reference.find("asciidoxy::geometry::Coordinate::IsValid",
+                                        kind="function",
+                                        lang="cpp")
+    assert element is not None
+
+    copied = pickle.loads(pickle.dumps(element))
+    assert isinstance(copied._description, Lazy)
+    assert copied.description == "A coordinate is valid if its values are within WGS84 bounds."
+    assert copied == element
+
+
+NESTED_SECTIONS_XML = """\
+<memberdef>
+  <briefdescription/>
+  <detaileddescription>
+    <para>
+      <simplesect kind="pre">
+        <para>Valid input.</para>
+        <para>
+          <simplesect kind="return"><para>The result.</para></simplesect>
+          <parameterlist kind="param">
+            <parameteritem>
+              <parameternamelist><parametername>value</parametername></parameternamelist>
+              <parameterdescription><para>The value.</para></parameterdescription>
+            </parameteritem>
+          </parameterlist>
+        </para>
+      </simplesect>
+    </para>
+  </detaileddescription>
+</memberdef>
+"""
+
+
+def test_lazy_descriptions__member__extract_return_and_params_before_sections():
+    descriptions = LazyDescriptions(ET.fromstring(NESTED_SECTIONS_XML), "cpp", member=True)
+    assert descriptions.returns().resolve() == "The result."
+    assert descriptions.param("param", "value").resolve() == "The value."
+    assert descriptions.sections().resolve() == {"Precondition": "Valid input."}
+
+
+def test_lazy_descriptions__compound__extract_sections_before_params():
+    descriptions = LazyDescriptions(ET.fromstring(NESTED_SECTIONS_XML), "cpp", member=False)
+    assert descriptions.param("param", "value").resolve() == ""
+    assert descriptions.sections().resolve() == {
+        "Precondition": "Valid input.\n\n.Return\n[NOTE]\n====\nThe result.\n===="
+    }
+
+
+def test_lazy_descriptions__xml_element_is_not_kept():
+    element = ET.fromstring(NESTED_SECTIONS_XML)
+    descriptions = LazyDescriptions(element, "cpp", member=True)
+    element.clear()
+
+    assert descriptions.returns().resolve() == "The result."
+    assert descriptions.sections().resolve() == {"Precondition": "Valid input."}
+
+
+def _lazy_and_eager_parsers(xml_dir):
+    eager_parser = ParserDriver()
+    for xml_file in xml_dir.glob("*.xml"):
+        eager_parser.parse(xml_file)
+    eager_parser.resolve_references()
+    eager_parser.check_references()
+
+    lazy_parser = ParserDriver()
+    assert lazy_parser.parse_index(xml_dir / "index.xml")
+    lazy_parser.resolve_references()
+    lazy_parser.check_references()
+    return lazy_parser, eager_parser
+
+
+@pytest.mark.parametrize("test_dir,name,lang", [
+    ("cpp/default", "asciidoxy::geometry::Coordinate", "cpp"),
+    ("cpp/default", "asciidoxy::traffic::TrafficEvent", "cpp"),
+    ("cpp/default", "asciidoxy::geometry::Coordinate::IsValid", "cpp"),
+    ("java/default", "com.asciidoxy.geometry.Coordinate", "java"),
+    ("objc/default", "ADTrafficEvent", "objc"),
+    ("python/default", "asciidoxy.traffic.TrafficEvent", "python"),
+])
+def test_parse_index__same_result_as_parsing_all_files(xml_data, test_dir, name, lang):
+    lazy_parser, eager_parser = _lazy_and_eager_parsers(xml_data / test_dir / "xml")
+
+    element = lazy_parser.api_reference.find(name, lang=lang)
+    assert element is not None
+    assert element == eager_parser.api_reference.find(name, lang=lang)
+    assert lazy_parser.api_reference.find(target_id=element.id) is element
+    assert lazy_parser.unresolved_ref_count <= eager_parser.unresolved_ref_count
+
+
+def test_parse_index__only_parses_files_when_needed(xml_data):
+    lazy_parser, eager_parser = _lazy_and_eager_parsers(xml_data / "cpp/default/xml")
+    assert not lazy_parser.api_reference.elements
+
+    element = lazy_parser.api_reference.find("asciidoxy::geometry::Coordinate", kind="class")
+    assert element is not None
+    assert element.members
+    assert 0 < len(lazy_parser.api_reference.elements) < len(eager_parser.api_reference.elements)
+
+
+def test_parse_index__find_by_id(xml_data):
+    lazy_parser, eager_parser = _lazy_and_eager_parsers(xml_data / "cpp/default/xml")
+    element = eager_parser.api_reference.find("asciidoxy::traffic::TrafficEvent::Update")
+    assert element is not None
+
+    assert lazy_parser.api_reference.find(target_id=element.id) == element
+
+
+@pytest.mark.parametrize("in_advance", [False, True], ids=["one-by-one", "in-advance"])
+def test_parse_index__cached_resolver_loads_files(xml_data, in_advance):
+    parser = ParserDriver()
+    assert parser.parse_index(xml_data / "cpp/default/xml" / "index.xml")
+    assert not parser.api_reference.elements
+
+    ref = TypeRef(name="Coordinate", language="cpp", namespace="asciidoxy::geometry")
+    resolve_reference = parser._cached_resolver([ref] if in_advance else [])
+    element = resolve_reference(ref)
+    assert element is not None
+    assert element.full_name == "asciidoxy::geometry::Coordinate"
+
+    before = counters().get("reference_lookup_cache_hits", 0)
+    assert resolve_reference(ref) is element
+    assert counters()["reference_lookup_cache_hits"] == before + 1
+
+
+def test_parse_index__not_an_index(xml_data):
+    parser = ParserDriver()
+    assert not parser.parse_index(
+        xml_data / "cpp/default/xml" / "classasciidoxy_1_1geometry_1_1_coordinate.xml")
+    assert parser.api_reference.loader is None
+
+
+def test_parse_index__invalid_file(tmp_path):
+    invalid_file = tmp_path / "index.xml"
+    invalid_file.write_text("<doxygenindex><compound")
+
+    parser = ParserDriver()
+    assert not parser.parse_index(invalid_file)
+    assert parser.api_reference.loader is None
+
+
+def test_parse_index__missing_file(tmp_path):
+    index_file = tmp_path / "index.xml"
+    index_file.write_text("""<doxygenindex>
+<compound refid="classmissing" kind="class"><name>Missing</name></compound>
+</doxygenindex>""")
+
+    parser = ParserDriver()
+    assert parser.parse_index(index_file)
+    assert parser.api_reference.find("Missing") is None
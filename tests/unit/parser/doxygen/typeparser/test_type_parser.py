@@ -21,8 +21,15 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from asciidoxy.model import TypeRef
 from asciidoxy.parser.doxygen.language_traits import LanguageTraits, TokenCategory
-from asciidoxy.parser.doxygen.type_parser import Token, TypeParser, find_tokens
+from asciidoxy.parser.doxygen.type_parser import (
+    Token,
+    TypeCache,
+    TypeParseError,
+    TypeParser,
+    find_tokens,
+)
 from tests.unit.shared import assert_equal_or_none_if_empty, sub_element
 
 
@@ -299,6 +306,34 @@ def test_type_parser__tokenize_text__reduce_whitespace(text, tokens):
     assert TestParser.tokenize_text(text) == tokens
 
 
+class OverlappingTraits(TestTraits):
+    TOKENS = {
+        TokenCategory.OPERATOR: TestTraits.OPERATORS + ("...", ),
+        TokenCategory.QUALIFIER: TestTraits.QUALIFIERS + ("&", ),
+    }
+    TOKEN_BOUNDARIES = TestTraits.TOKEN_BOUNDARIES + ("...", )
+
+
+class OverlappingParser(TestParser):
+    TRAITS = OverlappingTraits
+
+
+def test_type_parser__tokenize_text__first_category_wins():
+    assert OverlappingParser.tokenize_text("MyType&") == [name("MyType"), operator("&")]
+
+
+def test_type_parser__tokenize_text__only_single_characters_are_boundaries():
+    assert OverlappingParser.tokenize_text("MyType...") == [name("MyType...")]
+    assert OverlappingParser.tokenize_text("...") == [operator("...")]
+
+
+def test_type_parser__tokenize_text__tokenizer_per_language():
+    assert TestParser.tokenize_text("const ...") == [qualifier("const"), whitespace(), name("...")]
+    assert OverlappingParser.tokenize_text("const ...") == [
+        qualifier("const"), whitespace(), operator("...")
+    ]
+
+
 def test_type_parser__tokenize_xml__text_only():
     element = ET.Element("type")
     element.text = "const MyType&"
@@ -1154,6 +1189,97 @@ def test_type_parser__parse_xml__nested_types_and_args():
     assert not type_ref.returns.nested[1].kind
 
 
+def nested_types_and_args_xml(refid: str = "my_type") -> ET.Element:
+    element = ET.Element("type")
+    element.text = "const "
+    sub_element(element, "ref", text="MyType", refid=refid, kindref="compound", tail="<")
+    sub_element(element,
+                "ref",
+                text="NestedType",
+                refid="nested_type",
+                kindref="compound",
+                tail=", OtherNestedType>(const std::string& arg_name, int arg_value)")
+    return element
+
+
+def all_type_refs(type_ref: TypeRef) -> List[TypeRef]:
+    type_refs = [type_ref]
+    for nested in type_ref.nested or []:
+        type_refs.extend(all_type_refs(nested))
+    for arg in type_ref.args or []:
+        type_refs.extend(all_type_refs(arg.type))
+    if type_ref.returns is not None:
+        type_refs.extend(all_type_refs(type_ref.returns))
+    return type_refs
+
+
+def test_type_cache__parse_xml__each_use_gets_a_copy(monkeypatch):
+    parse_xml_mock = MagicMock(wraps=TestParser.parse_xml)
+    monkeypatch.setattr(TestParser, "parse_xml", parse_xml_mock)
+    cache = TypeCache(TestParser)
+
+    type_ref_1 = cache.parse_xml(nested_types_and_args_xml())
+    type_ref_2 = cache.parse_xml(nested_types_and_args_xml())
+
+    assert parse_xml_mock.call_count == 1
+    assert type_ref_1 == type_ref_2
+    assert type_ref_1 == TestParser.parse_xml(nested_types_and_args_xml())
+    ids_1 = set(id(t) for t in all_type_refs(type_ref_1))
+    ids_2 = set(id(t) for t in all_type_refs(type_ref_2))
+    assert len(ids_1) == 6
+    assert not ids_1 & ids_2
+    assert type_ref_1.args[0] is not type_ref_2.args[0]
+
+
+def test_type_cache__parse_xml__driver_called_for_each_use():
+    driver_mock = MagicMock()
+    cache = TypeCache(TestParser, driver_mock)
+
+    type_refs = [cache.parse_xml(nested_types_and_args_xml()) for _ in range(2)]
+
+    expected_driver_mock = MagicMock()
+    TestParser.parse_xml(nested_types_and_args_xml(), driver=expected_driver_mock)
+    for method in ("unchecked_ref", "unresolved_ref"):
+        calls = getattr(driver_mock, method).call_args_list
+        expected_calls = getattr(expected_driver_mock, method).call_args_list
+        assert len(calls) == 2 * len(expected_calls) > 0
+        assert calls == expected_calls * 2
+
+        for type_ref, use_calls in zip(type_refs,
+                                       (calls[:len(calls) // 2], calls[len(calls) // 2:])):
+            use_ids = set(id(t) for t in all_type_refs(type_ref))
+            assert all(id(args[0]) in use_ids for args, _ in use_calls)
+
+
+@pytest.mark.parametrize("refid, namespace, shared", [
+    ("my_type", None, True),
+    ("other_type", None, False),
+    ("my_type", "asciidoxy::test", False),
+])
+def test_type_cache__parse_xml__key(monkeypatch, refid, namespace, shared):
+    parse_xml_mock = MagicMock(wraps=TestParser.parse_xml)
+    monkeypatch.setattr(TestParser, "parse_xml", parse_xml_mock)
+    cache = TypeCache(TestParser)
+
+    cache.parse_xml(nested_types_and_args_xml())
+    type_ref = cache.parse_xml(nested_types_and_args_xml(refid), namespace=namespace)
+
+    assert parse_xml_mock.call_count == (1 if shared else 2)
+    assert type_ref.returns.id == f"mylang-{refid}"
+    assert type_ref.namespace == namespace
+
+
+def test_type_cache__parse_xml__parse_error_not_cached(monkeypatch):
+    parse_xml_mock = MagicMock(side_effect=TypeParseError("broken"))
+    monkeypatch.setattr(TestParser, "parse_xml", parse_xml_mock)
+    cache = TypeCache(TestParser)
+
+    for _ in range(2):
+        with pytest.raises(TypeParseError):
+            cache.parse_xml(nested_types_and_args_xml())
+    assert parse_xml_mock.call_count == 2
+
+
 @pytest.mark.parametrize("tokens, pattern, expected", [
     ([], [], []),
     ([
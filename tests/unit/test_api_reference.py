@@ -13,11 +13,24 @@
 # limitations under the License.
 """Tests for API reference storage and search."""
 
+import functools
+import pickle
+from unittest.mock import patch
+
 import pytest
 
-from asciidoxy.api_reference import AmbiguousLookupError, NameFilter, ParameterTypeMatcher
+from asciidoxy.api_reference import (
+    AmbiguousLookupError,
+    ApiReference,
+    ElementLoader,
+    NameFilter,
+    NameQuery,
+    ParameterTypeMatcher,
+)
 from asciidoxy.parser.doxygen import Driver as ParserDriver
 
+from .builders import make_compound
+
 
 def test_function_matcher__parse__no_arguments():
     ptm = ParameterTypeMatcher("method")
@@ -498,3 +511,255 @@ def test_find_method__select_based_on_args_2__spaces_dont_matter(api_reference):
 
     element = api_reference.find("asciidoxy::geometry::Coordinate::Update(double,double,double)")
     assert element is not None
+
+
+def _linear_find(reference, *args, **kwargs):
+    """Search using only the short name index, like before the other indexes were added."""
+    with patch.object(
+            ApiReference,
+            "_candidates",
+            autospec=True,
+            side_effect=lambda self, name, short_name, *_: self._name_index.get(short_name, [])):
+        return reference.find(*args, **kwargs)
+
+
+def _find_or_ambiguous(find, *args, **kwargs):
+    try:
+        return find(*args, **kwargs)
+    except AmbiguousLookupError as e:
+        return e.candidates
+
+
+def test_find__indexes_give_same_results_as_linear_search(api_reference):
+    for element in api_reference.elements:
+        queries = [
+            dict(name=element.full_name),
+            dict(name=element.name),
+            dict(name=element.full_name, lang=element.language),
+            dict(name=element.name, kind=element.kind),
+            dict(name=element.name, kind=element.kind, lang=element.language),
+            dict(name=element.name, namespace=element.namespace),
+            dict(name=element.name, namespace=element.namespace, allow_overloads=True),
+            dict(name=element.full_name, kind="no-such-kind"),
+            dict(name=element.full_name, lang="no-such-lang"),
+        ]
+        for query in queries:
+            indexed = _find_or_ambiguous(api_reference.find, **query)
+            linear = _find_or_ambiguous(functools.partial(_linear_find, api_reference), **query)
+            assert indexed == linear, query
+
+
+def test_find__many_elements_with_the_same_short_name():
+    reference = ApiReference()
+    for i in range(1000):
+        for lang, kind in (("cpp", "function"), ("java", "function"), ("cpp", "variable")):
+            reference.append(
+                make_compound(id=f"{lang}-{kind}-{i}",
+                              name="get",
+                              full_name=f"ns{i}::Class::get",
+                              language=lang,
+                              kind=kind))
+
+    element = reference.find("ns42::Class::get", kind="function", lang="java")
+    assert element is not None
+    assert element.id == "java-function-42"
+
+    element = reference.find("get", namespace="ns42::Class", kind="variable")
+    assert element is not None
+    assert element.id == "cpp-variable-42"
+
+    assert reference.find("ns42::Class::get", kind="function", lang="python") is None
+    assert reference.find("get", namespace="ns42::Class", kind="property") is None
+
+
+def test_pickle__find_and_reindex_still_work():
+    reference = ApiReference()
+    reference.append(make_compound(id="a", name="Coordinate", full_name="geometry::Coordinate"))
+    reference.append(make_compound(id="b", name="Point", full_name="geometry::Point"))
+    assert reference.find("geometry::Coordinate") is not None
+
+    copied = pickle.loads(pickle.dumps(reference))
+    element = copied.find("geometry::Coordinate")
+    assert element is copied.elements[0]
+    assert copied.find("Point", namespace="geometry") is copied.elements[1]
+
+    element.full_name = "geometry::shapes::Coordinate"
+    copied.reindex(element)
+    assert copied.find("geometry::Coordinate") is None
+    assert copied.find("geometry::shapes::Coordinate") is element
+
+
+def _find_or_none(reference, query):
+    try:
+        return reference.find(query.name, namespace=query.namespace, lang=query.lang)
+    except AmbiguousLookupError:
+        return None
+
+
+def _namespaces_around(element):
+    if not element.namespace:
+        return [None, "", "other"]
+    parts = element.namespace.replace("::", ".").split(".")
+    sep = "::" if "::" in element.namespace else "."
+    return [None, "", "other", f"{element.namespace}{sep}Nested", f"other{sep}{element.namespace}"
+            ] + [sep.join(parts[:i]) for i in range(1,
+                                                    len(parts) + 1)]
+
+
+def test_find_many__same_results_as_find(api_reference):
+    queries = []
+    for element in api_reference.elements:
+        for name in {element.name, element.full_name, element.full_name.rpartition("::")[2]}:
+            for namespace in _namespaces_around(element):
+                for lang in (element.language, None, "no-such-lang"):
+                    queries.append(NameQuery(name, namespace, lang))
+
+    results = api_reference.find_many(queries)
+    assert len(results) == len(set(queries))
+    for query in queries:
+        assert results[query] is _find_or_none(api_reference, query), query
+
+
+def test_find_many__namespace_scopes():
+    reference = ApiReference()
+    for name, full_name in (("Foo", "Foo"), ("Foo", "a::Foo"), ("Foo", "a::b::Foo"),
+                            ("Foo", "a::b::c::Foo"), ("Foo", "x::Foo"), ("Foo", "a::b::Foo::Foo"),
+                            ("Bar<Foo>", "a::Bar<Foo>"), ("Bar<Foo>", "a::b::Bar<Foo>"),
+                            ("Bar<a::Foo>", "a::b::Bar < a::Foo >")):
+        for lang in ("cpp", "java"):
+            reference.append(
+                make_compound(id=f"{lang}-{full_name}",
+                              name=name,
+                              full_name=full_name,
+                              language=lang))
+
+    queries = [
+        NameQuery(name, namespace, lang)
+        for name in ("Foo", "b::Foo", "a::b::Foo", "::Foo", "Foo::Foo", "Bar<Foo>", "Bar<a::Foo>")
+        for namespace in (None, "", "::", "a", "a::b", "a::b::c", "a::b::c::d", "x", "a::x",
+                          "a::b::Foo", " a :: b ") for lang in ("cpp", None)
+    ]
+    results = reference.find_many(queries)
+    assert any(element is not None for element in results.values())
+    for query in queries:
+        assert results[query] is _find_or_none(reference, query), query
+
+
+def test_find_many__function_arguments_use_find():
+    reference = ApiReference()
+    element = make_compound(id="update", name="Update", full_name="geometry::Coordinate::Update")
+    reference.append(element)
+
+    query = NameQuery("Update()", "geometry::Coordinate", None)
+    assert reference.find_many([query]) == {query: element}
+
+
+def test_reindex__changed_kind():
+    reference = ApiReference()
+    first = make_compound(id="first", name="isValid", full_name="ns.isValid", kind="function")
+    second = make_compound(id="second", name="isValid", full_name="ns.isValid", kind="function")
+    reference.append(first)
+    reference.append(second)
+    assert reference.find("ns.isValid", kind="function", allow_overloads=True) is first
+
+    second.kind = "property"
+    reference.reindex(second)
+    assert reference.find("ns.isValid", kind="property") is second
+    assert reference.find("ns.isValid", kind="function") is first
+
+    first.kind = "property"
+    reference.reindex(first)
+    with pytest.raises(AmbiguousLookupError) as exception_info:
+        reference.find("ns.isValid", kind="property")
+    assert exception_info.value.candidates == [first, second]
+
+
+def test_reindex__changed_name_is_not_found_by_new_name():
+    reference = ApiReference()
+    element = make_compound(id="getter", name="getValue", full_name="ns.getValue")
+    reference.append(element)
+    assert reference.find("ns.getValue") is element
+
+    element.name = "value"
+    element.full_name = "ns.value"
+    reference.reindex(element)
+    assert reference.find("ns.value") is None
+    assert reference.find("ns.getValue") is None
+
+
+def test_reindex__unknown_element_is_ignored():
+    reference = ApiReference()
+    reference.reindex(make_compound(id="unknown", name="unknown"))
+
+
+def test_find__element_changed_after_adding():
+    reference = ApiReference()
+    element = make_compound(id="alias", name="Alias", full_name="ns::Alias", kind="typedef")
+    reference.append(element)
+    element.kind = "alias"
+
+    assert reference.find("ns::Alias", kind="alias") is element
+    assert reference.find("ns::Alias", kind="typedef") is None
+
+
+class _Loader(ElementLoader):
+    def __init__(self, reference, *elements):
+        self.reference = reference
+        self.elements = list(elements)
+        self.names = []
+        self.ids = []
+
+    def load_name(self, short_name):
+        self.names.append(short_name)
+        self._load(lambda element: element.name == short_name)
+
+    def load_id(self, target_id):
+        self.ids.append(target_id)
+        self._load(lambda element: element.id == target_id)
+
+    def _load(self, predicate):
+        for element in [e for e in self.elements if predicate(e)]:
+            self.elements.remove(element)
+            self.reference.append(element)
+
+
+def test_find__loader__load_by_short_name():
+    reference = ApiReference()
+    element = make_compound(id="coordinate", name="Coordinate", full_name="geometry::Coordinate")
+    reference.loader = _Loader(reference, element)
+
+    assert reference.find("geometry::Coordinate") is element
+    assert reference.find("Coordinate", namespace="geometry", kind="class") is element
+    assert reference.find("geometry::Coordinate(int)") is None
+    assert reference.loader.names == ["Coordinate", "Coordinate", "Coordinate"]
+    assert reference.loader.ids == []
+
+
+def test_find__loader__load_by_id():
+    reference = ApiReference()
+    element = make_compound(id="coordinate", name="Coordinate", full_name="geometry::Coordinate")
+    reference.loader = _Loader(reference, element)
+
+    assert reference.find(target_id="coordinate") is element
+    assert reference.find(target_id="coordinate") is element
+    assert reference.find(target_id="other") is None
+    assert reference.loader.ids == ["coordinate", "other"]
+    assert reference.loader.names == []
+
+
+def test_find_many__loader__load_each_short_name_once():
+    reference = ApiReference()
+    element = make_compound(id="coordinate", name="Coordinate", full_name="geometry::Coordinate")
+    reference.loader = _Loader(reference, element)
+
+    queries = [
+        NameQuery("Coordinate", "geometry", None),
+        NameQuery("geometry::Coordinate", "geometry::other", None),
+        NameQuery("Coordinate", "other", None),
+    ]
+    assert reference.find_many(queries) == {
+        queries[0]: element,
+        queries[1]: element,
+        queries[2]: None,
+    }
+    assert reference.loader.names == ["Coordinate"]
@@ -13,6 +13,11 @@
 # limitations under the License.
 """Test generating the AsciiDoctor runner."""
 
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
 from asciidoxy import asciidoctor
 
 
@@ -258,3 +263,89 @@ exit 1 if (logger.respond_to? :max_severity) &&
   logger.max_severity &&
   logger.max_severity >= (::Logger::Severity.const_get 'FATAL')
 """
+
+
+def test_documents_to_convert__skip_up_to_date(default_config, document):
+    docs = [document, document.with_relative_path("included.adoc")]
+    docs[0].is_root = True
+    docs[0].include(docs[1])
+    docs[1].is_up_to_date = True
+    default_config.multipage = True
+
+    assert asciidoctor.documents_to_convert(docs, default_config) == docs
+
+    output_file = default_config.destination_dir / "included.html"
+    output_file.parent.mkdir(parents=True)
+    output_file.touch()
+    assert asciidoctor.documents_to_convert(docs, default_config) == [docs[0]]
+
+
+def test_convert_documents__nothing_to_convert(default_config, document, package_manager):
+    document.is_root = True
+    document.is_up_to_date = True
+    output_file = default_config.destination_dir / "input_file.html"
+    output_file.parent.mkdir(parents=True)
+    output_file.touch()
+
+    with patch("asciidoxy.asciidoctor.run_ruby") as run_ruby_mock:
+        asciidoctor.convert_documents([document], default_config, package_manager)
+    run_ruby_mock.assert_not_called()
+
+
+def test_write_asciidoctor_runners__multiple_jobs(default_config, document, package_manager):
+    docs = [document] + [document.with_relative_path(f"included{i}.adoc") for i in range(3)]
+    docs[0].is_root = True
+    for doc in docs[1:]:
+        docs[0].include(doc)
+    default_config.multipage = True
+    default_config.jobs = 2
+
+    runner_paths = asciidoctor.write_asciidoctor_runners(docs, default_config, package_manager)
+    assert [p.name for p in runner_paths] == ["asciidoctor_runner_0.rb", "asciidoctor_runner_1.rb"]
+
+    contents = [p.read_text() for p in runner_paths]
+    assert "input_file.adoc" in contents[0]
+    assert "included1.adoc" in contents[0]
+    assert "included0.adoc" in contents[1]
+    assert "included2.adoc" in contents[1]
+    for content in contents:
+        assert content.startswith("require 'asciidoctor'\n")
+        assert content.endswith("(::Logger::Severity.const_get 'FATAL')\n")
+
+
+def test_write_asciidoctor_runners__not_more_runners_than_documents(default_config, document,
+                                                                    package_manager):
+    document.is_root = True
+    default_config.multipage = True
+    default_config.jobs = 4
+
+    runner_paths = asciidoctor.write_asciidoctor_runners([document], default_config,
+                                                         package_manager)
+    assert [p.name for p in runner_paths] == ["asciidoctor_runner.rb"]
+
+
+def test_write_asciidoctor_runners__singlepage_uses_single_runner(default_config, document,
+                                                                  package_manager):
+    docs = [document, document.with_relative_path("included.adoc")]
+    docs[0].is_root = True
+    docs[0].include(docs[1])
+    default_config.jobs = 4
+
+    runner_paths = asciidoctor.write_asciidoctor_runners(docs, default_config, package_manager)
+    assert [p.name for p in runner_paths] == ["asciidoctor_runner.rb"]
+
+
+def test_run_ruby__multiple_scripts_run_concurrently(tmp_path):
+    with patch("subprocess.Popen") as popen_mock:
+        popen_mock.return_value.returncode = 0
+        asciidoctor.run_ruby(tmp_path / "a.rb", tmp_path / "b.rb")
+    assert popen_mock.call_count == 2
+    assert popen_mock.return_value.wait.call_count == 2
+
+
+def test_run_ruby__multiple_scripts_failure(tmp_path):
+    with patch("subprocess.Popen") as popen_mock:
+        popen_mock.return_value.returncode = 1
+        with pytest.raises(subprocess.CalledProcessError):
+            asciidoctor.run_ruby(tmp_path / "a.rb", tmp_path / "b.rb")
+    assert popen_mock.return_value.wait.call_count == 2
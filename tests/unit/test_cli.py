@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import shutil
 from unittest.mock import patch
 
 import pytest
 
 from asciidoxy.cli import main
+from asciidoxy.generator.asciidoc import PreprocessingApi
 
 
 @pytest.fixture
@@ -126,6 +128,39 @@ def test_process_file(asciidoctor_mock, build_dir, spec_file, destination_dir, a
     assert processed_file.is_file()
 
 
+def test_process_file_lazy_reference(asciidoctor_mock, tmp_path, destination_dir, adoc_data,
+                                     xml_data, event_loop):
+    package_dir = tmp_path / "package"
+    shutil.copytree(xml_data / "cpp" / "default" / "xml", package_dir / "xml")
+    (package_dir / "contents.toml").write_text("""\
+[package]
+name = "package"
+
+[reference]
+type = "doxygen"
+dir = "xml"
+""")
+    spec_file = tmp_path / "package_spec.toml"
+    spec_file.write_text(f"""
+[packages]
+[packages.package]
+type= "local"
+package_dir = "{package_dir}"
+""")
+    in_file = adoc_data / "simple_test.input.adoc"
+
+    def process(build_dir, *options):
+        main([
+            str(in_file), "--spec-file",
+            str(spec_file), "--destination-dir",
+            str(destination_dir), "--build-dir",
+            str(build_dir), *options
+        ])
+        return (build_dir / "intermediate" / "simple_test.input.adoc").read_text()
+
+    assert process(tmp_path / "lazy", "--lazy-reference") == process(tmp_path / "eager")
+
+
 def test_process_file_backend_pdf(asciidoctor_mock, build_dir, spec_file, destination_dir,
                                   adoc_data, event_loop):
     in_file = adoc_data / "simple_test.input.adoc"
@@ -339,3 +374,88 @@ def test_no_reference_loaded(asciidoctor_mock, build_dir, destination_dir, adoc_
     assert f"convert_file '{processed_file}'" in runner
     assert "backend: 'html5'" in runner
     assert processed_file.is_file()
+
+
+def test_jobs__missing_reference_in_worker(asciidoctor_mock, build_dir, spec_file, destination_dir,
+                                           tmp_path, caplog, event_loop):
+    in_file = tmp_path / "main.adoc"
+    in_file.write_text("""\
+${insert("asciidoxy::geometry::Coordinate")}
+${include("sub.adoc")}
+""")
+    (tmp_path / "sub.adoc").write_text("""\
+${insert("asciidoxy::geometry::InvalidCoordinate")}
+
+${link("asciidoxy::geometry::NoSuchClass")}
+""")
+
+    # Only let the error surface while generating the documents in the worker processes
+    with patch.object(PreprocessingApi, "_warning_or_error"), \
+            pytest.raises(SystemExit) as exc_info:
+        main([
+            str(in_file), "--spec-file",
+            str(spec_file), "--destination-dir",
+            str(destination_dir), "--build-dir",
+            str(build_dir), "--warnings-are-errors", "--jobs", "2"
+        ])
+    assert exc_info.value.code == 1
+
+    assert "Error while processing AsciiDoc files:" in caplog.text
+    assert "Cannot find any asciidoxy::geometry::NoSuchClass for any" in caplog.text
+    assert "sub.adoc, line 3, in AsciiDoc" in caplog.text
+
+
+def test_profile_report(asciidoctor_mock, build_dir, spec_file, destination_dir, adoc_data,
+                        event_loop, tmp_path):
+    in_file = adoc_data / "simple_test.input.adoc"
+    report_file = tmp_path / "profile.json"
+
+    main([
+        str(in_file), "--spec-file",
+        str(spec_file), "--destination-dir",
+        str(destination_dir), "--build-dir",
+        str(build_dir), "--profile-report",
+        str(report_file)
+    ])
+
+    with report_file.open(encoding="utf-8") as f:
+        report = json.load(f)
+
+    phases = {phase["name"]: phase for phase in report["phases"]}
+    assert list(phases.keys()) == [
+        "collect", "load_reference", "resolve_references", "check_references",
+        "prepare_work_directory", "process_adoc", "convert_documents", "make_image_directory"
+    ]
+    for phase in report["phases"]:
+        assert phase["wall_time"] >= 0
+        assert phase["cpu_time"] >= 0
+
+    assert phases["load_reference"]["counters"]["xml_files_parsed"] == 2
+    assert phases["load_reference"]["counters"]["elements_registered"] > 0
+    assert phases["check_references"]["counters"]["reference_lookups"] > 0
+    assert phases["process_adoc"]["counters"]["documents_preprocessed"] == 1
+    assert phases["process_adoc"]["counters"]["documents_rendered"] == 1
+    assert phases["process_adoc"]["counters"]["bytes_written"] > 0
+    assert phases["process_adoc"]["counters"]["templates_compiled"] > 0
+    assert report["total"]["counters"]["xml_files_parsed"] == 2
+
+    assert report["render"]["slowest_documents"][0]["name"] == "simple_test.input.adoc"
+    assert report["render"]["slowest_inserts"]
+
+    stacks = (tmp_path / "profile.folded").read_text(encoding="utf-8").splitlines()
+    assert stacks
+    assert all(line.startswith("document simple_test.input.adoc") for line in stacks)
+
+
+def test_no_profile_report(asciidoctor_mock, build_dir, spec_file, destination_dir, adoc_data,
+                           event_loop, tmp_path):
+    in_file = adoc_data / "simple_test.input.adoc"
+
+    main([
+        str(in_file), "--spec-file",
+        str(spec_file), "--destination-dir",
+        str(destination_dir), "--build-dir",
+        str(build_dir)
+    ])
+
+    assert not list(tmp_path.glob("**/*.json"))
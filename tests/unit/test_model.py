@@ -15,13 +15,21 @@
 Tests for the `asciidoxy.model` module.
 """
 
+import copy
+import json
+import pickle
+
+import pytest
+
 from asciidoxy.model import (
     Compound,
+    Lazy,
     Parameter,
     ReferableElement,
     ReturnValue,
     ThrowsClause,
     TypeRef,
+    json_repr,
 )
 
 
@@ -717,3 +725,130 @@ def test_compound__eq__full():
     assert first != second
     assert second != first
     second.sections = first.sections.copy()
+
+
+def _full_compound():
+    return Compound(id="id",
+                    name="name",
+                    full_name="full_name",
+                    language="lang",
+                    kind="kind",
+                    members=[Compound(name="member_name")],
+                    params=[
+                        Parameter(name="parameter",
+                                  type=TypeRef("lang",
+                                               "type",
+                                               nested=[TypeRef("lang", "nested")],
+                                               args=[Parameter(name="arg")],
+                                               returns=TypeRef("lang", "returns")))
+                    ],
+                    exceptions=[ThrowsClause("lang", description="exception")],
+                    returns=ReturnValue(description="returns"),
+                    include="include",
+                    namespace="namespace",
+                    prot="prot",
+                    sections={"section_name": "section_text"},
+                    static=True)
+
+
+@pytest.mark.parametrize("cls", [Compound, TypeRef, Parameter, ReturnValue, ThrowsClause])
+def test_model__no_instance_dict(cls):
+    element = cls()
+    assert not hasattr(element, "__dict__")
+    with pytest.raises(AttributeError):
+        element.unknown_attribute = 42
+
+
+@pytest.mark.parametrize("cls", [Compound, TypeRef, Parameter, ReturnValue, ThrowsClause])
+def test_model__init__unknown_keyword(cls):
+    with pytest.raises(TypeError):
+        cls(unknown_attribute=42)
+
+
+def test_model__fields():
+    assert ReferableElement.fields() == ["id", "name", "full_name", "language", "kind"]
+    assert Compound.fields()[:5] == ReferableElement.fields()
+    assert "members" in Compound.fields()
+    assert "constexpr" in Compound.fields()
+
+
+def test_model__pickle():
+    compound = _full_compound()
+    copied = pickle.loads(pickle.dumps(compound))
+    assert copied == compound
+    assert copied.params[0].type == compound.params[0].type
+
+
+def test_model__deepcopy():
+    compound = _full_compound()
+    copied = copy.deepcopy(compound)
+    assert copied == compound
+    assert copied.members[0] is not compound.members[0]
+
+
+def test_json_repr():
+    compound = _full_compound()
+    data = json.loads(json.dumps(compound, default=json_repr))
+
+    assert data["__CLASS__"] == "Compound"
+    assert set(data.keys()) == {"__CLASS__", *Compound.fields()}
+    assert data["name"] == "name"
+    assert data["static"] is True
+    assert data["sections"] == {"section_name": "section_text"}
+    assert data["members"][0]["__CLASS__"] == "Compound"
+    assert data["members"][0]["name"] == "member_name"
+    assert data["returns"] == {
+        "__CLASS__": "ReturnValue",
+        "type": None,
+        "description": "returns",
+    }
+
+    type_data = data["params"][0]["type"]
+    assert type_data["__CLASS__"] == "TypeRef"
+    assert set(type_data.keys()) == {"__CLASS__", *TypeRef.fields()}
+    assert type_data["nested"][0]["name"] == "nested"
+    assert type_data["args"][0]["name"] == "arg"
+    assert type_data["returns"]["name"] == "returns"
+
+
+class _CountingLazy(Lazy):
+    __slots__ = ("value", "count")
+
+    def __init__(self, value):
+        self.value = value
+        self.count = 0
+
+    def resolve(self):
+        self.count += 1
+        return self.value
+
+
+def test_lazy_attribute__resolved_once_when_read():
+    lazy = _CountingLazy("brief")
+    compound = Compound(brief=lazy)
+    assert lazy.count == 0
+
+    assert compound.brief == "brief"
+    assert compound.brief == "brief"
+    assert lazy.count == 1
+
+
+def test_lazy_attribute__assign_value():
+    compound = Compound(brief=_CountingLazy("brief"))
+    compound.brief = "other"
+    assert compound.brief == "other"
+
+
+def test_lazy_attribute__pickle_keeps_value_lazy():
+    compound = Compound(brief=_CountingLazy("brief"), sections=_CountingLazy({"Todo": "todo"}))
+    copied = pickle.loads(pickle.dumps(compound))
+    assert isinstance(copied._brief, _CountingLazy)
+    assert copied.brief == "brief"
+    assert copied.sections == {"Todo": "todo"}
+    assert copied == compound
+
+
+def test_lazy_attribute__json_repr_resolves_value():
+    compound = Compound(description=_CountingLazy("description"))
+    data = json.loads(json.dumps(compound, default=json_repr))
+    assert data["description"] == "description"
@@ -0,0 +1,137 @@
+# Copyright (C) 2019, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Tests for the `asciidoxy.profiling` module.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from asciidoxy.generator.cache import TemplateCache
+from asciidoxy.profiling import Profiler, count, counters, peak_rss
+
+
+def test_count():
+    before = counters().get("test_counter", 0)
+    count("test_counter")
+    count("test_counter", 41)
+    assert counters()["test_counter"] == before + 42
+
+
+def test_profiler__phases():
+    profiler = Profiler()
+
+    with profiler.phase("first"):
+        count("test_first")
+        time.sleep(0.01)
+    with profiler.phase("second"):
+        count("test_second", 2)
+        sum(range(100000))
+
+    assert [phase["name"] for phase in profiler.phases] == ["first", "second"]
+
+    first, second = profiler.phases
+    assert first["wall_time"] >= 0.01
+    assert first["cpu_time"] >= 0
+    assert first["children_cpu_time"] >= 0
+    assert first["counters"] == {"test_first": 1}
+    assert second["counters"] == {"test_second": 2}
+
+
+def test_profiler__peak_rss_increase():
+    with patch("asciidoxy.profiling.peak_rss") as peak_rss_mock:
+        peak_rss_mock.side_effect = [100, 100, 150, 150, 150, 180]
+        profiler = Profiler()
+        with profiler.phase("first"):
+            pass
+        with profiler.phase("second"):
+            pass
+        report = profiler.report()
+
+    first, second = profiler.phases
+    assert first["peak_rss"] == 150
+    assert first["peak_rss_increase"] == 50
+    assert second["peak_rss"] == 150
+    assert second["peak_rss_increase"] == 0
+    assert report["total"]["peak_rss"] == 180
+    assert report["total"]["peak_rss_increase"] == 80
+
+
+def test_profiler__peak_rss_not_supported():
+    with patch("asciidoxy.profiling.peak_rss", return_value=None):
+        profiler = Profiler()
+        with profiler.phase("first"):
+            pass
+
+    assert profiler.phases[0]["peak_rss"] is None
+    assert profiler.phases[0]["peak_rss_increase"] is None
+
+
+def test_profiler__phase_recorded_on_exception():
+    profiler = Profiler()
+
+    with pytest.raises(RuntimeError):
+        with profiler.phase("failing"):
+            raise RuntimeError()
+
+    assert [phase["name"] for phase in profiler.phases] == ["failing"]
+
+
+def test_profiler__report():
+    count("test_before")
+    profiler = Profiler()
+    with profiler.phase("phase"):
+        count("test_in_phase")
+    count("test_after")
+
+    report = profiler.report()
+    assert report["version"]
+    assert report["phases"] == profiler.phases
+    assert report["total"]["counters"] == {"test_in_phase": 1, "test_after": 1}
+    assert report["total"]["wall_time"] >= report["phases"][0]["wall_time"]
+
+
+def test_profiler__write_report(tmp_path):
+    profiler = Profiler()
+    with profiler.phase("phase"):
+        count("test_in_phase")
+
+    report_file = tmp_path / "report.json"
+    profiler.write_report(report_file)
+
+    with report_file.open(encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["phases"][0]["name"] == "phase"
+    assert report["phases"][0]["counters"] == {"test_in_phase": 1}
+
+
+def test_peak_rss():
+    rss = peak_rss()
+    if rss is not None:
+        # At least the size of the Python interpreter
+        assert rss > 1024 * 1024
+
+
+def test_templates_compiled(tmp_path):
+    before = counters().get("templates_compiled", 0)
+    TemplateCache(cache_dir=tmp_path).template_for("cpp", "class")
+    compiled = counters()["templates_compiled"] - before
+    assert compiled > 0
+
+    # Templates loaded from the cache directory are not compiled again
+    TemplateCache(cache_dir=tmp_path).template_for("cpp", "class")
+    assert counters()["templates_compiled"] - before == compiled